@@ -0,0 +1,93 @@
+"""
+Benchmark of rating parsing in AverageRatingReport hot loop.
+
+Usage:
+    python benchmarks/bench_numeric.py --rows 1000000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import convert_to_number, get_logger, is_numeric, parse_numbers  # noqa: E402
+
+logger = get_logger(__name__)
+
+
+def legacy_convert_to_number(value: str) -> int | float:
+    """convert_to_number as it was before the fast parsing layer."""
+
+    logger.debug(f"Converting value to number: {value}")
+    try:
+        if "." in value:
+            result = float(value)
+            logger.debug(f"Converted to float: {result}")
+            return result
+        else:
+            result = int(value)
+            logger.debug(f"Converted to int: {result}")
+            return result
+    except ValueError as e:
+        raise ValueError(f"Cannot convert value {value} to numeric.") from e
+
+
+def legacy_parse(values: list[str]) -> list[int | float]:
+    result = []
+    for value in values:
+        is_numeric(value)
+        result.append(legacy_convert_to_number(value))
+    return result
+
+
+def row_parse(values: list[str]) -> list[int | float]:
+    return [convert_to_number(value) for value in values]
+
+
+def batch_parse(values: list[str]):
+    return parse_numbers(values)
+
+
+def measure(func, values: list[str], repeat: int) -> float:
+    """Returns best time of several runs in seconds."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(values)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rating parsing benchmark.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parsed_args = parser.parse_args(args)
+
+    rng = random.Random(0)
+    values = [f"{rng.uniform(1, 5):.1f}" for _ in range(parsed_args.rows)]
+
+    baseline = measure(legacy_parse, values, parsed_args.repeat)
+    print(f"{'method':<24}{'seconds':>10}{'rows/s':>14}{'speedup':>10}")
+    for name, func in (
+        ("is_numeric + convert", legacy_parse),
+        ("convert_to_number", row_parse),
+        ("parse_numbers", batch_parse),
+    ):
+        seconds = (
+            baseline
+            if func is legacy_parse
+            else measure(func, values, parsed_args.repeat)
+        )
+        print(
+            f"{name:<24}{seconds:>10.3f}{len(values) / seconds:>14,.0f}"
+            f"{baseline / seconds:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark of CLI cold start.
+
+Every run starts a fresh interpreter, imports main and reports time spent
+on imports above bare interpreter startup. Exits with code 1 if median
+import time is above budget or if modules that should be lazy got imported.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 20 --budget 75
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported just by importing main
+LAZY_MODULES = ("rich", "numpy", "multiprocessing", "concurrent.futures", "utils.cache")
+
+CHECK_SCRIPT = f"""
+import sys
+import main
+loaded = [name for name in {LAZY_MODULES!r} if name in sys.modules]
+if loaded:
+    sys.exit("Eagerly imported: " + ", ".join(loaded))
+"""
+
+
+def time_command(code: str, runs: int) -> list[float]:
+    """Returns wall times of running Python code in fresh interpreters."""
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(args: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="CLI startup benchmark.")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=75.0,
+        help="Allowed median import time of main in milliseconds (default: 75).",
+    )
+    parsed_args = parser.parse_args(args)
+
+    result = subprocess.run(
+        [sys.executable, "-c", CHECK_SCRIPT], cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode:
+        print(result.stderr.strip())
+        return 1
+
+    bare = statistics.median(time_command("pass", parsed_args.runs))
+    full = statistics.median(time_command("import main", parsed_args.runs))
+    imports = (full - bare) * 1000
+
+    print(f"interpreter startup {bare * 1000:8.1f} ms")
+    print(f"import main         {full * 1000:8.1f} ms")
+    print(f"imports only        {imports:8.1f} ms (budget {parsed_args.budget} ms)")
+
+    if imports > parsed_args.budget:
+        print("Startup is over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Deterministic generator of product CSV files for benchmarks.
+
+Usage:
+    python benchmarks/generate.py out.csv --rows 1000000 --brands 50
+    python benchmarks/generate.py out.csv --size 100 --dirty-rate 0.01
+"""
+
+import argparse
+import csv
+import random
+from pathlib import Path
+
+HEADER = ["name", "brand", "price", "rating"]
+MODELS = ["pro", "max", "lite", "mini", "ultra", "plus", "note", "edge"]
+
+
+def generate_csv(
+    path: Path,
+    rows: int | None = None,
+    size: int | None = None,
+    brands: int = 20,
+    dirty_rate: float = 0.0,
+    seed: int = 0,
+) -> int:
+    """
+    Writes product CSV file, same arguments always give the same file.
+
+    Dirty rows have wrong number of columns and are skipped by CsvReader.
+
+    Args:
+        path: Output file path.
+        rows: Number of data rows.
+        size: Approximate file size in bytes, used if rows is None.
+        brands: Number of distinct brands.
+        dirty_rate: Share of malformed rows, from 0 to 1.
+        seed: Random seed.
+
+    Returns:
+        Number of written data rows.
+    """
+
+    if rows is None and size is None:
+        raise ValueError("Either rows or size should be given.")
+
+    rng = random.Random(seed)
+    brand_names = [f"brand{i:04d}" for i in range(brands)]
+    written = 0
+    written_bytes = 0
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+
+        while (written < rows) if rows is not None else (written_bytes < size):
+            brand = rng.choice(brand_names)
+            name = f"{brand} {rng.choice(MODELS)} {rng.randrange(100)}"
+            if rng.random() < 0.05:
+                name += ', 128gb "special"'
+            row = [
+                name,
+                brand,
+                str(rng.randrange(50, 2000)),
+                f"{rng.uniform(1, 5):.1f}",
+            ]
+            if dirty_rate and rng.random() < dirty_rate:
+                row = row[: rng.randrange(1, len(row))]
+            writer.writerow(row)
+            written += 1
+            written_bytes += sum(map(len, row)) + len(row) + 1
+
+    return written
+
+
+def main(args: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate product CSV file.")
+    parser.add_argument("path", type=Path, help="Output file path.")
+    parser.add_argument("--rows", type=int, help="Number of data rows.")
+    parser.add_argument("--size", type=float, help="File size in megabytes.")
+    parser.add_argument("--brands", type=int, default=20, help="Distinct brands.")
+    parser.add_argument("--dirty-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parsed_args = parser.parse_args(args)
+
+    if parsed_args.rows is None and parsed_args.size is None:
+        parser.error("one of --rows or --size is required")
+
+    size = int(parsed_args.size * 1024 * 1024) if parsed_args.size else None
+    written = generate_csv(
+        parsed_args.path,
+        parsed_args.rows,
+        size,
+        parsed_args.brands,
+        parsed_args.dirty_rate,
+        parsed_args.seed,
+    )
+    print(f"Wrote {written} rows to {parsed_args.path}")
+
+
+if __name__ == "__main__":
+    main()
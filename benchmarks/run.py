@@ -0,0 +1,208 @@
+"""
+Benchmark suite for CSV reading, report generation and rendering.
+
+Usage:
+    python benchmarks/run.py --rows 200000 --output results.json
+    python benchmarks/run.py --rows 200000 --compare results.json --threshold 10
+"""
+
+import argparse
+import io
+import json
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate import generate_csv  # noqa: E402
+
+from main import main as cli_main  # noqa: E402
+from utils import AverageRatingReport, CsvReader, TableCreator  # noqa: E402
+
+
+def _run_cli(path: Path) -> None:
+    with redirect_stdout(io.StringIO()):
+        try:
+            cli_main(["--files", str(path), "--report", "average-rating", "--no-cache"])
+        except SystemExit as e:
+            if e.code:
+                raise RuntimeError(f"CLI failed with exit code {e.code}")
+
+
+def build_cases(path: Path, clean_path: Path) -> dict:
+    """
+    Returns benchmark cases: name mapped to (setup, func) pair.
+
+    Setup result is passed to func and isn't included in timings.
+    check_csv_file stops on the first malformed row, so it gets a clean file.
+    """
+
+    def load_rows():
+        return list(CsvReader(path).stream_csv())
+
+    def generate_report():
+        return AverageRatingReport().generate(load_rows())
+
+    return {
+        "check_csv_file": (
+            lambda: None,
+            lambda _: CsvReader(clean_path).check_csv_file,
+        ),
+        "load_csv": (lambda: None, lambda _: CsvReader(path).load_csv),
+        "stream_csv": (
+            lambda: None,
+            lambda _: sum(1 for _ in CsvReader(path).stream_csv()),
+        ),
+        "report_generate": (
+            load_rows,
+            lambda rows: AverageRatingReport().generate(rows),
+        ),
+        "create_table": (
+            generate_report,
+            lambda data: TableCreator(data, "average-rating").create_table(),
+        ),
+        "main": (lambda: None, lambda _: _run_cli(path)),
+    }
+
+
+def measure(setup, func, repeat: int) -> dict:
+    """Returns best wall time of several runs and peak traced memory of one run."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        data = setup()
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+
+    data = setup()
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": best, "peak_memory": peak}
+
+
+def run(
+    path: Path,
+    clean_path: Path,
+    rows: int,
+    repeat: int,
+    only: list[str] | None = None,
+) -> dict:
+    """
+    Runs benchmark cases against CSV file.
+
+    Returns:
+        Dictionary with dataset description and results of every case.
+    """
+
+    size = path.stat().st_size
+    results = {}
+    for name, (setup, func) in build_cases(path, clean_path).items():
+        if only and name not in only:
+            continue
+        result = measure(setup, func, repeat)
+        result["rows_per_second"] = rows / result["seconds"]
+        result["megabytes_per_second"] = size / 1024 / 1024 / result["seconds"]
+        results[name] = result
+        print(
+            f"{name:<18}{result['seconds']:>10.3f}s"
+            f"{result['rows_per_second']:>14,.0f} rows/s"
+            f"{result['peak_memory'] / 1024 / 1024:>10.1f} MiB peak"
+        )
+
+    return {"rows": rows, "file_size": size, "results": results}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compares results with baseline.
+
+    Args:
+        current: Results of this run.
+        baseline: Results loaded from JSON file.
+        threshold: Allowed slowdown in percent.
+
+    Returns:
+        Descriptions of cases that are more than threshold percent slower.
+    """
+
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        change = (result["seconds"] / base["seconds"] - 1) * 100
+        print(f"{name:<18}{change:>+9.1f}%")
+        if change > threshold:
+            regressions.append(f"{name} is {change:.1f}% slower than baseline")
+    return regressions
+
+
+def main(args: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run csv_reports benchmarks.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--brands", type=int, default=20)
+    parser.add_argument("--dirty-rate", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="Run only given cases.")
+    parser.add_argument("--output", type=Path, help="Write results to JSON file.")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Allowed slowdown against baseline in percent (default: 10).",
+    )
+    parsed_args = parser.parse_args(args)
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "products.csv"
+        rows = generate_csv(
+            path,
+            parsed_args.rows,
+            brands=parsed_args.brands,
+            dirty_rate=parsed_args.dirty_rate,
+            seed=parsed_args.seed,
+        )
+        clean_path = path
+        if parsed_args.dirty_rate:
+            clean_path = Path(directory) / "clean.csv"
+            generate_csv(
+                clean_path, rows, brands=parsed_args.brands, seed=parsed_args.seed
+            )
+        current = run(path, clean_path, rows, parsed_args.repeat, parsed_args.only)
+
+    current["params"] = {
+        "rows": parsed_args.rows,
+        "brands": parsed_args.brands,
+        "dirty_rate": parsed_args.dirty_rate,
+        "seed": parsed_args.seed,
+    }
+
+    if parsed_args.output:
+        parsed_args.output.write_text(json.dumps(current, indent=2))
+
+    if parsed_args.compare:
+        baseline = json.loads(parsed_args.compare.read_text())
+        regressions = compare(current, baseline, parsed_args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
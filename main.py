@@ -1,14 +1,12 @@
+import sys
+from argparse import Namespace
 from pathlib import Path
-from rich.console import Console
+from typing import TYPE_CHECKING
 
-from utils import (
-    ArgParser,
-    CsvReader,
-    ReportRegistry,
-    TableCreator,
-    setup_logging,
-    get_logger,
-)
+from utils import ArgParser, get_logger, setup_logging
+
+if TYPE_CHECKING:
+    from utils import Profiler
 
 # Setup logging
 setup_logging()
@@ -25,35 +23,249 @@ def main(args: list[str] = None) -> int:
     Returns:
         Exit code (0 - success, 1 - error)
     """
+    args = sys.argv[1:] if args is None else args
+    if args[:1] == ["serve"]:
+        exit(serve(args[1:]))
+    if args[:1] == ["convert"]:
+        exit(convert(args[1:]))
+
     parser = ArgParser()
     parsed_args = parser.parse_args(args)
+    profile = parsed_args.profile or parsed_args.profile_output or parsed_args.pstats
 
-    console = Console()
-    products: list[dict[str, str]] = []
+    # Reading, reporting and rendering modules are imported only after
+    # arguments are parsed, so that --help and usage errors stay fast
+    from utils import Profiler, profile_calls
 
-    files: set[str] = set(parsed_args.files)
+    profiler = Profiler()
+    with profile_calls(parsed_args.pstats):
+        exit_code = run(parsed_args, profiler)
 
-    for file in files:
-        is_valid, msg = CsvReader(Path(file)).check_csv_file
-        if not is_valid:
-            logger.warning(msg)
-            continue
-        products.extend(CsvReader(Path(file)).load_csv)
+    if profile:
+        from rich.console import Console
 
-    if not products:
-        logger.error("No products found.")
-        exit(1)
+        Console(stderr=True).print(profiler.create_table())
+        if parsed_args.profile_output:
+            profiler.write_trace(parsed_args.profile_output)
+
+    exit(exit_code)
+
+
+def run(parsed_args: Namespace, profiler: "Profiler") -> int:
+    """
+    Generates and prints report.
+
+    Args:
+        parsed_args: Parsed command line arguments.
+        profiler: Profiler to record stages to.
+
+    Returns:
+        Exit code (0 - success, 1 - error)
+    """
+
+    from utils import (
+        MultiReport,
+        ReportRegistry,
+        aggregate_files,
+        as_incremental,
+        check_engine,
+        resolve_output_format,
+        write_rows,
+    )
+
+    report_names = list(dict.fromkeys(parsed_args.report))
+    # Name of report states in cache and checkpoints
+    report_name = ",".join(report_names)
+    if parsed_args.approx:
+        report_name += ":approx"
+    if parsed_args.where:
+        report_name += " where " + " and ".join(map(str, parsed_args.where))
 
     try:
-        report_generator = ReportRegistry.get_report(parsed_args.report)
-        report_data = report_generator.generate(products)
+        check_engine(parsed_args.engine)
+        reports = {
+            name: as_incremental(ReportRegistry.get_report(name, parsed_args.approx))
+            for name in report_names
+        }
+        if len(reports) == 1:
+            report = reports[report_names[0]]
+        else:
+            report = MultiReport(reports)
+        report.engine = parsed_args.engine
+        report.where = tuple(parsed_args.where)
+    except ValueError as e:
+        logger.error(e)
+        return 1
+
+    files = [Path(file) for file in dict.fromkeys(parsed_args.files)]
+
+    if parsed_args.watch:
+        from utils import ReportWatcher
+
+        watcher = ReportWatcher(
+            files,
+            report,
+            report_name,
+            parsed_args.top or parsed_args.bottom,
+            ascending=parsed_args.bottom is not None,
+        )
+        try:
+            watcher.run(parsed_args.refresh_rate)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    try:
+        cache = None
+        if not parsed_args.no_cache:
+            from utils import ReportCache
+
+            cache = ReportCache()
+        checkpoints = None
+        if parsed_args.checkpoint:
+            from utils import CheckpointStore
+
+            checkpoints = CheckpointStore()
+        with profiler.stage("aggregate") as stage:
+            state, rows_count = aggregate_files(
+                files,
+                report,
+                parsed_args.jobs,
+                cache,
+                report_name,
+                profiler,
+                io_concurrency=parsed_args.io_concurrency or 0,
+                read_ahead=parsed_args.read_ahead,
+                checkpoints=checkpoints,
+            )
+            stage.rows = rows_count
+
+        if not rows_count:
+            logger.error("No products found.")
+            return 1
+
+        with profiler.stage("finalize"):
+            limit = parsed_args.top or parsed_args.bottom
+            ascending = parsed_args.bottom is not None
+            if isinstance(report, MultiReport):
+                reports_data = report.finalize_reports(state, limit, ascending)
+            else:
+                reports_data = {
+                    report_names[0]: report.finalize(state, limit, ascending)
+                }
     except Exception as e:
         logger.error(e)
-        exit(1)
+        return 1
 
-    table = TableCreator(report_data, parsed_args.report)
-    console.print(table.create_table())
-    exit(0)
+    with profiler.stage("render") as stage:
+        stage.rows = sum(len(report_data) for report_data in reports_data.values())
+        output_format = resolve_output_format(
+            parsed_args.output, stage.rows, sys.stdout
+        )
+        if output_format != "table":
+            for index, (name, report_data) in enumerate(reports_data.items()):
+                if len(reports_data) > 1 and output_format == "jsonl":
+                    report_data = ({"report": name, **row} for row in report_data)
+                elif index:
+                    # Blank line between reports with different columns
+                    sys.stdout.write("\n")
+                write_rows(report_data, output_format, sys.stdout)
+            return 0
+
+        # Rendering modules are only needed for table output
+        from rich.console import Console
+
+        from utils import TableCreator
+
+        console = Console()
+        for name, report_data in reports_data.items():
+            table = TableCreator(report_data, name)
+            if parsed_args.page_size:
+                for page in table.create_tables(parsed_args.page_size):
+                    console.print(page)
+            else:
+                console.print(table.create_table())
+    return 0
+
+
+def serve(args: list[str]) -> int:
+    """
+    Serves reports until interrupted.
+
+    Args:
+        args: List of serve arguments
+
+    Returns:
+        Exit code (0 - success, 1 - error)
+    """
+
+    from utils import ServeArgParser
+
+    parsed_args = ServeArgParser().parse_args(args)
+
+    import asyncio
+
+    from utils import ReportServer, check_engine
+    from utils.server import serve as serve_reports
+
+    try:
+        check_engine(parsed_args.engine)
+    except ValueError as e:
+        logger.error(e)
+        return 1
+
+    server = ReportServer(
+        parsed_args.files,
+        parsed_args.jobs,
+        parsed_args.engine,
+        parsed_args.memory_limit,
+    )
+    try:
+        asyncio.run(
+            serve_reports(
+                server, parsed_args.host, parsed_args.port, parsed_args.socket
+            )
+        )
+    except KeyboardInterrupt:
+        logger.info("Server stopped")
+    except OSError as e:
+        logger.error(e)
+        return 1
+    return 0
+
+
+def convert(args: list[str]) -> int:
+    """
+    Converts CSV files into a columnar file.
+
+    Args:
+        args: List of convert arguments
+
+    Returns:
+        Exit code (0 - success, 1 - error)
+    """
+
+    from utils import ConvertArgParser
+
+    parsed_args = ConvertArgParser().parse_args(args)
+
+    from utils import COLUMNAR_SUFFIX, CsvValidationError, convert_files
+
+    if parsed_args.output.suffix != COLUMNAR_SUFFIX:
+        logger.error(f"Output file must have {COLUMNAR_SUFFIX} extension.")
+        return 1
+
+    files = [Path(file) for file in dict.fromkeys(parsed_args.files)]
+    try:
+        rows_count = convert_files(files, parsed_args.output)
+    except (CsvValidationError, OSError) as e:
+        logger.error(e)
+        return 1
+
+    if not rows_count:
+        logger.error("No products found.")
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
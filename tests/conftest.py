@@ -5,6 +5,15 @@ from pathlib import Path
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep report cache of every test in its own temporary directory."""
+
+    directory = tmp_path / "cache"
+    monkeypatch.setenv("CSV_REPORTS_CACHE_DIR", str(directory))
+    return directory
+
+
 @pytest.fixture
 def sample_csv_data():
     """Sample CSV data for testing."""
@@ -84,3 +93,41 @@ def non_csv_file():
 def nonexistent_file():
     """Path to a non-existent file."""
     return Path("nonexistent_file.csv")
+
+
+@pytest.fixture
+def malformed_rows_csv_file():
+    """Create a temporary CSV file with some malformed rows."""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(
+            "name,brand,price,rating\n"
+            "iphone 15 pro,apple,999,4.9\n"
+            "broken row,apple\n"
+            "galaxy a54,samsung,349,4.2\n"
+            "too,many,columns,in,row\n"
+        )
+        temp_path = Path(f.name)
+
+    yield temp_path
+
+    temp_path.unlink()
+
+
+@pytest.fixture
+def multiline_csv_file():
+    """Create a temporary CSV file with quoted fields spanning several lines."""
+
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".csv", delete=False, newline=""
+    ) as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "brand", "price", "rating"])
+        for i in range(200):
+            name = f'phone {i}\nwith "long"\nname' if i % 7 == 0 else f"phone {i}"
+            writer.writerow([name, f"brand{i % 5}", str(100 + i), f"{i % 5}.{i % 10}"])
+        temp_path = Path(f.name)
+
+    yield temp_path
+
+    temp_path.unlink()
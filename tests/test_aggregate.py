@@ -0,0 +1,143 @@
+import pickle
+
+import pytest
+
+from utils import (
+    AggregateReport,
+    AggregateSpec,
+    ReportRegistry,
+    aggregate_report,
+    scan_file,
+)
+from utils.aggregate import Aggregate
+
+
+class TestAggregateSpec:
+    def test_parse(self):
+        spec = AggregateSpec.parse(
+            "group_by=brand, agg=mean(rating), count(), sum(price) as total"
+        )
+
+        assert spec == AggregateSpec(
+            "brand",
+            (
+                Aggregate("mean", "rating"),
+                Aggregate("count"),
+                Aggregate("sum", "price", "total"),
+            ),
+        )
+        assert [a.name for a in spec.aggregates] == ["mean_rating", "count", "total"]
+
+    @pytest.mark.parametrize(
+        "spec, message",
+        [
+            ("agg=count()", "no group_by"),
+            ("group_by=brand", "no aggregates"),
+            ("group_by=brand, agg=median(rating)", "Unknown aggregate function"),
+            ("group_by=brand, agg=sum()", "Invalid aggregate"),
+            ("group_by=brand, agg=count(rating)", "Invalid aggregate"),
+            ("group_by=brand, agg=sum(brand)", "Can't aggregate"),
+            ("group_by=brand, agg=count(), count()", "duplicate"),
+            ("brand, agg=count()", "Invalid aggregate spec part"),
+        ],
+    )
+    def test_parse_invalid(self, spec, message):
+        with pytest.raises(ValueError, match=message):
+            AggregateSpec.parse(spec)
+
+
+class TestAggregateReport:
+    spec = (
+        "group_by=brand, agg=mean(rating), count(), sum(price), min(price), max(price)"
+    )
+
+    def test_generate(self, sample_csv_data):
+        result = AggregateReport(self.spec).generate(sample_csv_data)
+
+        assert result[0] == {
+            "brand": "apple",
+            "mean_rating": 4.8,
+            "count": 2,
+            "sum_price": 1798.0,
+            "min_price": 799.0,
+            "max_price": 999.0,
+        }
+        assert [row["brand"] for row in result] == ["apple", "xiaomi", "samsung"]
+
+    def test_shares_totals(self):
+        report = AggregateReport("group_by=brand, agg=mean(price), sum(price)")
+
+        assert report._empty_totals == [0, 0]
+        assert report.columns == {"brand": "category", "price": "float"}
+
+    def test_batches_match_rows(self, temp_csv_file, sample_csv_data):
+        report = AggregateReport(self.spec)
+        scan = scan_file(temp_csv_file, report)
+
+        assert report.finalize(scan.state) == report.generate(sample_csv_data)
+
+    def test_count_only(self, temp_csv_file):
+        report = AggregateReport("group_by=brand, agg=count() as products")
+        scan = scan_file(temp_csv_file, report)
+
+        assert report.finalize(scan.state, limit=1) == [
+            {"brand": "apple", "products": 2}
+        ]
+        assert report.finalize(scan.state, limit=1, ascending=True) == [
+            {"brand": "xiaomi", "products": 1}
+        ]
+
+    def test_merge(self, sample_csv_data):
+        report = AggregateReport(self.spec)
+        first, second = report.init_state(), report.init_state()
+        for row in sample_csv_data[:2]:
+            report.update(first, row)
+        for row in sample_csv_data[2:]:
+            report.update(second, row)
+
+        merged = report.merge(first, second)
+        assert report.finalize(merged) == report.generate(sample_csv_data)
+
+    def test_registered_report_is_picklable(self, monkeypatch):
+        monkeypatch.setattr(ReportRegistry, "_reports", dict(ReportRegistry._reports))
+        report_class = aggregate_report("group_by=brand, agg=max(rating)")
+        ReportRegistry.register_report("test-max-rating", report_class)
+        report = ReportRegistry.get_report("test-max-rating")
+
+        restored = pickle.loads(pickle.dumps(report))
+        assert restored.spec == report.spec
+        assert restored.columns == {"brand": "category", "rating": "float"}
+
+    def test_register_spec_string(self, monkeypatch, sample_csv_data):
+        monkeypatch.setattr(ReportRegistry, "_reports", dict(ReportRegistry._reports))
+        ReportRegistry.register_report(
+            "test-prices", "group_by=brand, agg=max(price), count()"
+        )
+        report = ReportRegistry.get_report("test-prices")
+
+        assert isinstance(report, AggregateReport)
+        assert report.generate(sample_csv_data)[0] == {
+            "brand": "samsung",
+            "max_price": 1199.0,
+            "count": 2,
+        }
+
+    def test_register_invalid_string(self, monkeypatch):
+        monkeypatch.setattr(ReportRegistry, "_reports", dict(ReportRegistry._reports))
+
+        with pytest.raises(ValueError, match="Unknown aggregate function"):
+            ReportRegistry.register_report("test-bad", "group_by=brand, agg=mode(x)")
+        with pytest.raises(ValueError, match="expected 'module:ClassName'"):
+            ReportRegistry.register_report("test-bad", "brand, agg=max(price)")
+        assert "test-bad" not in ReportRegistry._reports
+
+    def test_brand_summary(self, sample_csv_data):
+        report = ReportRegistry.get_report("brand-summary")
+
+        assert report.generate(sample_csv_data)[0] == {
+            "brand": "apple",
+            "rating": 4.8,
+            "products": 2,
+            "min_price": 799.0,
+            "max_price": 999.0,
+        }
@@ -0,0 +1,118 @@
+import pickle
+import random
+
+import pytest
+
+from utils import ReportRegistry, scan_file
+from utils.approx import (
+    ApproxAverageRatingReport,
+    RatingPercentilesReport,
+    RatingTailsReport,
+)
+
+
+class TestApproxAverageRatingReport:
+    def test_generate_small_data_is_exact(self, sample_csv_data):
+        result = ApproxAverageRatingReport().generate(sample_csv_data)
+
+        assert result[0] == {
+            "brand": "apple",
+            "rating": 4.8,
+            "rating_error": 0.0,
+            "median_rating": 4.8,
+            "products": 2,
+            "products_error": 0,
+        }
+        assert [row["brand"] for row in result] == ["apple", "xiaomi", "samsung"]
+
+    def test_batches_match_rows(self, temp_csv_file, sample_csv_data):
+        report = ApproxAverageRatingReport()
+        scan = scan_file(temp_csv_file, report)
+
+        assert report.finalize(scan.state) == report.generate(sample_csv_data)
+
+    def test_sampled_mean_has_error_bound(self):
+        random.seed(0)
+        report = ApproxAverageRatingReport()
+        report.sample_size = 50
+        rows = [
+            {"brand": "apple", "name": f"phone {i % 80}", "rating": str(i % 5 + 1)}
+            for i in range(1000)
+        ]
+        first, second = report.init_state(), report.init_state()
+        for row in rows[:500]:
+            report.update(first, row)
+        for row in rows[500:]:
+            report.update(second, row)
+
+        state = pickle.loads(pickle.dumps(report.merge(first, second)))
+        (row,) = report.finalize(state)
+
+        assert len(state["apple"].ratings.items) == 50
+        assert row["rating_error"] > 0
+        assert abs(row["rating"] - 3) <= row["rating_error"] + 0.01
+        assert row["median_rating"] == pytest.approx(3, abs=0.5)
+        assert abs(row["products"] - 80) <= row["products_error"]
+
+    def test_registry(self):
+        report = ReportRegistry.get_report("average-rating", approx=True)
+        assert isinstance(report, ApproxAverageRatingReport)
+
+        with pytest.raises(ValueError, match="has no approximate version"):
+            ReportRegistry.get_report("brand-summary", approx=True)
+
+
+class TestRatingPercentilesReport:
+    def test_generate(self, sample_csv_data):
+        result = RatingPercentilesReport().generate(sample_csv_data)
+
+        assert result == [
+            {"brand": "apple", "median": 4.8, "p90": 4.9, "ratings": 2},
+            {"brand": "xiaomi", "median": 4.6, "p90": 4.6, "ratings": 1},
+            {"brand": "samsung", "median": 4.5, "p90": 4.8, "ratings": 2},
+        ]
+
+    def test_batches_match_rows(self, temp_csv_file, sample_csv_data):
+        report = RatingPercentilesReport((0.25, 0.5, 0.999))
+        scan = scan_file(temp_csv_file, report)
+
+        result = report.finalize(scan.state)
+        assert list(result[0]) == ["brand", "p25", "median", "p99.9", "ratings"]
+        assert result == report.generate(sample_csv_data)
+
+    def test_merged_parts_are_bounded_and_accurate(self):
+        report = RatingPercentilesReport(compression=50)
+        generator = random.Random(7)
+        ratings = [round(generator.uniform(1, 5), 1) for _ in range(20000)]
+
+        states = [report.init_state() for _ in range(4)]
+        for index, rating in enumerate(ratings):
+            report.update(states[index % 4], {"brand": "apple", "rating": str(rating)})
+
+        state = report.init_state()
+        for part in states:
+            report.merge(state, pickle.loads(pickle.dumps(part)))
+        (row,) = report.finalize(state)
+
+        ordered = sorted(ratings)
+        assert len(state["apple"].centroids) <= 50
+        assert row["ratings"] == len(ratings)
+        assert row["median"] == pytest.approx(ordered[len(ordered) // 2], abs=0.05)
+        assert row["p90"] == pytest.approx(ordered[int(len(ordered) * 0.9)], abs=0.05)
+
+    def test_invalid_percentiles(self):
+        with pytest.raises(ValueError, match="Percentiles must be from 0 to 1"):
+            RatingPercentilesReport((0.5, 90))
+
+    def test_registered_tails_variant(self, temp_csv_file, sample_csv_data):
+        report = ReportRegistry.get_report("rating-tails")
+
+        assert isinstance(report, RatingTailsReport)
+        assert report.compression == 500
+        assert isinstance(
+            ReportRegistry.get_report("rating-tails", approx=True), RatingTailsReport
+        )
+        scan = scan_file(temp_csv_file, report)
+        result = report.finalize(scan.state)
+        assert list(result[0]) == ["brand", "p1", "p99", "ratings"]
+        assert result == report.generate(sample_csv_data)
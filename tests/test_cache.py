@@ -0,0 +1,96 @@
+import os
+
+from utils import AverageRatingReport, ReportCache, aggregate_files, scan_file
+from utils import pipeline
+
+
+class TestReportCache:
+    """Test cases for ReportCache class."""
+
+    def test_put_and_get(self, temp_csv_file, cache_dir):
+        cache = ReportCache()
+        scan = scan_file(temp_csv_file, AverageRatingReport())
+
+        assert cache.get(temp_csv_file, "average-rating") is None
+        cache.put(scan, "average-rating")
+        cached = cache.get(temp_csv_file, "average-rating")
+
+        assert cache.directory == cache_dir
+        assert cached.state == scan.state
+        assert cached.rows_count == scan.rows_count
+
+    def test_key_includes_report_name(self, temp_csv_file):
+        cache = ReportCache()
+        cache.put(scan_file(temp_csv_file, AverageRatingReport()), "average-rating")
+
+        assert cache.get(temp_csv_file, "other-report") is None
+
+    def test_changed_file_is_not_served(self, temp_csv_file):
+        cache = ReportCache()
+        cache.put(scan_file(temp_csv_file, AverageRatingReport()), "average-rating")
+
+        stat = temp_csv_file.stat()
+        os.utime(temp_csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert cache.get(temp_csv_file, "average-rating") is None
+
+    def test_broken_entry_is_removed(self, temp_csv_file, cache_dir):
+        cache = ReportCache()
+        cache.put(scan_file(temp_csv_file, AverageRatingReport()), "average-rating")
+        (entry,) = cache_dir.glob("*.state")
+        entry.write_bytes(b"garbage")
+
+        assert cache.get(temp_csv_file, "average-rating") is None
+        assert not entry.exists()
+
+    def test_evicts_least_recently_used(self, temp_csv_file, cache_dir):
+        scan = scan_file(temp_csv_file, AverageRatingReport())
+        cache = ReportCache()
+        for name in ("first", "second"):
+            cache.put(scan, name)
+        entry_size = next(cache_dir.glob("*.state")).stat().st_size
+
+        for number, entry in enumerate(sorted(cache_dir.glob("*.state"))):
+            os.utime(entry, ns=(0, number * 10**9))
+        cache.get(temp_csv_file, "first")
+
+        cache.max_size = entry_size * 2
+        cache.put(scan, "third")
+
+        assert cache.get(temp_csv_file, "first") is not None
+        assert cache.get(temp_csv_file, "second") is None
+        assert cache.get(temp_csv_file, "third") is not None
+
+    def test_lists_directory_only_when_limit_is_exceeded(
+        self, temp_csv_file, cache_dir, monkeypatch
+    ):
+        scan = scan_file(temp_csv_file, AverageRatingReport())
+        cache = ReportCache()
+        evictions = []
+        evict = cache.evict
+        monkeypatch.setattr(cache, "evict", lambda: evictions.append(evict()))
+
+        for number in range(5):
+            cache.put(scan, f"report {number}")
+        assert len(evictions) == 1
+
+        entry_size = next(cache_dir.glob("*.state")).stat().st_size
+        cache.max_size = entry_size * 5
+        cache.put(scan, "report 5")
+
+        assert len(evictions) == 2
+        assert len(list(cache_dir.glob("*.state"))) == 5
+        assert cache.size == entry_size * 5
+
+    def test_aggregate_files_uses_cache(self, temp_csv_file, monkeypatch):
+        report = AverageRatingReport()
+        cache = ReportCache()
+        expected = aggregate_files([temp_csv_file], report, cache=cache)
+
+        def scan_files(files, *args):
+            assert not files, "File was parsed again"
+            yield from ()
+
+        monkeypatch.setattr(pipeline, "scan_files", scan_files)
+
+        assert aggregate_files([temp_csv_file], report, cache=cache) == expected
@@ -0,0 +1,109 @@
+import pytest
+
+from utils import AverageRatingReport, CheckpointStore, aggregate_files, scan_file
+from utils import checkpoint as checkpoint_module
+
+REPORT = "average-rating"
+
+
+@pytest.fixture
+def ranges(monkeypatch):
+    """Records byte ranges scanned by checkpoints."""
+
+    scanned = []
+    scan_range = checkpoint_module.scan_range
+
+    def recording_scan_range(file, start, end, *args):
+        scanned.append((start, end))
+        return scan_range(file, start, end, *args)
+
+    monkeypatch.setattr(checkpoint_module, "scan_range", recording_scan_range)
+    return scanned
+
+
+def append(file, text):
+    with open(file, "a", newline="") as f:
+        f.write(text)
+
+
+class TestCheckpointStore:
+    """Test cases for CheckpointStore class."""
+
+    def test_first_scan_matches_full_scan(self, multiline_csv_file):
+        report = AverageRatingReport()
+        scan = CheckpointStore().scan(multiline_csv_file, report, REPORT)
+        expected = scan_file(multiline_csv_file, report)
+
+        assert scan.state == expected.state
+        assert scan.rows_count == expected.rows_count
+
+    def test_only_appended_data_is_scanned(self, temp_csv_file, ranges):
+        report = AverageRatingReport()
+        CheckpointStore().scan(temp_csv_file, report, REPORT)
+        size = temp_csv_file.stat().st_size
+
+        append(temp_csv_file, "pixel 8,google,699,4.5\nbroken,row\n")
+        scan = CheckpointStore().scan(temp_csv_file, report, REPORT)
+
+        assert ranges[-1] == (size, temp_csv_file.stat().st_size)
+        assert scan.state == scan_file(temp_csv_file, report).state
+        assert scan.rows_count == 6
+        assert [error.line for error in scan.errors] == [8]
+
+    def test_unchanged_file_isnt_scanned(self, temp_csv_file, ranges):
+        store = CheckpointStore()
+        store.scan(temp_csv_file, AverageRatingReport(), REPORT)
+        scan = store.scan(temp_csv_file, AverageRatingReport(), REPORT)
+
+        assert len(ranges) == 1
+        assert scan.rows_count == 5
+
+    def test_rewritten_file_is_scanned_again(self, temp_csv_file, ranges):
+        report = AverageRatingReport()
+        store = CheckpointStore()
+        store.scan(temp_csv_file, report, REPORT)
+
+        temp_csv_file.write_text("name,brand,price,rating\nphone,google,1,3.0\n")
+        scan = store.scan(temp_csv_file, report, REPORT)
+
+        assert ranges[-1][0] == len("name,brand,price,rating\n")
+        assert scan.state == {"google": [3.0, 1]}
+
+    def test_truncated_file_is_scanned_again(self, temp_csv_file):
+        report = AverageRatingReport()
+        store = CheckpointStore()
+        store.scan(temp_csv_file, report, REPORT)
+
+        lines = temp_csv_file.read_text().splitlines(keepends=True)
+        temp_csv_file.write_text("".join(lines[:3]))
+        scan = store.scan(temp_csv_file, report, REPORT)
+
+        assert scan.rows_count == 2
+
+    def test_trailing_line_isnt_checkpointed(self, temp_csv_file):
+        report = AverageRatingReport()
+        store = CheckpointStore()
+        store.scan(temp_csv_file, report, REPORT)
+
+        append(temp_csv_file, "pixel 8,google,699,4")
+        assert store.scan(temp_csv_file, report, REPORT).rows_count == 6
+
+        append(temp_csv_file, ".5\n")
+        scan = store.scan(temp_csv_file, report, REPORT)
+
+        assert scan.rows_count == 6
+        assert scan.state["google"] == [4.5, 1]
+
+    def test_not_incremental_files(self, non_csv_file, nonexistent_file):
+        store = CheckpointStore()
+
+        assert store.scan(non_csv_file, AverageRatingReport(), REPORT) is None
+        assert store.scan(nonexistent_file, AverageRatingReport(), REPORT) is None
+
+    def test_aggregate_files(self, temp_csv_file, multiline_csv_file, ranges):
+        files = [temp_csv_file, multiline_csv_file]
+        report = AverageRatingReport()
+        expected = aggregate_files(files, report)
+
+        assert aggregate_files(files, report, checkpoints=CheckpointStore()) == expected
+        assert len(ranges) == 2
@@ -0,0 +1,154 @@
+import json
+
+import pytest
+
+from utils import (
+    AverageRatingReport,
+    ColumnarFile,
+    CsvReader,
+    CsvValidationError,
+    NumericParseError,
+    convert_files,
+    scan_file,
+)
+
+
+@pytest.fixture
+def columnar_file(temp_csv_file, multiline_csv_file, tmp_path):
+    """Columnar file converted from two CSV files."""
+
+    path = tmp_path / "products.csvcol"
+    convert_files([temp_csv_file, multiline_csv_file], path)
+    return path
+
+
+class TestColumnar:
+    """Test cases for columnar files."""
+
+    def test_schema_and_stats(self, columnar_file):
+        columnar = ColumnarFile(columnar_file)
+
+        assert columnar.rows == 205
+        assert columnar.header == ["name", "brand", "price", "rating"]
+        assert [info.kind for info in columnar.columns.values()] == [
+            "category",
+            "category",
+            "int",
+            "float",
+        ]
+        assert columnar.columns["price"].min == 100
+        assert columnar.columns["price"].max == 1199
+        assert columnar.columns["rating"].max == 4.9
+        assert columnar.columns["brand"].min == "apple"
+
+    def test_scan_matches_csv(self, columnar_file, temp_csv_file, multiline_csv_file):
+        report = AverageRatingReport()
+        state = report.merge(
+            scan_file(temp_csv_file, report).state,
+            scan_file(multiline_csv_file, report).state,
+        )
+        scan = scan_file(columnar_file, report)
+
+        assert scan.error is None
+        assert scan.rows_count == 205
+        assert report.finalize(scan.state) == report.finalize(state)
+
+    def test_stream_columns_batches(self, columnar_file):
+        batches = list(
+            CsvReader(columnar_file).stream_columns(
+                {"brand": "category", "price": "float"}, batch_size=100
+            )
+        )
+
+        assert [batch.size for batch in batches] == [100, 100, 5]
+        assert batches[0].columns["price"][0] == 999.0
+        assert list(batches[0].columns["brand"])[:2] == ["apple", "samsung"]
+
+    def test_stream_csv(self, columnar_file, temp_csv_file, sample_csv_data):
+        rows = list(CsvReader(columnar_file).stream_csv())
+
+        assert rows[:5] == sample_csv_data
+        assert rows[5]["name"] == 'phone 0\nwith "long"\nname'
+        assert CsvReader(columnar_file).check_csv_file == (True, "Valid CSV file.")
+
+    def test_missing_column(self, columnar_file):
+        with pytest.raises(CsvValidationError, match="has no column 'color'"):
+            list(CsvReader(columnar_file).stream_columns({"color": "category"}))
+
+    def test_category_read_as_numbers(self, tmp_path):
+        csv_file = tmp_path / "bad.csv"
+        csv_file.write_text("brand,rating\napple,4.5\nsamsung,good\n")
+        path = tmp_path / "bad.csvcol"
+        convert_files([csv_file], path)
+
+        with pytest.raises(
+            NumericParseError, match=r"value good to numeric. \(line 2\)"
+        ):
+            list(CsvReader(path).stream_columns({"rating": "float"}))
+
+    @pytest.mark.parametrize(
+        "values, kind",
+        [
+            (["00123", "124", "7"], "category"),
+            ([str(10**23), "1", "-5"], "category"),
+            ([str(2**63), "0"], "category"),
+            (["5", "5.0", "4.5"], "category"),
+            (["5", "4.5", "4.0"], "float"),
+            (["999", "349.99", "1e3", "0.50"], "float"),
+            (["999", "999.00"], "category"),
+        ],
+    )
+    def test_round_trip_keeps_values(self, tmp_path, values, kind):
+        csv_file = tmp_path / "values.csv"
+        csv_file.write_text("sku\n" + "\n".join(values) + "\n")
+        path = tmp_path / "values.csvcol"
+        convert_files([csv_file], path)
+
+        assert ColumnarFile(path).columns["sku"].kind == kind
+        assert CsvReader(path).load_csv == CsvReader(csv_file).load_csv
+
+    def test_mixed_ints_and_floats(self, tmp_path):
+        csv_file = tmp_path / "values.csv"
+        csv_file.write_text("brand,rating\napple,5\nsamsung,4.5\napple,4\n")
+        path = tmp_path / "values.csvcol"
+        convert_files([csv_file], path)
+
+        info = ColumnarFile(path).columns["rating"]
+        assert info.kind == "float"
+        assert (info.min, info.max) == (4.0, 5.0)
+        (batch,) = CsvReader(path).stream_columns({"rating": "float"})
+        assert list(batch.columns["rating"]) == [5.0, 4.5, 4.0]
+        assert [row["rating"] for row in CsvReader(path).load_csv] == ["5", "4.5", "4"]
+
+    def test_round_trip_numbers(self, tmp_path):
+        csv_file = tmp_path / "values.csv"
+        csv_file.write_text(f"id,rating\n{2**63 - 1},4.5\n-12,0.25\n")
+        path = tmp_path / "values.csvcol"
+        convert_files([csv_file], path)
+
+        columns = ColumnarFile(path).columns
+        assert [columns["id"].kind, columns["rating"].kind] == ["int", "float"]
+        assert CsvReader(path).load_csv == CsvReader(csv_file).load_csv
+
+    def test_different_headers(self, temp_csv_file, tmp_path):
+        other = tmp_path / "other.csv"
+        other.write_text("brand,rating\napple,4.5\n")
+
+        with pytest.raises(CsvValidationError, match="differs"):
+            convert_files([temp_csv_file, other], tmp_path / "out.csvcol")
+
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / "broken.csvcol"
+        path.write_bytes(b"name,brand\n")
+
+        is_valid, message = CsvReader(path).check_csv_file
+
+        assert not is_valid
+        assert "is not a valid columnar file" in message
+
+    def test_header_is_json(self, columnar_file):
+        data = columnar_file.read_bytes()
+        size = int.from_bytes(data[8:16], "little")
+        end = 16 + size
+
+        assert json.loads(data[16:end])["rows"] == 205
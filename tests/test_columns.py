@@ -0,0 +1,65 @@
+from array import array
+
+import pytest
+
+from utils import Categorical, NumericParseError
+from utils.shortcuts import ColumnBatchBuilder
+
+HEADER = ["name", "brand", "price", "rating"]
+
+
+class TestColumnBatchBuilder:
+    """Test cases for ColumnBatchBuilder class."""
+
+    def test_build_typed_columns(self):
+        builder = ColumnBatchBuilder(
+            {"brand": "category", "price": "int", "rating": "float"}, HEADER
+        )
+        builder.append(["iphone", "apple", "999", "4.9"])
+        builder.append(["galaxy", "samsung", "1199", "4.8"])
+        builder.append(["iphone 14", "apple", "799", "4.7"])
+
+        batch = builder.build()
+
+        assert batch.size == 3
+        assert batch.columns["brand"].codes == array("I", [0, 1, 0])
+        assert batch.columns["brand"].categories == ["apple", "samsung"]
+        assert batch.columns["price"] == array("q", [999, 1199, 799])
+        assert batch.columns["rating"] == array("d", [4.9, 4.8, 4.7])
+
+    def test_categories_shared_between_batches(self):
+        builder = ColumnBatchBuilder({"brand": "category"}, HEADER)
+        builder.append(["iphone", "apple", "999", "4.9"])
+        first = builder.build()
+        builder.append(["galaxy", "samsung", "1199", "4.8"])
+        builder.append(["iphone 14", "apple", "799", "4.7"])
+        second = builder.build()
+
+        assert first.size == 1
+        assert list(first.columns["brand"]) == ["apple"]
+        assert list(second.columns["brand"]) == ["samsung", "apple"]
+
+    def test_missing_column(self):
+        with pytest.raises(KeyError):
+            ColumnBatchBuilder({"color": "category"}, HEADER)
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError, match="Unknown column kind"):
+            ColumnBatchBuilder({"brand": "text"}, HEADER)
+
+    def test_invalid_numbers_reported_together(self):
+        builder = ColumnBatchBuilder({"rating": "float"}, HEADER)
+        builder.append(["iphone", "apple", "999", "four"], line=2)
+        builder.append(["galaxy", "samsung", "1199", "4.8"], line=3)
+        builder.append(["redmi", "xiaomi", "199", ""], line=4)
+
+        with pytest.raises(NumericParseError) as error:
+            builder.build()
+
+        assert error.value.bad_values == [(2, "four"), (4, "")]
+        assert "Cannot convert value four to numeric. (line 2)" in str(error.value)
+
+    def test_categorical_len(self):
+        column = Categorical(array("I", [0, 1, 0]), ["apple", "samsung"])
+
+        assert len(column) == 3
@@ -0,0 +1,109 @@
+import bz2
+import gzip
+import io
+
+import pytest
+
+from utils import AverageRatingReport, CsvReader, scan_file
+from utils import compression
+from utils.compression import ReadAheadReader, get_compression
+
+
+@pytest.fixture(params=["gz", "bz2"])
+def compressed_csv_file(request, multiline_csv_file, tmp_path):
+    """Compressed copy of multiline CSV file."""
+
+    data = multiline_csv_file.read_bytes()
+    path = tmp_path / f"products.csv.{request.param}"
+    if request.param == "gz":
+        # Two gzip members, as written by concatenating compressed files
+        middle = len(data) // 2
+        path.write_bytes(gzip.compress(data[:middle]) + gzip.compress(data[middle:]))
+    else:
+        path.write_bytes(bz2.compress(data))
+    return path
+
+
+class TestCompression:
+    """Test cases for compressed CSV files."""
+
+    def test_get_compression(self, tmp_path):
+        assert get_compression(tmp_path / "a.csv.gz") == "gzip"
+        assert get_compression(tmp_path / "a.csv.zst") == "zstandard"
+        assert get_compression(tmp_path / "a.csv") is None
+
+    def test_stream_csv(self, compressed_csv_file, multiline_csv_file):
+        rows = list(CsvReader(compressed_csv_file).stream_csv())
+
+        assert rows == list(CsvReader(multiline_csv_file).stream_csv())
+        assert len(rows) == 200
+
+    def test_scan_file(self, compressed_csv_file, multiline_csv_file):
+        report = AverageRatingReport()
+        scan = scan_file(compressed_csv_file, report)
+
+        assert scan.error is None
+        assert scan.state == scan_file(multiline_csv_file, report).state
+
+    def test_check_and_load(self, compressed_csv_file):
+        reader = CsvReader(compressed_csv_file)
+
+        assert reader.check_csv_file == (True, "Valid CSV file.")
+        assert len(reader.load_csv) == 200
+
+    def test_read_header(self, compressed_csv_file):
+        header, _ = CsvReader(compressed_csv_file).read_header()
+
+        assert header == ["name", "brand", "price", "rating"]
+
+    def test_data_read_in_advance(self, compressed_csv_file):
+        reader = CsvReader(compressed_csv_file, compressed_csv_file.read_bytes())
+
+        assert len(list(reader.stream_csv())) == 200
+
+    def test_zstandard(self, multiline_csv_file, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        path = tmp_path / "products.csv.zst"
+        path.write_bytes(
+            zstandard.ZstdCompressor().compress(multiline_csv_file.read_bytes())
+        )
+
+        assert len(list(CsvReader(path).stream_csv())) == 200
+
+    def test_missing_module(self, tmp_path, monkeypatch):
+        path = tmp_path / "products.csv.zst"
+        path.write_bytes(b"")
+        monkeypatch.setattr(compression, "find_spec", lambda name: None)
+
+        is_valid, message = CsvReader(path).check_csv_file
+
+        assert not is_valid
+        assert "requires zstandard module" in message
+
+    def test_not_csv(self, tmp_path):
+        path = tmp_path / "products.txt.gz"
+        path.write_bytes(gzip.compress(b"name\nphone\n"))
+
+        assert CsvReader(path).check_csv_file == (
+            False,
+            f"File {path} is not a CSV file!",
+        )
+
+    def test_corrupted(self, tmp_path):
+        path = tmp_path / "products.csv.gz"
+        path.write_bytes(gzip.compress(b"name,brand\n" * 1000)[:-20])
+
+        is_valid, message = CsvReader(path).check_csv_file
+
+        assert not is_valid
+        assert message.startswith("Error reading file")
+
+    def test_read_ahead_reader_closed_early(self):
+        stream = io.BytesIO(b"x" * 100)
+        reader = ReadAheadReader(stream, chunk_size=1, depth=1)
+
+        assert reader.read(3) == b"x"
+        reader.close()
+
+        assert stream.closed
+        assert not reader.thread.is_alive()
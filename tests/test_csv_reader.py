@@ -1,6 +1,8 @@
+import logging
+
 import pytest
 
-from utils import CsvReader
+from utils import CsvReader, CsvValidationError, Predicate, RowError, convert_files
 
 
 class TestCsvReader:
@@ -76,3 +78,330 @@ class TestCsvReader:
 
         with pytest.raises(FileNotFoundError):
             reader.load_csv
+
+    def test_stream_csv_valid(self, temp_csv_file, sample_csv_data):
+        """Test streaming a valid CSV file."""
+
+        reader = CsvReader(temp_csv_file)
+        data = list(reader.stream_csv())
+
+        assert data == sample_csv_data
+        assert reader.rows_count == len(sample_csv_data)
+        assert reader.errors == []
+
+    def test_stream_csv_is_lazy(self, temp_csv_file, sample_csv_data):
+        """Test that rows are yielded one by one."""
+
+        stream = CsvReader(temp_csv_file).stream_csv()
+
+        assert next(stream) == sample_csv_data[0]
+
+    def test_stream_csv_malformed_rows(self, malformed_rows_csv_file):
+        """Test that malformed rows are skipped and reported."""
+
+        reader = CsvReader(malformed_rows_csv_file)
+        data = list(reader.stream_csv())
+
+        assert [row["brand"] for row in data] == ["apple", "samsung"]
+        assert reader.errors_count == 2
+        assert all(isinstance(error, RowError) for error in reader.errors)
+        assert [error.line for error in reader.errors] == [3, 5]
+        assert "Expected 4 columns, got 2" in reader.errors[0].message
+
+    def test_stream_csv_strict(self, malformed_rows_csv_file):
+        """Test that strict mode stops on the first malformed row."""
+
+        reader = CsvReader(malformed_rows_csv_file)
+
+        with pytest.raises(CsvValidationError, match="not a valid CSV format"):
+            list(reader.stream_csv(strict=True))
+
+    def test_stream_csv_empty(self, empty_csv_file):
+        """Test streaming a CSV file with header only."""
+
+        with pytest.raises(CsvValidationError, match="is empty!"):
+            list(CsvReader(empty_csv_file).stream_csv())
+
+    def test_stream_csv_nonexistent(self, nonexistent_file):
+        """Test streaming a non-existent file."""
+
+        with pytest.raises(CsvValidationError, match="does not exist!"):
+            list(CsvReader(nonexistent_file).stream_csv())
+
+    def test_read_header(self, temp_csv_file):
+        reader = CsvReader(temp_csv_file)
+        header, data_start = reader.read_header()
+
+        assert header == ["name", "brand", "price", "rating"]
+        assert data_start == len("name,brand,price,rating\r\n")
+        assert reader.lines_count == 1
+
+    def test_stream_range_covers_all_records(self, multiline_csv_file):
+        """Test that records of all ranges are the same as of the whole file."""
+
+        expected = list(CsvReader(multiline_csv_file).stream_csv())
+        reader = CsvReader(multiline_csv_file)
+        header, data_start = reader.read_header()
+
+        for chunks in (1, 2, 3, 13):
+            rows = []
+            inside = False
+            aligned = True
+            for start, end in reader.split_ranges(data_start, chunks):
+                range_reader = CsvReader(multiline_csv_file)
+                rows.extend(
+                    range_reader.stream_range(
+                        start, end, header, exact_start=start == data_start
+                    )
+                )
+                aligned &= not range_reader.head_inside[inside]
+                inside = range_reader.end_inside[inside]
+
+            if aligned:
+                assert rows == expected
+
+    def test_stream_columns(self, temp_csv_file, sample_csv_data):
+        reader = CsvReader(temp_csv_file)
+        batches = list(
+            reader.stream_columns(
+                {"brand": "category", "rating": "float"}, batch_size=2
+            )
+        )
+
+        assert [batch.size for batch in batches] == [2, 2, 1]
+        brands = [brand for batch in batches for brand in batch.columns["brand"]]
+        ratings = [rating for batch in batches for rating in batch.columns["rating"]]
+        assert brands == [row["brand"] for row in sample_csv_data]
+        assert ratings == [float(row["rating"]) for row in sample_csv_data]
+
+    def test_stream_columns_malformed_rows(self, malformed_rows_csv_file):
+        reader = CsvReader(malformed_rows_csv_file)
+        batches = list(reader.stream_columns({"brand": "category"}))
+
+        assert sum(batch.size for batch in batches) == 2
+        assert reader.errors_count == 2
+
+    def test_stream_columns_missing_column(self, temp_csv_file):
+        reader = CsvReader(temp_csv_file)
+
+        with pytest.raises(CsvValidationError, match="has no column 'color'"):
+            list(reader.stream_columns({"color": "category"}))
+
+
+def read_columns(file, mapped, batch_size=65536, block_size=64, strict=False, where=()):
+    reader = CsvReader(file, where=where)
+    reader.mmap_min_size = 0 if mapped else float("inf")
+    reader.mmap_block_size = block_size
+    batches = list(
+        reader.stream_columns(
+            {"brand": "category", "rating": "float"}, batch_size, strict
+        )
+    )
+    brands = [brand for batch in batches for brand in batch.columns["brand"]]
+    ratings = [rating for batch in batches for rating in batch.columns["rating"]]
+    return batches, brands, ratings, reader
+
+
+class TestMappedColumns:
+    """Test cases for memory-mapped column scans."""
+
+    @pytest.mark.parametrize("block_size", [1, 64, 1024 * 1024])
+    @pytest.mark.parametrize(
+        "fixture", ["temp_csv_file", "malformed_rows_csv_file", "multiline_csv_file"]
+    )
+    def test_matches_text_scan(self, request, fixture, block_size):
+        file = request.getfixturevalue(fixture)
+        _, brands, ratings, reader = read_columns(file, False)
+        _, mapped_brands, mapped_ratings, mapped_reader = read_columns(
+            file, True, block_size=block_size
+        )
+
+        assert mapped_brands == brands
+        assert mapped_ratings == ratings
+        assert mapped_reader.errors == reader.errors
+        assert mapped_reader.records_count == reader.records_count
+        assert mapped_reader.rows_count == reader.rows_count
+
+    @pytest.mark.parametrize("block_size", [1, 64, 1024 * 1024])
+    def test_quotes_inside_unquoted_fields(self, tmp_path, block_size):
+        file = tmp_path / "inches.csv"
+        lines = ["name,brand,price,rating"]
+        for index in range(100):
+            if index % 10 == 3:
+                lines.append(f'Bravia {index}" TV,sony,999,4.5')
+            elif index % 10 == 6:
+                lines.append(f'"tv {index}\nwith ""quotes""",lg,599,3.5')
+            elif index % 10 == 8:
+                lines.append(f'tv {index}",lg')
+            else:
+                lines.append(f"phone {index},apple,799,4.0")
+        file.write_text("\n".join(lines) + "\n")
+
+        _, brands, ratings, reader = read_columns(file, False)
+        _, mapped_brands, mapped_ratings, mapped_reader = read_columns(
+            file, True, block_size=block_size
+        )
+
+        assert reader.rows_count == 90 and reader.errors_count == 10
+        assert brands.count("sony") == 10
+        assert mapped_brands == brands
+        assert mapped_ratings == ratings
+        assert mapped_reader.errors == reader.errors
+        assert mapped_reader.records_count == reader.records_count
+
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    def test_quoted_and_blank_lines(self, tmp_path, newline):
+        file = tmp_path / "quoted.csv"
+        lines = [
+            "name,brand,price,rating",
+            "a,apple,1,4.5",
+            "",
+            '"b, with comma",samsung,2,3.5',
+            '"c',
+            'spanning lines",apple,3,2.5',
+            "d,xiaomi,4",
+            'e,"apple",5,1.5',
+            "f,samsung,6,0.5",
+        ]
+        file.write_bytes(newline.join(lines).encode("utf-8"))
+
+        _, brands, ratings, reader = read_columns(file, False)
+        _, mapped_brands, mapped_ratings, mapped_reader = read_columns(file, True)
+
+        assert (
+            mapped_brands
+            == brands
+            == [
+                "apple",
+                "samsung",
+                "apple",
+                "apple",
+                "samsung",
+            ]
+        )
+        assert mapped_ratings == ratings
+        assert mapped_reader.errors == reader.errors
+        assert mapped_reader.errors[0].line == 7
+
+    def test_batch_size(self, multiline_csv_file):
+        batches, brands, _, _ = read_columns(multiline_csv_file, True, batch_size=64)
+
+        assert [batch.size for batch in batches] == [64, 64, 64, 8]
+        assert len(brands) == 200
+
+    def test_numeric_errors(self, tmp_path):
+        file = tmp_path / "bad.csv"
+        file.write_text("brand,rating\napple,4.5\nsamsung,good\n")
+
+        with pytest.raises(ValueError, match="Cannot convert value good"):
+            read_columns(file, True)
+
+    def test_strict(self, malformed_rows_csv_file):
+        with pytest.raises(CsvValidationError, match="Expected 4 columns"):
+            read_columns(malformed_rows_csv_file, True, strict=True)
+
+    def test_empty_and_missing_column(self, empty_csv_file, temp_csv_file):
+        with pytest.raises(CsvValidationError, match="is empty"):
+            read_columns(empty_csv_file, True)
+
+        reader = CsvReader(temp_csv_file)
+        reader.mmap_min_size = 0
+        with pytest.raises(CsvValidationError, match="has no column 'color'"):
+            list(reader.stream_columns({"color": "category"}))
+
+
+class TestWhere:
+    """Test cases for predicates checked while parsing."""
+
+    WHERE = [Predicate.parse("price>300"), Predicate.parse("brand in (apple,samsung)")]
+
+    def test_stream_csv(self, temp_csv_file):
+        reader = CsvReader(temp_csv_file, where=self.WHERE)
+        rows = list(reader.stream_csv())
+
+        assert [row["name"] for row in rows] == [
+            "iphone 15 pro",
+            "galaxy s23 ultra",
+            "iphone 14",
+            "galaxy a54",
+        ]
+        assert reader.rows_count == 4 and reader.filtered_count == 1
+        assert reader.load_csv == rows
+
+    @pytest.mark.parametrize("block_size", [1, 64, 1024 * 1024])
+    @pytest.mark.parametrize(
+        "fixture", ["temp_csv_file", "malformed_rows_csv_file", "multiline_csv_file"]
+    )
+    def test_mapped_matches_text_scan(self, request, fixture, block_size):
+        file = request.getfixturevalue(fixture)
+        where = [Predicate.parse("rating>=4.5"), Predicate.parse("brand!=xiaomi")]
+        _, brands, ratings, reader = read_columns(file, False, where=where)
+        _, mapped_brands, mapped_ratings, mapped_reader = read_columns(
+            file, True, block_size=block_size, where=where
+        )
+
+        assert "xiaomi" not in brands and min(ratings) >= 4.5
+        assert mapped_brands == brands
+        assert mapped_ratings == ratings
+        assert mapped_reader.errors == reader.errors
+        assert mapped_reader.rows_count == reader.rows_count
+        assert mapped_reader.filtered_count == reader.filtered_count > 0
+
+    def test_quoted_records(self, tmp_path):
+        file = tmp_path / "quoted.csv"
+        file.write_text(
+            "name,brand,price,rating\n"
+            "a,apple,1,4.5\n"
+            '"b, with comma",samsung,2,3.5\n'
+            "c,apple,3,2.5\n"
+            '"d\nspanning lines",apple,4,1.5\n'
+            "e,samsung,5,0.5\n"
+        )
+        where = [Predicate.parse("brand=apple")]
+
+        _, brands, ratings, _ = read_columns(file, False, where=where)
+        _, mapped_brands, mapped_ratings, _ = read_columns(file, True, where=where)
+
+        assert mapped_brands == brands == ["apple", "apple", "apple"]
+        assert mapped_ratings == ratings == [4.5, 2.5, 1.5]
+
+    def test_filtered_values_are_not_converted(self, tmp_path):
+        file = tmp_path / "bad.csv"
+        file.write_text("brand,rating\napple,4.5\nsamsung,good\n")
+
+        for mapped in (False, True):
+            _, brands, _, _ = read_columns(
+                file, mapped, where=[Predicate.parse("brand=apple")]
+            )
+            assert brands == ["apple"]
+
+    def test_missing_column(self, temp_csv_file):
+        reader = CsvReader(temp_csv_file, where=[Predicate.parse("color=red")])
+
+        with pytest.raises(CsvValidationError, match="has no column 'color'"):
+            list(reader.stream_csv())
+
+    def test_columnar(self, temp_csv_file, tmp_path):
+        output = tmp_path / "products.csvcol"
+        convert_files([temp_csv_file], output)
+
+        reader = CsvReader(output, where=self.WHERE)
+        batches = list(reader.stream_columns({"rating": "float"}))
+        assert [list(batch.columns["rating"]) for batch in batches] == [
+            [4.9, 4.8, 4.7, 4.2]
+        ]
+        assert reader.rows_count == 4 and reader.filtered_count == 1
+        assert [row["name"] for row in CsvReader(output, where=self.WHERE).load_csv][
+            -1
+        ] == "galaxy a54"
+
+    def test_columnar_skipped_by_statistics(self, temp_csv_file, tmp_path, caplog):
+        caplog.set_level(logging.DEBUG)
+        output = tmp_path / "products.csvcol"
+        convert_files([temp_csv_file], output)
+
+        for where in ("price>2000", "brand=huawei"):
+            reader = CsvReader(output, where=[Predicate.parse(where)])
+            assert list(reader.stream_columns({"rating": "float"})) == []
+            assert reader.rows_count == 0 and reader.filtered_count == 5
+        assert "none of its rows pass filters" in caplog.text
@@ -0,0 +1,52 @@
+import random
+from array import array
+
+import pytest
+
+from utils import AverageRatingReport, CsvReader, check_engine, group_stats
+
+
+class TestEngines:
+    """Test cases for aggregation engines."""
+
+    def test_group_stats_python(self):
+        codes = array("I", [0, 1, 0, 2])
+        values = array("d", [4.5, 3.0, 3.5, 5.0])
+
+        stats = group_stats(codes, values, 4, extremes=True)
+
+        assert stats.counts == [2, 1, 1, 0]
+        assert stats.sums == [8.0, 3.0, 5.0, 0.0]
+        assert stats.mins == [3.5, 3.0, 5.0, None]
+        assert stats.maxs == [4.5, 3.0, 5.0, None]
+
+    def test_group_stats_numpy_identical(self):
+        pytest.importorskip("numpy")
+        rng = random.Random(42)
+        codes = array("I", (rng.randrange(50) for _ in range(10000)))
+        values = array("d", (rng.uniform(0, 5) for _ in range(10000)))
+
+        python_stats = group_stats(codes, values, 60, "python", extremes=True)
+        numpy_stats = group_stats(codes, values, 60, "numpy", extremes=True)
+
+        assert numpy_stats == python_stats
+
+    def test_average_rating_numpy_engine(self, multiline_csv_file):
+        pytest.importorskip("numpy")
+        results = []
+
+        for engine in ("python", "numpy"):
+            report = AverageRatingReport()
+            report.engine = engine
+            state = report.init_state()
+            for batch in CsvReader(multiline_csv_file).stream_columns(
+                report.columns, batch_size=64
+            ):
+                report.update_batch(state, batch)
+            results.append(report.finalize(state))
+
+        assert results[0] == results[1]
+
+    def test_check_engine_unknown(self):
+        with pytest.raises(ValueError, match="Engine 'polars' isn't found"):
+            check_engine("polars")
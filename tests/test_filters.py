@@ -0,0 +1,117 @@
+from array import array
+
+import pytest
+
+from utils import Categorical, ColumnBatch
+from utils.filters import Predicate, RowFilter, filter_batch
+
+
+class TestPredicate:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("price>500", Predicate("price", ">", ("500",))),
+            (" rating >= 4.5 ", Predicate("rating", ">=", ("4.5",))),
+            ("brand=apple", Predicate("brand", "==", ("apple",))),
+            ("brand != 'apple'", Predicate("brand", "!=", ("apple",))),
+            (
+                "brand in (apple, samsung)",
+                Predicate("brand", "in", ("apple", "samsung")),
+            ),
+        ],
+    )
+    def test_parse(self, text, expected):
+        assert Predicate.parse(text) == expected
+
+    @pytest.mark.parametrize("text", ["price", "price>", "brand>apple", ">5"])
+    def test_parse_invalid(self, text):
+        with pytest.raises(ValueError):
+            Predicate.parse(text)
+
+    def test_str_round_trip(self):
+        for text in ("price>500", "brand==apple", "brand in (apple,samsung)"):
+            assert str(Predicate.parse(text)) == text
+
+    def test_compile_strings_and_bytes(self):
+        check = Predicate.parse("brand in (apple,samsung)").compile()
+
+        assert check("apple") and check(b"samsung")
+        assert not check("xiaomi") and not check(b"xiaomi")
+
+    def test_compile_numbers(self):
+        check = Predicate.parse("price>500").compile()
+        assert check("999") and check(b"999") and check(600.0)
+        assert not check("199") and not check("n/a")
+
+        equal = Predicate.parse("rating=4.5").compile()
+        assert equal(4.5) and equal("4.5")
+
+        not_equal = Predicate.parse("rating!=4.5").compile()
+        assert not_equal("n/a") and not not_equal("4.5")
+
+    @pytest.mark.parametrize(
+        "text, low, high, expected",
+        [
+            ("price>500", 100, 500, False),
+            ("price>500", 100, 501, True),
+            ("price<=100", 100, 500, True),
+            ("price==50", 100, 500, False),
+            ("price!=100", 100, 100, False),
+            ("brand==apple", 100, 500, True),
+        ],
+    )
+    def test_may_match_range(self, text, low, high, expected):
+        assert Predicate.parse(text).may_match_range(low, high) is expected
+
+
+class TestRowFilter:
+    HEADER = ["name", "brand", "price", "rating"]
+
+    def test_match(self):
+        row_filter = RowFilter(
+            [Predicate.parse("brand=apple"), Predicate.parse("price<900")],
+            self.HEADER,
+        )
+
+        assert row_filter(["iphone 14", "apple", "799", "4.7"])
+        assert not row_filter(["iphone 15 pro", "apple", "999", "4.9"])
+        assert not row_filter(["galaxy a54", "samsung", "349", "4.2"])
+
+    def test_missing_column(self):
+        with pytest.raises(KeyError):
+            RowFilter([Predicate.parse("color=red")], self.HEADER)
+
+    def test_mask(self):
+        row_filter = RowFilter(
+            [Predicate.parse("brand!=xiaomi"), Predicate.parse("price>300")],
+            self.HEADER,
+        )
+        columns = {
+            1: Categorical(array("i", [0, 1, 2, 0, 1]), ["apple", "samsung", "xiaomi"]),
+            2: ["999", "1199", "399", "n/a", "349"],
+        }
+
+        assert row_filter.mask(columns.__getitem__) == [
+            True,
+            True,
+            False,
+            False,
+            True,
+        ]
+
+
+def test_filter_batch():
+    batch = ColumnBatch(
+        3,
+        {
+            "brand": Categorical(array("i", [0, 1, 0]), ["apple", "samsung"]),
+            "rating": array("d", [4.9, 4.8, 4.7]),
+            "price": array("d", [999, 1199, 799]),
+        },
+    )
+
+    filtered = filter_batch(batch, [True, False, True], ["brand", "rating"])
+
+    assert filtered.size == 2 and set(filtered.columns) == {"brand", "rating"}
+    assert list(filtered.columns["brand"]) == ["apple", "apple"]
+    assert list(filtered.columns["rating"]) == [4.9, 4.7]
@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import AverageRatingReport, aggregate_files, ingest_files, scan_files
+from utils import ingest
+from utils.ingest import ingest_files_async
+
+
+class TestIngest:
+    """Test cases for asyncio ingestion pipeline."""
+
+    def test_matches_scan_files(
+        self, temp_csv_file, malformed_rows_csv_file, multiline_csv_file
+    ):
+        files = [temp_csv_file, malformed_rows_csv_file, multiline_csv_file]
+        report = AverageRatingReport()
+
+        expected = list(scan_files(files, report))
+        scans = ingest_files(files, report, concurrency=2, read_ahead=1)
+
+        assert [scan.file for scan in scans] == files
+        assert [scan.state for scan in scans] == [scan.state for scan in expected]
+        assert [scan.errors for scan in scans] == [scan.errors for scan in expected]
+
+    def test_parallel_workers(self, temp_csv_file, multiline_csv_file):
+        files = [temp_csv_file, multiline_csv_file] * 3
+        report = AverageRatingReport()
+
+        scans = ingest_files(files, report, jobs=2, concurrency=4)
+
+        assert [scan.state for scan in scans] == [
+            scan.state for scan in scan_files(files, report)
+        ]
+
+    def test_unreadable_files(self, nonexistent_file, non_csv_file):
+        scans = ingest_files([nonexistent_file, non_csv_file], AverageRatingReport())
+
+        assert "does not exist!" in scans[0].error
+        assert "is not a CSV file!" in scans[1].error
+
+    def test_large_files_are_not_read_ahead(self, temp_csv_file, monkeypatch):
+        monkeypatch.setattr(ingest, "READ_AHEAD_MAX_SIZE", 0)
+
+        assert ingest._read_file(temp_csv_file) is None
+        assert ingest_files([temp_csv_file], AverageRatingReport())[0].rows_count == 5
+
+    def test_read_ahead_is_bounded(self, temp_csv_file, monkeypatch):
+        files = [temp_csv_file] * 20
+        held = []
+        peak = []
+        read_file = ingest._read_file
+
+        def tracking_read_file(file):
+            held.append(file)
+            peak.append(len(held))
+            return read_file(file)
+
+        def slow_scan_file(file, report, data):
+            held.pop()
+            return scan_file(file, report, data)
+
+        from utils.pipeline import scan_file
+
+        monkeypatch.setattr(ingest, "_read_file", tracking_read_file)
+        monkeypatch.setattr(ingest, "scan_file", slow_scan_file)
+
+        async def run():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return await ingest_files_async(
+                    files,
+                    AverageRatingReport(),
+                    executor,
+                    jobs=1,
+                    concurrency=2,
+                    read_ahead=3,
+                )
+
+        scans = asyncio.run(run())
+
+        assert all(scan.rows_count == 5 for scan in scans)
+        assert max(peak) <= 2 + 3 + 1  # readers, queue and worker
+
+    def test_aggregate_files(self, temp_csv_file, multiline_csv_file):
+        files = [temp_csv_file, multiline_csv_file]
+        report = AverageRatingReport()
+
+        assert aggregate_files(files, report, io_concurrency=2) == aggregate_files(
+            files, report
+        )
@@ -1,6 +1,12 @@
+import json
 import logging
+import subprocess
+import sys
 from contextlib import redirect_stdout
 from io import StringIO
+from pathlib import Path
+
+import pytest
 
 from main import main
 
@@ -59,3 +65,381 @@ def test_main_unknown_report(temp_csv_file, caplog):
 
     assert exit_code == 1
     assert "Report 'non-average-rating' isn't found." in caplog.text
+
+
+def test_main_parallel_jobs(temp_csv_file, malformed_rows_csv_file):
+    captured_stdout = StringIO()
+    exit_code = 0
+    with redirect_stdout(captured_stdout):
+        try:
+            main(
+                [
+                    "--files",
+                    str(temp_csv_file),
+                    str(malformed_rows_csv_file),
+                    "--report",
+                    "average-rating",
+                    "--jobs",
+                    "2",
+                ]
+            )
+        except SystemExit as e:
+            exit_code = e.code
+
+    stdout = captured_stdout.getvalue()
+    assert exit_code == 0
+    assert "apple" in stdout and "xiaomi" in stdout
+
+
+def test_main_invalid_rating(tmp_path, caplog):
+    caplog.set_level(logging.DEBUG)
+    csv_file = tmp_path / "products.csv"
+    csv_file.write_text("name,brand,price,rating\niphone,apple,999,four\n")
+    exit_code = 0
+    try:
+        main(["--files", str(csv_file), "--report", "average-rating"])
+    except SystemExit as e:
+        exit_code = e.code
+
+    assert exit_code == 1
+    assert "Cannot convert value four to numeric." in caplog.text
+
+
+def test_main_invalid_rating_in_worker(tmp_path, caplog):
+    caplog.set_level(logging.DEBUG)
+    files = []
+    for index in range(2):
+        csv_file = tmp_path / f"products{index}.csv"
+        csv_file.write_text(
+            "name,brand,price,rating\niphone,apple,999,4.9\nx,y,1,bad\n"
+        )
+        files.append(str(csv_file))
+
+    with pytest.raises(SystemExit) as e:
+        main(
+            [
+                "--files",
+                *files,
+                "--report",
+                "average-rating",
+                "--jobs",
+                "2",
+                "--no-cache",
+            ]
+        )
+
+    assert e.value.code == 1
+    assert "Cannot convert value bad to numeric. (line 3)" in caplog.text
+    assert "terminated abruptly" not in caplog.text
+
+
+def test_main_numpy_engine(temp_csv_file):
+    pytest.importorskip("numpy")
+    outputs = []
+
+    for engine in ("python", "numpy"):
+        captured_stdout = StringIO()
+        with redirect_stdout(captured_stdout):
+            try:
+                main(
+                    [
+                        "--files",
+                        str(temp_csv_file),
+                        "--report",
+                        "average-rating",
+                        "--engine",
+                        engine,
+                    ]
+                )
+            except SystemExit as e:
+                assert e.code == 0
+        outputs.append(captured_stdout.getvalue())
+
+    assert outputs[0] == outputs[1]
+
+
+def test_main_no_cache(temp_csv_file, cache_dir):
+    with redirect_stdout(StringIO()):
+        try:
+            main(
+                [
+                    "--files",
+                    str(temp_csv_file),
+                    "--report",
+                    "average-rating",
+                    "--no-cache",
+                ]
+            )
+        except SystemExit as e:
+            assert e.code == 0
+
+    assert not cache_dir.exists()
+
+
+def test_main_profile(temp_csv_file, tmp_path, capsys):
+    trace_path = tmp_path / "trace.json"
+    pstats_path = tmp_path / "run.pstats"
+    try:
+        main(
+            [
+                "--files",
+                str(temp_csv_file),
+                "--report",
+                "average-rating",
+                "--profile-output",
+                str(trace_path),
+                "--pstats",
+                str(pstats_path),
+            ]
+        )
+    except SystemExit as e:
+        assert e.code == 0
+
+    stages = [stage["stage"] for stage in json.loads(trace_path.read_text())["stages"]]
+    assert stages == ["scan", "aggregate", "finalize", "render"]
+    assert pstats_path.stat().st_size > 0
+    assert "Profile" in capsys.readouterr().err
+
+
+def test_main_jsonl_top(temp_csv_file):
+    captured_stdout = StringIO()
+    with redirect_stdout(captured_stdout):
+        try:
+            main(
+                [
+                    "--files",
+                    str(temp_csv_file),
+                    "--report",
+                    "average-rating",
+                    "--output",
+                    "jsonl",
+                    "--top",
+                    "2",
+                ]
+            )
+        except SystemExit as e:
+            assert e.code == 0
+
+    lines = captured_stdout.getvalue().splitlines()
+    assert [json.loads(line)["brand"] for line in lines] == ["apple", "xiaomi"]
+
+
+def test_main_page_size(temp_csv_file):
+    captured_stdout = StringIO()
+    with redirect_stdout(captured_stdout):
+        try:
+            main(
+                [
+                    "--files",
+                    str(temp_csv_file),
+                    "--report",
+                    "average-rating",
+                    "--page-size",
+                    "2",
+                ]
+            )
+        except SystemExit as e:
+            assert e.code == 0
+
+    stdout = captured_stdout.getvalue()
+    assert "(1/2)" in stdout and "(2/2)" in stdout
+
+
+def test_main_import_is_lazy():
+    code = (
+        "import sys, main; "
+        "print(' '.join(m for m in ('rich', 'multiprocessing', 'utils.cache', "
+        "'utils.reports') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_exports():
+    import utils
+
+    assert utils.__all__ == sorted(utils._EXPORTS) == sorted(utils.__all__)
+    for name in utils.__all__:
+        assert getattr(utils, name) is not None
+
+
+def test_main_serve_invalid_engine(temp_csv_file, monkeypatch):
+    monkeypatch.setattr("utils.engines.find_spec", lambda name: None)
+    try:
+        main(["serve", "--files", str(temp_csv_file), "--engine", "numpy"])
+    except SystemExit as e:
+        assert e.code == 1
+
+
+def test_main_io_concurrency(temp_csv_file, multiline_csv_file, capsys):
+    try:
+        main(
+            [
+                "--files",
+                str(temp_csv_file),
+                str(multiline_csv_file),
+                "--report",
+                "average-rating",
+                "--io-concurrency",
+                "2",
+                "--output",
+                "jsonl",
+                "--no-cache",
+            ]
+        )
+    except SystemExit as e:
+        assert e.code == 0
+
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert {"brand": "apple", "rating": 4.8} in rows
+
+
+def test_main_convert(temp_csv_file, tmp_path, capsys):
+    output = tmp_path / "products.csvcol"
+    try:
+        main(["convert", "--files", str(temp_csv_file), "--output", str(output)])
+    except SystemExit as e:
+        assert e.code == 0
+
+    try:
+        main(
+            ["--files", str(output), "--report", "average-rating", "--output", "jsonl"]
+        )
+    except SystemExit as e:
+        assert e.code == 0
+
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert rows[0] == {"brand": "apple", "rating": 4.8}
+
+
+def test_main_convert_wrong_suffix(temp_csv_file, tmp_path):
+    with pytest.raises(SystemExit) as e:
+        main(
+            ["convert", "--files", str(temp_csv_file), "--output", str(tmp_path / "x")]
+        )
+
+    assert e.value.code == 1
+
+
+def test_main_watch(temp_csv_file, monkeypatch):
+    def run(watcher, refresh_rate):
+        assert refresh_rate == 4.0
+        assert watcher.poll() and watcher.rows()
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr("utils.watch.ReportWatcher.run", run)
+    with pytest.raises(SystemExit) as e:
+        main(
+            [
+                "--files",
+                str(temp_csv_file),
+                "--report",
+                "average-rating",
+                "--watch",
+                "--refresh-rate",
+                "4",
+            ]
+        )
+
+    assert e.value.code == 0
+
+
+def test_main_several_reports(temp_csv_file, capsys):
+    try:
+        main(
+            [
+                "--files",
+                str(temp_csv_file),
+                "--report",
+                "average-rating",
+                "brand-summary",
+                "--output",
+                "jsonl",
+                "--top",
+                "1",
+            ]
+        )
+    except SystemExit as e:
+        assert e.code == 0
+
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(row["report"], row["brand"]) for row in rows] == [
+        ("average-rating", "apple"),
+        ("brand-summary", "apple"),
+    ]
+
+
+def test_main_approx(temp_csv_file, capsys):
+    try:
+        main(["--files", str(temp_csv_file), "--report", "average-rating", "--approx"])
+    except SystemExit as e:
+        assert e.code == 0
+
+    assert "4.8 ± 0.0" in capsys.readouterr().out
+
+
+def test_main_rating_percentiles(temp_csv_file, malformed_rows_csv_file, capsys):
+    try:
+        main(
+            [
+                "--files",
+                str(temp_csv_file),
+                str(malformed_rows_csv_file),
+                "--report",
+                "rating-percentiles",
+                "--jobs",
+                "2",
+                "--output",
+                "jsonl",
+            ]
+        )
+    except SystemExit as e:
+        assert e.code == 0
+
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert set(rows[0]) == {"brand", "median", "p90", "ratings"}
+
+
+def test_main_where(temp_csv_file, capsys):
+    try:
+        main(
+            [
+                "--files",
+                str(temp_csv_file),
+                "--report",
+                "average-rating",
+                "--where",
+                "price>500",
+                "brand!=samsung",
+                "--output",
+                "jsonl",
+            ]
+        )
+    except SystemExit as e:
+        assert e.code == 0
+
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert rows == [{"brand": "apple", "rating": 4.8}]
+
+
+def test_main_invalid_where(temp_csv_file):
+    with pytest.raises(SystemExit) as e:
+        main(
+            [
+                "--files",
+                str(temp_csv_file),
+                "--report",
+                "average-rating",
+                "--where",
+                "brand>apple",
+            ]
+        )
+
+    assert e.value.code == 2
@@ -0,0 +1,177 @@
+import pytest
+
+from utils import (
+    AverageRatingReport,
+    CsvReader,
+    NumericParseError,
+    aggregate_files,
+    scan_file,
+    scan_files,
+)
+from utils import pipeline
+
+
+class TestPipeline:
+    """Test cases for file scanning pipeline."""
+
+    def test_scan_file_valid(self, temp_csv_file, sample_csv_data):
+        report = AverageRatingReport()
+        scan = scan_file(temp_csv_file, report)
+
+        assert scan.error is None
+        assert scan.rows_count == len(sample_csv_data)
+        assert report.finalize(scan.state) == report.generate(sample_csv_data)
+
+    def test_scan_file_invalid(self, nonexistent_file):
+        scan = scan_file(nonexistent_file, AverageRatingReport())
+
+        assert scan.state is None
+        assert "does not exist!" in scan.error
+
+    def test_scan_files_parallel_matches_sequential(
+        self, temp_csv_file, malformed_rows_csv_file, nonexistent_file
+    ):
+        report = AverageRatingReport()
+        files = [temp_csv_file, malformed_rows_csv_file, nonexistent_file]
+
+        sequential = list(scan_files(files, report))
+        parallel = list(scan_files(files, report, jobs=3))
+
+        assert [scan.file for scan in parallel] == files
+        assert [scan.state for scan in parallel] == [scan.state for scan in sequential]
+        assert parallel[1].errors == sequential[1].errors
+
+    def test_aggregate_files(self, temp_csv_file, malformed_rows_csv_file):
+        report = AverageRatingReport()
+
+        state, rows_count = aggregate_files(
+            [temp_csv_file, malformed_rows_csv_file], report, jobs=2
+        )
+
+        assert rows_count == 7
+        assert state["apple"][1] == 3
+        assert state["samsung"][1] == 3
+
+    def test_scan_files_splits_large_file(self, multiline_csv_file, monkeypatch):
+        monkeypatch.setattr(pipeline, "CHUNK_MIN_SIZE", 0)
+        report = AverageRatingReport()
+        expected = scan_file(multiline_csv_file, report)
+
+        for jobs in (2, 3, 8):
+            scan = next(scan_files([multiline_csv_file], report, jobs=jobs))
+
+            assert scan.rows_count == expected.rows_count
+            assert report.finalize(scan.state) == report.finalize(expected.state)
+
+    def test_join_ranges_error_lines(self, malformed_rows_csv_file):
+        report = AverageRatingReport()
+        reader = CsvReader(malformed_rows_csv_file)
+        header, data_start = reader.read_header()
+        scans = [
+            pipeline.scan_range(
+                malformed_rows_csv_file, start, end, header, report, start == data_start
+            )
+            for start, end in reader.split_ranges(data_start, 3)
+        ]
+
+        scan = pipeline.join_ranges(
+            malformed_rows_csv_file, reader.lines_count, scans, report
+        )
+
+        assert scan.rows_count == 2
+        assert [error.line for error in scan.errors] == [3, 5]
+
+    def test_join_ranges_detects_start_inside_quotes(self, multiline_csv_file):
+        report = AverageRatingReport()
+        reader = CsvReader(multiline_csv_file)
+        header, data_start = reader.read_header()
+        with open(multiline_csv_file, "rb") as f:
+            inside_quotes = f.read().index(b"\nwith") + 1
+
+        scans = [
+            pipeline.scan_range(
+                multiline_csv_file, data_start, inside_quotes, header, report, True
+            ),
+            pipeline.scan_range(
+                multiline_csv_file, inside_quotes, 10**9, header, report
+            ),
+        ]
+
+        assert pipeline.join_ranges(multiline_csv_file, 1, scans, report) is None
+
+    def test_join_ranges_ignores_errors_after_start_inside_quotes(self, tmp_path):
+        file = tmp_path / "quoted.csv"
+        file.write_bytes(
+            b'name,brand,price,rating\n"x\na,b,c,zz\ny",apple,1,4.5\n'
+            b"iphone,apple,999,4.9\n"
+        )
+        report = AverageRatingReport()
+        reader = CsvReader(file)
+        header, data_start = reader.read_header()
+        inside_quotes = file.read_bytes().index(b"a,b,c,zz")
+
+        scans = [
+            pipeline.scan_range(file, data_start, inside_quotes, header, report, True),
+            pipeline.scan_range(file, inside_quotes, 10**9, header, report),
+        ]
+
+        assert isinstance(scans[1].exception, ValueError)
+        assert pipeline.join_ranges(file, 1, scans, report) is None
+        assert scan_file(file, report).rows_count == 2
+
+    def test_join_ranges_raises_conversion_errors(self, tmp_path):
+        file = tmp_path / "bad.csv"
+        file.write_bytes(
+            b"name,brand,price,rating\niphone,apple,999,4.9\n"
+            b"galaxy,samsung,1199,4.8\nredmi,xiaomi,199,bad\n"
+        )
+        report = AverageRatingReport()
+        reader = CsvReader(file)
+        header, data_start = reader.read_header()
+        middle = file.read_bytes().index(b"galaxy") - 3
+
+        scans = [
+            pipeline.scan_range(file, data_start, middle, header, report, True),
+            pipeline.scan_range(file, middle, 10**9, header, report),
+        ]
+
+        with pytest.raises(NumericParseError) as error:
+            pipeline.join_ranges(file, 1, scans, report)
+        with pytest.raises(NumericParseError) as expected:
+            scan_file(file, report)
+        assert error.value.bad_values == expected.value.bad_values == [(4, "bad")]
+
+    def test_join_ranges_with_quotes_inside_unquoted_fields(self, tmp_path):
+        file = tmp_path / "inches.csv"
+        file.write_text(
+            "name,brand,price,rating\na,sony,1,4.5\n"
+            'Bravia 55" TV,sony,999,4.5\nb,apple,2,4.0\n'
+            '"multi\nline",apple,3,3.5\nc,lg,4,2.0\nd 40" TV,lg,5,1.0\n'
+        )
+        report = AverageRatingReport()
+        expected = scan_file(file, report)
+        reader = CsvReader(file)
+        header, data_start = reader.read_header()
+        data = file.read_bytes()
+
+        # Stray quotes before range ends don't make ranges read past records
+        bounds = [data_start, data.index(b"b,apple"), data.index(b"c,lg")]
+        bounds.append(len(data))
+        scans = [
+            pipeline.scan_range(file, start, end, header, report, start == data_start)
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        scan = pipeline.join_ranges(file, reader.lines_count, scans, report)
+
+        assert scan.errors == expected.errors == []
+        assert scan.rows_count == expected.rows_count == 6
+        assert report.finalize(scan.state) == report.finalize(expected.state)
+
+        # Range starting inside "multi\nline" is detected, rows aren't made up
+        inside_quotes = data.index(b"line")
+        scans = [
+            pipeline.scan_range(file, data_start, inside_quotes, header, report, True),
+            pipeline.scan_range(file, inside_quotes, len(data), header, report),
+        ]
+        assert scans[0].errors == []
+        assert pipeline.join_ranges(file, reader.lines_count, scans, report) is None
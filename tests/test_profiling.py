@@ -0,0 +1,57 @@
+import json
+import time
+
+from rich.table import Table
+
+from utils import Profiler
+
+
+class TestProfiler:
+    """Test cases for Profiler class."""
+
+    def test_stage_records_times(self):
+        profiler = Profiler()
+
+        with profiler.stage("aggregate", "products.csv") as stage:
+            time.sleep(0.01)
+            stage.rows = 100
+
+        (record,) = profiler.records
+        assert record.stage == "aggregate"
+        assert record.file == "products.csv"
+        assert record.wall_time >= 0.01
+        assert record.rows_per_second > 0
+        assert record.peak_rss > 0
+
+    def test_stage_recorded_on_error(self):
+        profiler = Profiler()
+
+        try:
+            with profiler.stage("finalize"):
+                raise ValueError
+        except ValueError:
+            pass
+
+        assert [record.stage for record in profiler.records] == ["finalize"]
+
+    def test_write_trace(self, tmp_path):
+        profiler = Profiler()
+        with profiler.stage("render"):
+            pass
+
+        path = tmp_path / "trace.json"
+        profiler.write_trace(path)
+        trace = json.loads(path.read_text())
+
+        assert trace["stages"][0]["stage"] == "render"
+        assert "rows_per_second" in trace["stages"][0]
+
+    def test_create_table(self):
+        profiler = Profiler()
+        with profiler.stage("render"):
+            pass
+
+        table = profiler.create_table()
+
+        assert isinstance(table, Table)
+        assert len(table.rows) == 1
@@ -1,6 +1,18 @@
+from operator import itemgetter
+
 import pytest
 
-from utils import AverageRatingReport, BaseReport, ReportRegistry
+from utils import (
+    AggregateReport,
+    AverageRatingReport,
+    BaseReport,
+    CsvReader,
+    MultiReport,
+    ReportRegistry,
+    as_incremental,
+    scan_file,
+    select_rows,
+)
 
 
 class TestAverageRatingReport:
@@ -122,3 +134,211 @@ class TestReportRegistry:
         assert isinstance(report, TestReport)
 
         del ReportRegistry._reports["test-report"]
+
+    def test_register_report_by_path(self):
+        ReportRegistry.register_report(
+            "lazy-report", "utils.reports:AverageRatingReport"
+        )
+
+        assert "lazy-report" in ReportRegistry.get_available_reports()
+        assert isinstance(ReportRegistry.get_report("lazy-report"), AverageRatingReport)
+        assert ReportRegistry._reports["lazy-report"] is AverageRatingReport
+
+        del ReportRegistry._reports["lazy-report"]
+
+
+class TestIncrementalReport:
+    """Test cases for incremental report protocol."""
+
+    def test_average_rating_state_is_per_brand(self, sample_csv_data):
+        report = AverageRatingReport()
+        state = report.init_state()
+
+        for row in sample_csv_data:
+            report.update(state, row)
+
+        assert set(state) == {"apple", "samsung", "xiaomi"}
+        assert state["apple"][1] == 2
+
+    def test_average_rating_merge(self, sample_csv_data):
+        report = AverageRatingReport()
+        first, second = report.init_state(), report.init_state()
+
+        for row in sample_csv_data[:2]:
+            report.update(first, row)
+        for row in sample_csv_data[2:]:
+            report.update(second, row)
+
+        merged = report.merge(first, second)
+
+        assert report.finalize(merged) == report.generate(sample_csv_data)
+
+    def test_average_rating_generate_from_iterator(self, sample_csv_data):
+        report = AverageRatingReport()
+
+        result = report.generate(iter(sample_csv_data))
+
+        assert result == report.generate(sample_csv_data)
+
+    def test_average_rating_update_batch(self, temp_csv_file, sample_csv_data):
+        report = AverageRatingReport()
+        state = report.init_state()
+
+        for batch in CsvReader(temp_csv_file).stream_columns(
+            report.columns, batch_size=2
+        ):
+            report.update_batch(state, batch)
+
+        assert report.finalize(state) == report.generate(sample_csv_data)
+
+    def test_as_incremental_wraps_plain_report(self, sample_csv_data):
+        class TestReport(BaseReport):
+            def generate(self, data):
+                return [{"rows": len(data)}]
+
+        report = as_incremental(TestReport())
+        first, second = report.init_state(), report.init_state()
+        for row in sample_csv_data:
+            report.update(first, row)
+        report.update(second, sample_csv_data[0])
+
+        assert report.finalize(report.merge(first, second)) == [{"rows": 6}]
+
+    def test_as_incremental_bottom_keeps_ties_order(self):
+        class TestReport(BaseReport):
+            sort_column = "rating"
+
+            def generate(self, data):
+                return sorted(data, key=itemgetter("rating"), reverse=True)
+
+        rows = [
+            {"brand": "apple", "products": 5, "rating": 4.9},
+            {"brand": "samsung", "products": 5, "rating": 4.5},
+            {"brand": "xiaomi", "products": 2, "rating": 4.5},
+            {"brand": "nokia", "products": 2, "rating": 4.1},
+        ]
+        report = as_incremental(TestReport())
+
+        for limit in (None, 2):
+            result = report.finalize(rows.copy(), limit, ascending=True)
+            assert result == select_rows(rows, itemgetter("rating"), limit, True)
+        assert [row["brand"] for row in report.finalize(rows, ascending=True)] == [
+            "nokia",
+            "samsung",
+            "xiaomi",
+            "apple",
+        ]
+
+    def test_as_incremental_bottom_without_sort_column(self):
+        class TestReport(BaseReport):
+            def generate(self, data):
+                return sorted(data, key=itemgetter("rating"), reverse=True)
+
+        rows = [
+            {"brand": "apple", "products": 5, "rating": 4.9},
+            {"brand": "samsung", "products": 5, "rating": 4.5},
+            {"brand": "xiaomi", "products": 2, "rating": 4.1},
+        ]
+        report = as_incremental(TestReport())
+
+        assert report.finalize(rows, 2, ascending=True) == [rows[2], rows[1]]
+
+    def test_as_incremental_keeps_incremental_report(self):
+        report = AverageRatingReport()
+
+        assert as_incremental(report) is report
+
+
+class TestMultiReport:
+    """Test cases for several reports aggregated in one scan."""
+
+    def create_report(self, *others):
+        reports = {"average-rating": AverageRatingReport()}
+        for index, other in enumerate(others):
+            reports[f"other-{index}"] = other
+        return MultiReport(reports)
+
+    def test_columns_union(self):
+        report = self.create_report(AggregateReport("group_by=brand, agg=max(price)"))
+
+        assert report.columns == {
+            "brand": "category",
+            "rating": "float",
+            "price": "float",
+        }
+
+    def test_rows_for_conflicting_or_plain_reports(self):
+        class TestReport(BaseReport):
+            def generate(self, data):
+                return [{"rows": len(data)}]
+
+        conflicting = AggregateReport("group_by=rating, agg=count()")
+
+        assert self.create_report(conflicting).columns == {}
+        assert self.create_report(as_incremental(TestReport())).columns == {}
+
+    def test_single_scan_matches_separate_reports(self, temp_csv_file):
+        summary = AggregateReport("group_by=brand, agg=count(), min(price)")
+        report = self.create_report(summary)
+        report.engine = "python"
+
+        scan = scan_file(temp_csv_file, report)
+        reports_data = report.finalize_reports(scan.state, limit=2)
+
+        for name, single in report.reports.items():
+            single_scan = scan_file(temp_csv_file, single)
+            assert reports_data[name] == single.finalize(single_scan.state, limit=2)
+
+    def test_merge_and_finalize(self, sample_csv_data):
+        report = self.create_report(AggregateReport("group_by=brand, agg=count()"))
+        first, second = report.init_state(), report.init_state()
+        for row in sample_csv_data[:3]:
+            report.update(first, row)
+        for row in sample_csv_data[3:]:
+            report.update(second, row)
+
+        rows = report.finalize(report.merge(first, second), limit=1)
+        assert rows == [
+            {"report": "average-rating", "brand": "apple", "rating": 4.8},
+            {"report": "other-0", "brand": "apple", "count": 2},
+        ]
+
+
+class TestSelectRows:
+    """Test cases for top-K selection."""
+
+    ROWS = [
+        {"brand": "apple", "rating": 4.5},
+        {"brand": "samsung", "rating": 4.8},
+        {"brand": "xiaomi", "rating": 4.5},
+        {"brand": "huawei", "rating": 4.1},
+        {"brand": "oneplus", "rating": 4.5},
+    ]
+
+    def key(self, row):
+        return row["rating"]
+
+    def test_limit_matches_full_sort_with_ties(self):
+        full = select_rows(self.ROWS, self.key)
+
+        for limit in range(len(self.ROWS) + 2):
+            assert select_rows(iter(self.ROWS), self.key, limit) == full[:limit]
+
+    def test_ascending_limit_matches_full_sort_with_ties(self):
+        full = select_rows(self.ROWS, self.key, ascending=True)
+
+        assert full[0]["brand"] == "huawei"
+        for limit in range(len(self.ROWS) + 2):
+            assert select_rows(self.ROWS, self.key, limit, True) == full[:limit]
+
+    def test_average_rating_finalize_limit(self, sample_csv_data):
+        report = AverageRatingReport()
+        state = report.init_state()
+        for row in sample_csv_data:
+            report.update(state, row)
+
+        best = report.finalize(state, limit=1)
+        worst = report.finalize(state, limit=1, ascending=True)
+
+        assert best == [{"brand": "apple", "rating": 4.8}]
+        assert worst == [{"brand": "samsung", "rating": 4.5}]
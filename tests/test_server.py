@@ -0,0 +1,161 @@
+import asyncio
+import json
+import os
+
+from utils import ReportServer, ServeArgParser
+
+
+def request(server, target, method="GET"):
+    return asyncio.run(server.handle_request(method, target))
+
+
+class TestReportServer:
+    """Test cases for ReportServer class."""
+
+    def test_report(self, temp_csv_file):
+        server = ReportServer([str(temp_csv_file)])
+        status, body = request(server, "/report?name=average-rating")
+
+        assert status == 200
+        assert body["rows_count"] == 5
+        assert body["rows"][0] == {"brand": "apple", "rating": 4.8}
+
+    def test_top_and_bottom(self, temp_csv_file):
+        server = ReportServer([str(temp_csv_file)])
+
+        _, top = request(server, "/report?name=average-rating&top=1")
+        _, bottom = request(server, "/report?name=average-rating&bottom=1")
+
+        assert [row["brand"] for row in top["rows"]] == ["apple"]
+        assert [row["brand"] for row in bottom["rows"]] == ["samsung"]
+
+    def test_state_is_kept_warm(self, temp_csv_file, monkeypatch):
+        server = ReportServer([str(temp_csv_file)])
+        request(server, "/report?name=average-rating")
+
+        monkeypatch.setattr("utils.server.scan_file", None)
+        status, body = request(server, "/report?name=average-rating")
+
+        assert status == 200
+        assert body["rows_count"] == 5
+
+    def test_changed_file_is_reloaded(self, temp_csv_file):
+        server = ReportServer([str(temp_csv_file)])
+        request(server, "/report?name=average-rating")
+
+        with open(temp_csv_file, "a") as f:
+            f.write("pixel 8,google,699,4.5\n")
+        stat = temp_csv_file.stat()
+        os.utime(temp_csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        _, body = request(server, "/report?name=average-rating")
+
+        assert body["rows_count"] == 6
+        assert {"brand": "google", "rating": 4.5} in body["rows"]
+
+    def test_files_subset(self, temp_csv_file, multiline_csv_file):
+        server = ReportServer([str(temp_csv_file), str(multiline_csv_file)])
+        _, body = request(server, f"/report?name=average-rating&files={temp_csv_file}")
+
+        assert body["rows_count"] == 5
+        assert len(server.datasets) == 1
+
+    def test_unknown_file_is_rejected(self, temp_csv_file, tmp_path):
+        server = ReportServer([str(temp_csv_file)])
+        status, body = request(
+            server, f"/report?name=average-rating&files={tmp_path / 'other.csv'}"
+        )
+
+        assert status == 400
+        assert "aren't served" in body["error"]
+
+    def test_unreadable_file_is_reported(self, temp_csv_file, nonexistent_file):
+        server = ReportServer([str(temp_csv_file), str(nonexistent_file)])
+        status, body = request(server, "/report?name=average-rating")
+
+        assert status == 200
+        assert body["rows_count"] == 5
+        assert "does not exist" in body["errors"][0]
+
+    def test_bad_requests(self, temp_csv_file):
+        server = ReportServer([str(temp_csv_file)])
+
+        assert request(server, "/report")[0] == 400
+        assert request(server, "/report?name=unknown")[0] == 400
+        assert request(server, "/report?name=average-rating&top=x")[0] == 400
+        assert request(server, "/unknown")[0] == 404
+        assert request(server, "/report", method="POST")[0] == 405
+
+    def test_reports_and_health(self, temp_csv_file):
+        server = ReportServer([str(temp_csv_file)])
+
+        assert "average-rating" in request(server, "/reports")[1]["reports"]
+        request(server, "/report?name=average-rating")
+        _, health = request(server, "/health")
+
+        assert health["datasets"] == 1
+        assert health["memory_used"] > 0
+
+    def test_eviction(self, temp_csv_file, multiline_csv_file):
+        server = ReportServer(
+            [str(temp_csv_file), str(multiline_csv_file)], memory_limit=1
+        )
+        request(server, f"/report?name=average-rating&files={temp_csv_file}")
+        request(server, f"/report?name=average-rating&files={multiline_csv_file}")
+
+        assert list(server.datasets) == [(multiline_csv_file, "average-rating")]
+
+    def test_concurrent_requests_parse_once(self, temp_csv_file, monkeypatch):
+        from utils import server as server_module
+
+        calls = []
+        scan_file = server_module.scan_file
+
+        def counting_scan_file(*args):
+            calls.append(args)
+            return scan_file(*args)
+
+        monkeypatch.setattr(server_module, "scan_file", counting_scan_file)
+        server = ReportServer([str(temp_csv_file)])
+
+        async def run():
+            return await asyncio.gather(
+                *(server.generate("average-rating") for _ in range(5))
+            )
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(result == results[0] for result in results)
+
+    def test_http_connection(self, temp_csv_file):
+        server = ReportServer([str(temp_csv_file)])
+
+        async def run():
+            async_server = await server.start(port=0)
+            port = async_server.sockets[0].getsockname()[1]
+            async with async_server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(
+                    b"GET /report?name=average-rating&top=1 HTTP/1.1\r\n"
+                    b"Host: localhost\r\n\r\n"
+                )
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+            return response
+
+        head, _, payload = asyncio.run(run()).partition(b"\r\n\r\n")
+
+        assert head.startswith(b"HTTP/1.1 200 OK")
+        assert json.loads(payload)["rows"] == [{"brand": "apple", "rating": 4.8}]
+
+
+class TestServeArgParser:
+    """Test cases for ServeArgParser class."""
+
+    def test_memory_limit(self):
+        parser = ServeArgParser()
+
+        assert parser.parse_args(["--files", "a.csv"]).memory_limit == 512 * 1024**2
+        args = parser.parse_args(["--files", "a.csv", "--memory-limit", "2G"])
+        assert args.memory_limit == 2 * 1024**3
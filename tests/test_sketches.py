@@ -0,0 +1,103 @@
+import pickle
+import random
+import statistics
+
+import pytest
+
+from utils.sketches import HyperLogLog, ReservoirSample, TDigest
+
+
+@pytest.fixture
+def values():
+    generator = random.Random(42)
+    return [generator.gauss(3, 1) for _ in range(20000)]
+
+
+class TestReservoirSample:
+    def test_exact_when_everything_is_sampled(self):
+        sample = ReservoirSample(10)
+        sample.add_many([1.0, 2.0, 3.0])
+
+        assert sample.mean() == (2.0, 0.0)
+
+    def test_size_is_bounded(self, values):
+        sample = ReservoirSample(100)
+        sample.add_many(values)
+
+        assert len(sample.items) == 100 and sample.count == len(values)
+
+    def test_merged_interval_contains_mean(self, values):
+        random.seed(1)
+        parts = [ReservoirSample(500) for _ in range(4)]
+        for index, value in enumerate(values):
+            parts[index % 4].add(value)
+
+        sample = parts[0]
+        for part in parts[1:]:
+            sample.merge(part)
+
+        mean, error = sample.mean()
+        assert sample.count == len(values) and len(sample.items) == 500
+        assert 0 < error < 0.2
+        assert abs(mean - statistics.fmean(values)) <= error
+
+
+class TestHyperLogLog:
+    def test_small_cardinality(self):
+        sketch = HyperLogLog()
+        for value in ["apple", "samsung", "apple", "xiaomi"]:
+            sketch.add(value)
+
+        assert round(sketch.estimate()) == 3
+
+    def test_merge_estimate(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        for index in range(30000):
+            first.add(f"product {index}")
+            second.add(f"product {index + 10000}")
+
+        estimate = first.merge(second).estimate()
+        assert abs(estimate - 40000) < 4 * first.relative_error * 40000
+
+    def test_invalid_precision(self):
+        with pytest.raises(ValueError, match="precision"):
+            HyperLogLog(20)
+
+        with pytest.raises(ValueError, match="different precision"):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+
+class TestTDigest:
+    def test_quantiles(self, values):
+        digest = TDigest()
+        digest.add_many(values)
+        ordered = sorted(values)
+
+        for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+            assert digest.quantile(q) == pytest.approx(
+                ordered[int(q * len(values))], abs=0.05
+            )
+        assert digest.quantile(0) == ordered[0]
+        assert digest.quantile(1) == ordered[-1]
+
+    def test_merge_is_bounded(self, values):
+        parts = [TDigest(50) for _ in range(8)]
+        for index, value in enumerate(values):
+            parts[index % 8].add(value)
+
+        digest = pickle.loads(pickle.dumps(parts[0]))
+        for part in parts[1:]:
+            digest.merge(part)
+
+        assert digest.count == len(values)
+        assert len(digest.centroids) <= 50
+        assert digest.quantile(0.5) == pytest.approx(
+            statistics.median(values), abs=0.05
+        )
+
+    def test_empty_and_single_value(self):
+        digest = TDigest()
+        assert digest.quantile(0.5) is None
+
+        digest.add(4.5)
+        assert digest.quantile(0.9) == 4.5
@@ -80,3 +80,36 @@ class TestTableCreator:
         assert isinstance(result, Table)
         assert len(result.rows) == 2
         assert result.title == "None Values"
+
+    def test_create_tables_pages(self, sample_csv_data):
+        table_creator = TableCreator(sample_csv_data, "Products")
+        tables = list(table_creator.create_tables(page_size=2))
+
+        assert [len(table.rows) for table in tables] == [2, 2, 1]
+        assert [table.title for table in tables] == [
+            "Products (1/3)",
+            "Products (2/3)",
+            "Products (3/3)",
+        ]
+
+    def test_create_tables_single_page(self, sample_csv_data):
+        tables = list(TableCreator(sample_csv_data, "Products").create_tables(10))
+
+        assert len(tables) == 1
+        assert tables[0].title == "Products"
+
+    def test_create_tables_empty_data(self):
+        assert list(TableCreator([]).create_tables(10)) == ["No data to show."]
+
+    def test_create_table_error_bounds(self):
+        data = [
+            {"brand": "apple", "rating": 4.5, "rating_error": 0.1, "count_error": 1}
+        ]
+        result = TableCreator(data).create_table()
+
+        assert [col.header for col in result.columns] == [
+            "brand",
+            "rating",
+            "count_error",
+        ]
+        assert list(result.columns[1].cells) == ["4.5 ± 0.1"]
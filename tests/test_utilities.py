@@ -1,6 +1,12 @@
+import logging
+import pickle
+from array import array
+from unittest.mock import patch
+
 import pytest
 
-from utils import convert_to_number, is_numeric
+from utils import NumericParseError, convert_to_number, is_numeric, parse_numbers
+from utils import shortcuts
 
 
 class TestUtilityFunctions:
@@ -62,3 +68,38 @@ class TestUtilityFunctions:
         assert isinstance(convert_to_number("123.45"), float)
         assert isinstance(convert_to_number("0.0"), float)
         assert isinstance(convert_to_number(".5"), float)
+
+    def test_parse_numbers_floats(self):
+        result = parse_numbers(["4.5", "3", ".5"])
+
+        assert result == array("d", [4.5, 3.0, 0.5])
+
+    def test_parse_numbers_ints(self):
+        result = parse_numbers(["999", "-1"], typecode="q")
+
+        assert result == array("q", [999, -1])
+
+    def test_parse_numbers_reports_all_bad_values(self):
+        with pytest.raises(NumericParseError) as error:
+            parse_numbers(["4.5", "abc", "3", "12abc"])
+
+        assert error.value.bad_values == [(2, "abc"), (4, "12abc")]
+
+    def test_parse_numbers_limits_message(self):
+        with pytest.raises(NumericParseError, match="and 5 more"):
+            parse_numbers(["bad"] * 15)
+
+    def test_numeric_parse_error_pickles(self):
+        error = pickle.loads(pickle.dumps(NumericParseError([(3, "bad")])))
+
+        assert error.bad_values == [(3, "bad")]
+        assert str(error) == "Cannot convert value bad to numeric. (line 3)"
+
+    def test_convert_to_number_skips_debug_formatting(self, caplog):
+        caplog.set_level(logging.INFO)
+
+        with patch.object(shortcuts.logger, "debug") as debug:
+            assert convert_to_number("4.5") == 4.5
+
+        debug.assert_not_called()
+        assert caplog.records == []
@@ -0,0 +1,96 @@
+from io import StringIO
+
+from rich.console import Console
+
+from utils.reports import MultiReport, ReportRegistry
+from utils.watch import ReportWatcher, expand_files
+
+HEADER = "name,brand,price,rating\n"
+
+
+def create_watcher(path, limit=None):
+    report = ReportRegistry.get_report("average-rating")
+    return ReportWatcher([path], report, "average-rating", limit)
+
+
+class TestExpandFiles:
+    def test_expands_directories(self, tmp_path):
+        for name in ("b.csv", "a.csv.gz", "notes.txt"):
+            (tmp_path / name).write_text("")
+        other = tmp_path / "other.csv"
+
+        assert expand_files([tmp_path, other, tmp_path / "b.csv"]) == [
+            tmp_path / "a.csv.gz",
+            tmp_path / "b.csv",
+            other,
+        ]
+
+
+class TestReportWatcher:
+    def test_poll_detects_appended_rows(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        csv_file.write_text(HEADER + "iphone,apple,999,4.0\n")
+        watcher = create_watcher(tmp_path)
+
+        assert watcher.poll()
+        assert watcher.rows() == [{"brand": "apple", "rating": 4.0}]
+        assert not watcher.poll()
+
+        with open(csv_file, "a") as f:
+            f.write("galaxy,samsung,799,4.5\niphone 14,apple,799,5.0\n")
+
+        assert watcher.poll()
+        assert watcher.rows() == [
+            {"brand": "apple", "rating": 4.5},
+            {"brand": "samsung", "rating": 4.5},
+        ]
+        assert watcher.rows_count == 3
+
+    def test_poll_detects_added_and_removed_files(self, tmp_path):
+        first = tmp_path / "first.csv"
+        first.write_text(HEADER + "iphone,apple,999,4.0\n")
+        watcher = create_watcher(tmp_path)
+        watcher.poll()
+
+        second = tmp_path / "second.csv"
+        second.write_text(HEADER + "galaxy,samsung,799,4.5\n")
+        assert watcher.poll()
+        assert len(watcher.rows()) == 2
+
+        first.unlink()
+        assert watcher.poll()
+        assert watcher.rows() == [{"brand": "samsung", "rating": 4.5}]
+
+    def test_invalid_file_is_skipped(self, tmp_path, caplog):
+        (tmp_path / "products.csv").write_text(HEADER + "iphone,apple,999,four\n")
+        watcher = create_watcher(tmp_path)
+
+        assert watcher.poll()
+        assert watcher.rows() == []
+        assert "Cannot convert value four to numeric." in caplog.text
+
+    def test_create_table(self, tmp_path, temp_csv_file):
+        watcher = create_watcher(temp_csv_file, limit=1)
+        watcher.poll()
+
+        output = StringIO()
+        Console(file=output, width=120).print(watcher.create_table())
+        text = output.getvalue()
+        assert "5 rows" in text
+        assert "apple" in text and "samsung" not in text
+
+    def test_create_tables_of_several_reports(self, temp_csv_file):
+        reports = {
+            name: ReportRegistry.get_report(name)
+            for name in ("average-rating", "brand-summary")
+        }
+        watcher = ReportWatcher(
+            [temp_csv_file], MultiReport(reports), "average-rating,brand-summary"
+        )
+        watcher.poll()
+
+        output = StringIO()
+        Console(file=output, width=200).print(watcher.create_table())
+        text = output.getvalue()
+        assert "average-rating (1" in text and "brand-summary (1" in text
+        assert "products" in text
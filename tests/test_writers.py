@@ -0,0 +1,56 @@
+import json
+from io import StringIO
+
+import pytest
+
+from utils import resolve_output_format, write_rows
+from utils import writers
+
+REPORT = [
+    {"brand": "apple", "rating": 4.8},
+    {"brand": "samsung", "rating": 4.5},
+]
+
+
+class TestWriters:
+    """Test cases for streaming writers."""
+
+    def test_write_plain(self):
+        stream = StringIO()
+
+        assert write_rows(REPORT, "plain", stream) == 2
+        assert stream.getvalue() == "brand\trating\napple\t4.8\nsamsung\t4.5\n"
+
+    def test_write_csv(self):
+        stream = StringIO()
+        write_rows(REPORT, "csv", stream)
+
+        assert stream.getvalue().splitlines() == [
+            "brand,rating",
+            "apple,4.8",
+            "samsung,4.5",
+        ]
+
+    def test_write_jsonl(self):
+        stream = StringIO()
+        write_rows(iter(REPORT), "jsonl", stream)
+
+        lines = stream.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == REPORT
+
+    def test_write_empty(self):
+        stream = StringIO()
+
+        assert write_rows([], "csv", stream) == 0
+        assert stream.getvalue() == ""
+
+    def test_write_table_format(self):
+        with pytest.raises(ValueError, match="can't be streamed"):
+            write_rows(REPORT, "table", StringIO())
+
+    def test_resolve_output_format(self, monkeypatch):
+        monkeypatch.setattr(writers, "RICH_MAX_ROWS", 1)
+
+        assert resolve_output_format("auto", 1, StringIO()) == "table"
+        assert resolve_output_format("auto", 2, StringIO()) == "plain"
+        assert resolve_output_format("jsonl", 1, StringIO()) == "jsonl"
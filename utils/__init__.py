@@ -1,22 +1,131 @@
+import importlib
+
 __all__ = [
+    "AggregateReport",
+    "AggregateSpec",
+    "ApproxAverageRatingReport",
     "ArgParser",
     "AverageRatingReport",
     "BaseReport",
+    "COLUMNAR_SUFFIX",
+    "Categorical",
+    "CheckpointStore",
+    "ColumnBatch",
+    "ColumnarFile",
+    "ConvertArgParser",
     "CsvReader",
+    "CsvValidationError",
+    "ENGINES",
+    "FileScan",
+    "HyperLogLog",
+    "IncrementalReport",
+    "MultiReport",
+    "NumericParseError",
+    "OUTPUT_FORMATS",
+    "Predicate",
+    "Profiler",
+    "RatingPercentilesReport",
+    "RatingTailsReport",
+    "ReportCache",
     "ReportRegistry",
+    "ReportServer",
+    "ReportWatcher",
+    "ReservoirSample",
+    "RowError",
+    "RowFilter",
+    "ServeArgParser",
+    "TDigest",
     "TableCreator",
+    "aggregate_files",
+    "aggregate_report",
+    "as_incremental",
+    "check_engine",
+    "convert_files",
     "convert_to_number",
+    "expand_files",
+    "get_logger",
+    "group_stats",
+    "ingest_files",
     "is_numeric",
+    "parse_numbers",
+    "profile_calls",
+    "resolve_output_format",
+    "scan_file",
+    "scan_files",
+    "select_rows",
     "setup_logging",
-    "get_logger",
+    "write_rows",
 ]
 
-from .arg_parser import ArgParser
-from .logger import setup_logging, get_logger
-from .reports import AverageRatingReport, BaseReport, ReportRegistry
-from .shortcuts import (
-    CsvReader,
-    TableCreator,
-    convert_to_number,
-    is_numeric,
-)
+# Submodules are imported on first access to their names, so that running
+# CLI doesn't pay for rendering, caching or multiprocessing it doesn't use.
+_EXPORTS = {
+    "AggregateReport": "aggregate",
+    "AggregateSpec": "aggregate",
+    "ApproxAverageRatingReport": "approx",
+    "ArgParser": "arg_parser",
+    "AverageRatingReport": "reports",
+    "BaseReport": "reports",
+    "COLUMNAR_SUFFIX": "columns",
+    "Categorical": "columns",
+    "CheckpointStore": "checkpoint",
+    "ColumnBatch": "columns",
+    "ColumnarFile": "columnar",
+    "ConvertArgParser": "arg_parser",
+    "CsvReader": "shortcuts",
+    "CsvValidationError": "shortcuts",
+    "ENGINES": "engines",
+    "FileScan": "pipeline",
+    "HyperLogLog": "sketches",
+    "IncrementalReport": "reports",
+    "MultiReport": "reports",
+    "NumericParseError": "shortcuts",
+    "OUTPUT_FORMATS": "writers",
+    "Predicate": "filters",
+    "Profiler": "profiling",
+    "RatingPercentilesReport": "approx",
+    "RatingTailsReport": "approx",
+    "ReportCache": "cache",
+    "ReportRegistry": "reports",
+    "ReportServer": "server",
+    "ReportWatcher": "watch",
+    "ReservoirSample": "sketches",
+    "RowError": "shortcuts",
+    "RowFilter": "filters",
+    "ServeArgParser": "arg_parser",
+    "TDigest": "sketches",
+    "TableCreator": "shortcuts",
+    "aggregate_files": "pipeline",
+    "aggregate_report": "aggregate",
+    "as_incremental": "reports",
+    "check_engine": "engines",
+    "convert_files": "columnar",
+    "convert_to_number": "shortcuts",
+    "expand_files": "watch",
+    "get_logger": "logger",
+    "group_stats": "engines",
+    "ingest_files": "ingest",
+    "is_numeric": "shortcuts",
+    "parse_numbers": "shortcuts",
+    "profile_calls": "profiling",
+    "resolve_output_format": "writers",
+    "scan_file": "pipeline",
+    "scan_files": "pipeline",
+    "select_rows": "reports",
+    "setup_logging": "logger",
+    "write_rows": "writers",
+}
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -0,0 +1,358 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any
+
+from .columns import ColumnBatch
+from .engines import group_stats
+from .logger import get_logger
+from .reports import IncrementalReport, select_rows
+from .shortcuts import convert_to_number
+
+logger = get_logger(__name__)
+
+# Aggregate functions mapped to running totals they are computed from
+AGGREGATE_FUNCTIONS = {
+    "count": (),
+    "sum": ("sum",),
+    "mean": ("sum",),
+    "min": ("min",),
+    "max": ("max",),
+}
+
+_AGGREGATE_RE = re.compile(r"^(\w+)\(\s*([^()]*?)\s*\)(?:\s+as\s+(\S+))?$")
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """Single aggregate of a spec, e.g. mean(rating)."""
+
+    function: str
+    column: str | None = None
+    alias: str | None = None
+
+    @property
+    def name(self) -> str:
+        """Key of aggregate value in report rows."""
+
+        if self.alias:
+            return self.alias
+        if self.column is None:
+            return self.function
+        return f"{self.function}_{self.column}"
+
+
+@dataclass(frozen=True)
+class AggregateSpec:
+    """Column to group rows by and aggregates computed for every group."""
+
+    group_by: str
+    aggregates: tuple[Aggregate, ...]
+
+    @classmethod
+    def parse(cls, spec: str) -> "AggregateSpec":
+        """
+        Parses spec like "group_by=brand, agg=mean(rating), count(), sum(price)".
+
+        Aggregates may be renamed with "as", e.g. "mean(rating) as rating".
+
+        Args:
+            spec: Spec string.
+
+        Returns:
+            Parsed spec.
+
+        Raises:
+            ValueError: If spec is invalid.
+        """
+
+        group_by = None
+        aggregates = []
+        for part in (part.strip() for part in spec.split(",")):
+            key, sep, value = part.partition("=")
+            if sep and key.strip() == "group_by":
+                group_by = value.strip()
+                continue
+            if sep and key.strip() == "agg":
+                part = value.strip()
+            elif sep or not aggregates:
+                raise ValueError(f"Invalid aggregate spec part '{part}' in '{spec}'.")
+
+            match = _AGGREGATE_RE.match(part)
+            if match is None:
+                raise ValueError(f"Invalid aggregate '{part}' in '{spec}'.")
+
+            function, column, alias = match.groups()
+            if function not in AGGREGATE_FUNCTIONS:
+                raise ValueError(
+                    f"Unknown aggregate function '{function}'. "
+                    f"Available functions: {', '.join(AGGREGATE_FUNCTIONS)}"
+                )
+            if bool(column) != (function != "count"):
+                raise ValueError(f"Invalid aggregate '{part}' in '{spec}'.")
+            aggregates.append(Aggregate(function, column or None, alias))
+
+        if not group_by:
+            raise ValueError(f"Aggregate spec '{spec}' has no group_by column.")
+        if not aggregates:
+            raise ValueError(f"Aggregate spec '{spec}' has no aggregates.")
+        if any(aggregate.column == group_by for aggregate in aggregates):
+            raise ValueError(f"Can't aggregate group_by column '{group_by}'.")
+
+        names = [aggregate.name for aggregate in aggregates]
+        if len(set(names + [group_by])) != len(names) + 1:
+            raise ValueError(f"Aggregate spec '{spec}' has duplicate column names.")
+
+        return cls(group_by, tuple(aggregates))
+
+
+class AggregateReport(IncrementalReport):
+    """
+    Groups rows by a column and computes aggregates of every group.
+
+    All aggregates of a spec are fused into a single pass: state of every
+    group is one list of running totals, where count is shared by all
+    aggregates and totals used by several of them (e.g. sum of a column for
+    both sum and mean) are kept once. Rows are ordered by the first
+    aggregate.
+    """
+
+    spec: AggregateSpec | None = None
+
+    def __init__(self, spec: AggregateSpec | str | None = None):
+        """
+        Args:
+            spec: Spec or spec string (see AggregateSpec.parse),
+                spec class attribute by default.
+        """
+
+        spec = self.spec if spec is None else spec
+        if isinstance(spec, str):
+            spec = AggregateSpec.parse(spec)
+        if spec is None:
+            raise ValueError("Aggregate report requires spec.")
+        self.spec = spec
+
+        # Totals slots: count first, then sum, min and max of value columns
+        slots: dict[str, dict[str, int]] = {}
+        width = 1
+        for aggregate in spec.aggregates:
+            for total in AGGREGATE_FUNCTIONS[aggregate.function]:
+                column_slots = slots.setdefault(aggregate.column, {})
+                if total not in column_slots:
+                    column_slots[total] = width
+                    width += 1
+
+        self._value_columns = tuple(
+            (column, totals.get("sum"), totals.get("min"), totals.get("max"))
+            for column, totals in slots.items()
+        )
+        self._outputs = tuple(
+            (
+                aggregate.name,
+                aggregate.function,
+                (
+                    slots[aggregate.column][AGGREGATE_FUNCTIONS[aggregate.function][0]]
+                    if aggregate.column
+                    else 0
+                ),
+            )
+            for aggregate in spec.aggregates
+        )
+        self._empty_totals: list[Any] = [0] * width
+        for _, _, min_slot, max_slot in self._value_columns:
+            for slot in (min_slot, max_slot):
+                if slot is not None:
+                    self._empty_totals[slot] = None
+
+        self.columns = {spec.group_by: "category"}
+        self.columns.update((column, "float") for column in slots)
+
+    def __reduce__(self):
+        # Classes made by aggregate_report can't be imported by worker
+        # processes, but every aggregate report is defined by its spec.
+        return AggregateReport, (self.spec,), self.__dict__
+
+    def init_state(self) -> dict[str, list[Any]]:
+        """
+        Create empty state.
+
+        Returns:
+            Dictionary with groups and their running totals.
+        """
+
+        return {}
+
+    def _merge_totals(self, totals: list[Any], other: list[Any]) -> None:
+        totals[0] += other[0]
+        for _, sum_slot, min_slot, max_slot in self._value_columns:
+            if sum_slot is not None:
+                totals[sum_slot] += other[sum_slot]
+            if min_slot is not None and other[min_slot] is not None:
+                if totals[min_slot] is None or other[min_slot] < totals[min_slot]:
+                    totals[min_slot] = other[min_slot]
+            if max_slot is not None and other[max_slot] is not None:
+                if totals[max_slot] is None or other[max_slot] > totals[max_slot]:
+                    totals[max_slot] = other[max_slot]
+
+    def update(self, state: dict[str, list[Any]], row: dict[str, Any]) -> None:
+        """
+        Add row values to running totals of its group.
+
+        Args:
+            state: Report state.
+            row: Dictionary with row data.
+        """
+
+        key = row[self.spec.group_by]
+        totals = state.get(key)
+        if totals is None:
+            totals = state[key] = self._empty_totals.copy()
+
+        totals[0] += 1
+        for column, sum_slot, min_slot, max_slot in self._value_columns:
+            value = float(convert_to_number(row[column]))
+            if sum_slot is not None:
+                totals[sum_slot] += value
+            if min_slot is not None:
+                if totals[min_slot] is None or value < totals[min_slot]:
+                    totals[min_slot] = value
+            if max_slot is not None:
+                if totals[max_slot] is None or value > totals[max_slot]:
+                    totals[max_slot] = value
+
+    def update_batch(self, state: dict[str, list[Any]], batch: ColumnBatch) -> None:
+        """
+        Add batch values to running totals of groups.
+
+        Args:
+            state: Report state.
+            batch: Batch with group and value columns.
+        """
+
+        groups = batch.columns[self.spec.group_by]
+        categories = groups.categories
+        batch_totals = [self._empty_totals.copy() for _ in categories]
+
+        for column, sum_slot, min_slot, max_slot in self._value_columns:
+            stats = group_stats(
+                groups.codes,
+                batch.columns[column],
+                len(categories),
+                self.engine,
+                extremes=min_slot is not None or max_slot is not None,
+            )
+            for code, totals in enumerate(batch_totals):
+                totals[0] = stats.counts[code]
+                if sum_slot is not None:
+                    totals[sum_slot] = stats.sums[code]
+                if min_slot is not None:
+                    totals[min_slot] = stats.mins[code]
+                if max_slot is not None:
+                    totals[max_slot] = stats.maxs[code]
+
+        if not self._value_columns:
+            for code, count in Counter(groups.codes).items():
+                batch_totals[code][0] = count
+
+        for code, totals in enumerate(batch_totals):
+            if totals[0]:
+                self.merge(state, {categories[code]: totals})
+
+    def merge(
+        self, state: dict[str, list[Any]], other: dict[str, list[Any]]
+    ) -> dict[str, list[Any]]:
+        """
+        Merge group totals of two states.
+
+        Args:
+            state: Report state, modified in place.
+            other: Report state to merge.
+
+        Returns:
+            Merged state.
+        """
+
+        for key, other_totals in other.items():
+            totals = state.get(key)
+            if totals is None:
+                state[key] = other_totals.copy()
+            else:
+                self._merge_totals(totals, other_totals)
+        return state
+
+    def finalize(
+        self,
+        state: dict[str, list[Any]],
+        limit: int | None = None,
+        ascending: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Generate report with aggregates of every group.
+
+        Args:
+            state: Report state.
+            limit: Return only limit groups with the largest (or smallest
+                if ascending) first aggregate.
+            ascending: Sort by first aggregate(asc).
+
+        Returns:
+            List of dictionaries with group and its aggregates,
+            sorted by first aggregate(desc).
+        """
+
+        group_by = self.spec.group_by
+        logger.info(f"Generating {group_by} aggregates report for {len(state)} groups")
+
+        def build_row(key: str, totals: list[Any]) -> dict[str, Any]:
+            row = {group_by: key}
+            for name, function, slot in self._outputs:
+                value = totals[slot]
+                if function == "mean":
+                    value /= totals[0]
+                row[name] = value if function == "count" else round(value, 2)
+            return row
+
+        report_data = select_rows(
+            (build_row(key, totals) for key, totals in state.items()),
+            itemgetter(self._outputs[0][0]),
+            limit,
+            ascending,
+        )
+
+        logger.info(f"Generated report with {len(report_data)} groups")
+        return report_data
+
+
+def aggregate_report(spec: AggregateSpec | str) -> type[AggregateReport]:
+    """
+    Creates report class for spec, to be registered in ReportRegistry.
+
+    Example:
+        ReportRegistry.register_report(
+            "brand-prices", aggregate_report("group_by=brand, agg=max(price)")
+        )
+
+    Args:
+        spec: Spec or spec string (see AggregateSpec.parse).
+
+    Returns:
+        AggregateReport subclass with the spec.
+
+    Raises:
+        ValueError: If spec is invalid.
+    """
+
+    if isinstance(spec, str):
+        spec = AggregateSpec.parse(spec)
+    return type("AggregateReport", (AggregateReport,), {"spec": spec})
+
+
+class BrandSummaryReport(AggregateReport):
+    """Reports average rating, product count and price range by brand."""
+
+    spec = AggregateSpec.parse(
+        "group_by=brand, agg=mean(rating) as rating, count() as products, "
+        "min(price), max(price)"
+    )
@@ -0,0 +1,311 @@
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any
+
+from .columns import ColumnBatch
+from .logger import get_logger
+from .reports import IncrementalReport, select_rows
+from .shortcuts import convert_to_number
+from .sketches import Z_95, HyperLogLog, ReservoirSample, TDigest
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class BrandSketches:
+    """Bounded-memory summaries of a single brand."""
+
+    ratings: ReservoirSample
+    quantiles: TDigest
+    products: HyperLogLog = field(default_factory=HyperLogLog)
+
+
+class ApproxAverageRatingReport(IncrementalReport):
+    """
+    Estimates average and median ratings and distinct products by brand.
+
+    Memory used by every brand is bounded: average rating is estimated from
+    a uniform sample of ratings, median from a t-digest and number of
+    distinct product names from a HyperLogLog sketch. Estimates come with
+    95% error bounds in "<column>_error" keys.
+    """
+
+    columns = {"brand": "category", "name": "category", "rating": "float"}
+    # Maximum number of ratings sampled per brand
+    sample_size = 1024
+    # Accuracy of median ratings (see TDigest)
+    compression = 100
+
+    def _sketches(self, state: dict[str, BrandSketches], brand: str) -> BrandSketches:
+        sketches = state.get(brand)
+        if sketches is None:
+            sketches = state[brand] = BrandSketches(
+                ReservoirSample(self.sample_size), TDigest(self.compression)
+            )
+        return sketches
+
+    def init_state(self) -> dict[str, BrandSketches]:
+        """
+        Create empty state.
+
+        Returns:
+            Dictionary with brands and their sketches.
+        """
+
+        return {}
+
+    def update(self, state: dict[str, BrandSketches], row: dict[str, Any]) -> None:
+        """
+        Add product to brand sketches.
+
+        Args:
+            state: Report state.
+            row: Dictionary with product data.
+        """
+
+        sketches = self._sketches(state, row["brand"])
+        rating = float(convert_to_number(row["rating"]))
+        sketches.ratings.add(rating)
+        sketches.quantiles.add(rating)
+        sketches.products.add(row["name"])
+
+    def update_batch(self, state: dict[str, BrandSketches], batch: ColumnBatch) -> None:
+        """
+        Add batch products to brands sketches.
+
+        Every distinct product name of a brand is hashed once per batch.
+
+        Args:
+            state: Report state.
+            batch: Batch with brand, name and rating columns.
+        """
+
+        brands = batch.columns["brand"]
+        names = batch.columns["name"]
+        ratings: list[list[float]] = [[] for _ in brands.categories]
+        for code, rating in zip(brands.codes, batch.columns["rating"]):
+            ratings[code].append(rating)
+
+        for code, values in enumerate(ratings):
+            if values:
+                sketches = self._sketches(state, brands.categories[code])
+                sketches.ratings.add_many(values)
+                sketches.quantiles.add_many(values)
+
+        for code, name_code in set(zip(brands.codes, names.codes)):
+            state[brands.categories[code]].products.add(names.categories[name_code])
+
+    def merge(
+        self, state: dict[str, BrandSketches], other: dict[str, BrandSketches]
+    ) -> dict[str, BrandSketches]:
+        """
+        Merge brand sketches of two states.
+
+        Args:
+            state: Report state, modified in place.
+            other: Report state to merge.
+
+        Returns:
+            Merged state.
+        """
+
+        for brand, other_sketches in other.items():
+            sketches = self._sketches(state, brand)
+            sketches.ratings.merge(other_sketches.ratings)
+            sketches.quantiles.merge(other_sketches.quantiles)
+            sketches.products.merge(other_sketches.products)
+        return state
+
+    def finalize(
+        self,
+        state: dict[str, BrandSketches],
+        limit: int | None = None,
+        ascending: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Generate report with brands estimates from state.
+
+        Args:
+            state: Report state.
+            limit: Return only limit best (or worst if ascending) brands.
+            ascending: Sort by rating(asc).
+
+        Returns:
+            List of dictionaries with brands, their estimates and error bounds,
+            sorted by estimated rating(desc).
+        """
+
+        logger.info(f"Generating approximate rating report for {len(state)} brands")
+
+        def build_row(brand: str, sketches: BrandSketches) -> dict[str, Any]:
+            rating, rating_error = sketches.ratings.mean()
+            products = sketches.products.estimate()
+            return {
+                "brand": brand,
+                "rating": round(rating, 2),
+                "rating_error": round(rating_error, 2),
+                "median_rating": round(sketches.quantiles.quantile(0.5), 2),
+                "products": round(products),
+                "products_error": round(
+                    Z_95 * sketches.products.relative_error * products
+                ),
+            }
+
+        report_data = select_rows(
+            (build_row(brand, sketches) for brand, sketches in state.items()),
+            itemgetter("rating"),
+            limit,
+            ascending,
+        )
+
+        logger.info(f"Generated report with {len(report_data)} brands")
+        return report_data
+
+
+def percentile_name(q: float) -> str:
+    """Returns report key of q-th quantile, e.g. "p90" for 0.9."""
+
+    if q == 0.5:
+        return "median"
+    return f"p{q * 100:g}"
+
+
+class RatingPercentilesReport(IncrementalReport):
+    """
+    Reports median and other percentiles of ratings by brand.
+
+    Ratings of every brand are summarized by a t-digest of about compression
+    centroids, so memory per brand is bounded whatever the number of rows,
+    and digests built from file parts in other processes merge together.
+    Quantile estimates are most accurate near the tails and get more
+    accurate (and larger) with higher compression.
+    """
+
+    columns = {"brand": "category", "rating": "float"}
+
+    def __init__(
+        self, percentiles: tuple[float, ...] = (0.5, 0.9), compression: float = 100
+    ):
+        """
+        Args:
+            percentiles: Quantiles to report, from 0 to 1.
+            compression: Accuracy of estimates (see TDigest).
+
+        Raises:
+            ValueError: If some quantile is out of range.
+        """
+
+        if not percentiles or any(not 0 <= q <= 1 for q in percentiles):
+            raise ValueError(f"Percentiles must be from 0 to 1, got {percentiles}.")
+        self.percentiles = percentiles
+        self.compression = compression
+
+    def _digest(self, state: dict[str, TDigest], brand: str) -> TDigest:
+        digest = state.get(brand)
+        if digest is None:
+            digest = state[brand] = TDigest(self.compression)
+        return digest
+
+    def init_state(self) -> dict[str, TDigest]:
+        """
+        Create empty state.
+
+        Returns:
+            Dictionary with brands and digests of their ratings.
+        """
+
+        return {}
+
+    def update(self, state: dict[str, TDigest], row: dict[str, Any]) -> None:
+        """
+        Add product rating to brand digest.
+
+        Args:
+            state: Report state.
+            row: Dictionary with product data.
+        """
+
+        self._digest(state, row["brand"]).add(float(convert_to_number(row["rating"])))
+
+    def update_batch(self, state: dict[str, TDigest], batch: ColumnBatch) -> None:
+        """
+        Add batch ratings to brands digests.
+
+        Args:
+            state: Report state.
+            batch: Batch with brand and rating columns.
+        """
+
+        brands = batch.columns["brand"]
+        ratings: list[list[float]] = [[] for _ in brands.categories]
+        for code, rating in zip(brands.codes, batch.columns["rating"]):
+            ratings[code].append(rating)
+
+        for code, values in enumerate(ratings):
+            if values:
+                self._digest(state, brands.categories[code]).add_many(values)
+
+    def merge(
+        self, state: dict[str, TDigest], other: dict[str, TDigest]
+    ) -> dict[str, TDigest]:
+        """
+        Merge brand digests of two states.
+
+        Args:
+            state: Report state, modified in place.
+            other: Report state to merge.
+
+        Returns:
+            Merged state.
+        """
+
+        for brand, digest in other.items():
+            self._digest(state, brand).merge(digest)
+        return state
+
+    def finalize(
+        self,
+        state: dict[str, TDigest],
+        limit: int | None = None,
+        ascending: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Generate report with brands rating percentiles from state.
+
+        Args:
+            state: Report state.
+            limit: Return only limit best (or worst if ascending) brands.
+            ascending: Sort by first percentile(asc).
+
+        Returns:
+            List of dictionaries with brands, their percentiles and number
+            of ratings, sorted by first percentile(desc).
+        """
+
+        logger.info(f"Generating rating percentiles report for {len(state)} brands")
+
+        names = [percentile_name(q) for q in self.percentiles]
+
+        def build_row(brand: str, digest: TDigest) -> dict[str, Any]:
+            row = {"brand": brand}
+            for name, q in zip(names, self.percentiles):
+                row[name] = round(digest.quantile(q), 2)
+            row["ratings"] = digest.count
+            return row
+
+        report_data = select_rows(
+            (build_row(brand, digest) for brand, digest in state.items()),
+            itemgetter(names[0]),
+            limit,
+            ascending,
+        )
+
+        logger.info(f"Generated report with {len(report_data)} brands")
+        return report_data
+
+
+class RatingTailsReport(RatingPercentilesReport):
+    """Reports 1st and 99th percentile ratings by brand, with finer digests."""
+
+    def __init__(self):
+        super().__init__(percentiles=(0.01, 0.99), compression=500)
@@ -1,16 +1,247 @@
 import argparse
+from pathlib import Path
+
+from .engines import ENGINES
+from .filters import Predicate
+from .writers import OUTPUT_FORMATS
+
+
+def positive_int(value: str) -> int:
+    """Argparse type for integers greater than zero."""
+
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"value must be at least 1, got {number}")
+    return number
+
+
+def predicate(value: str) -> Predicate:
+    """Argparse type for --where filters."""
+
+    try:
+        return Predicate.parse(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def positive_float(value: str) -> float:
+    """Argparse type for floats greater than zero."""
+
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: '{value}'")
+
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"value must be positive, got {value}")
+    return number
 
 
 class ArgParser(argparse.ArgumentParser):
     def __init__(self):
         super(ArgParser, self).__init__(
-            description="Filtering and aggregating CSV files."
+            description="Filtering and aggregating CSV files.",
+            epilog="Run 'main.py serve --help' to serve reports over HTTP or "
+            "'main.py convert --help' to convert files into columnar format.",
         )
         self.add_argument(
-            "--files", nargs="+", required=True, help="Path to CSV files."
+            "--files",
+            nargs="+",
+            required=True,
+            help="Path to CSV files (or directories with --watch).",
         )
         self.add_argument(
             "--report",
+            nargs="+",
+            required=True,
+            help="Creating <report-name> with given files. Several reports are "
+            "aggregated in a single scan of the files.",
+        )
+        self.add_argument(
+            "--jobs",
+            type=positive_int,
+            default=1,
+            help="Number of processes used to parse files (default: 1).",
+        )
+        self.add_argument(
+            "--io-concurrency",
+            type=positive_int,
+            help="Read up to N files concurrently while workers parse them, "
+            "useful on network storage.",
+        )
+        self.add_argument(
+            "--read-ahead",
+            type=positive_int,
+            default=4,
+            help="Number of read files waiting for a free worker with "
+            "--io-concurrency (default: 4).",
+        )
+        self.add_argument(
+            "--engine",
+            choices=ENGINES,
+            default="python",
+            help="Engine used to aggregate reports (default: python).",
+        )
+        self.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Don't read or write cached per-file report states.",
+        )
+        self.add_argument(
+            "--checkpoint",
+            action="store_true",
+            help="Remember how far append-only files were parsed and parse only "
+            "appended data on the next run.",
+        )
+        self.add_argument(
+            "--where",
+            type=predicate,
+            nargs="+",
+            action="extend",
+            default=[],
+            metavar="FILTER",
+            help="Aggregate only rows passing all filters, e.g. 'price>500' "
+            "'brand in (apple,samsung)' 'rating>=4'. Filters are checked while "
+            "parsing.",
+        )
+        self.add_argument(
+            "--approx",
+            action="store_true",
+            help="Estimate reports with bounded-memory sketches, "
+            "showing error bounds.",
+        )
+        self.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and redraw report table when files change.",
+        )
+        self.add_argument(
+            "--refresh-rate",
+            type=positive_float,
+            default=1.0,
+            help="Checks for changes per second with --watch (default: 1).",
+        )
+        self.add_argument(
+            "--profile",
+            action="store_true",
+            help="Print wall time, CPU time, rows/s and peak RSS of every stage.",
+        )
+        self.add_argument(
+            "--profile-output",
+            type=Path,
+            help="Write profile as JSON trace to the file (implies --profile).",
+        )
+        self.add_argument(
+            "--pstats",
+            type=Path,
+            help="Write cProfile stats of the run to the file (implies --profile).",
+        )
+        self.add_argument(
+            "--output",
+            choices=OUTPUT_FORMATS,
+            default="auto",
+            help=(
+                "Output format. auto renders rich table for small reports or "
+                "terminals and plain text otherwise (default: auto)."
+            ),
+        )
+        limit = self.add_mutually_exclusive_group()
+        limit.add_argument(
+            "--top",
+            type=positive_int,
+            help="Show only N best rows of the report.",
+        )
+        limit.add_argument(
+            "--bottom",
+            type=positive_int,
+            help="Show only N worst rows of the report, worst first.",
+        )
+        self.add_argument(
+            "--page-size",
+            type=positive_int,
+            help="Split table output into tables of N rows.",
+        )
+
+
+def memory_size(value: str) -> int:
+    """Argparse type for memory sizes like 512M or 2G."""
+
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    multiplier = units.get(value[-1:].upper(), 1)
+    number = value[:-1] if multiplier > 1 else value
+    try:
+        size = int(float(number) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid memory size: '{value}'")
+
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"memory size must be positive, got {value}")
+    return size
+
+
+class ServeArgParser(argparse.ArgumentParser):
+    def __init__(self):
+        super(ServeArgParser, self).__init__(
+            prog="main.py serve",
+            description="Serving reports of CSV files kept warm in memory.",
+        )
+        self.add_argument(
+            "--files", nargs="+", required=True, help="Path to served CSV files."
+        )
+        self.add_argument(
+            "--host",
+            default="127.0.0.1",
+            help="Address to listen on (default: 127.0.0.1).",
+        )
+        self.add_argument(
+            "--port",
+            type=int,
+            default=8000,
+            help="Port to listen on (default: 8000).",
+        )
+        self.add_argument(
+            "--socket",
+            type=Path,
+            help="Listen on unix socket instead of TCP port.",
+        )
+        self.add_argument(
+            "--jobs",
+            type=positive_int,
+            default=1,
+            help="Number of processes used to parse files (default: 1).",
+        )
+        self.add_argument(
+            "--engine",
+            choices=ENGINES,
+            default="python",
+            help="Engine used to aggregate reports (default: python).",
+        )
+        self.add_argument(
+            "--memory-limit",
+            type=memory_size,
+            default="512M",
+            help="Evict least recently used file states above this size "
+            "(default: 512M).",
+        )
+
+
+class ConvertArgParser(argparse.ArgumentParser):
+    def __init__(self):
+        super(ConvertArgParser, self).__init__(
+            prog="main.py convert",
+            description="Converting CSV files into a columnar file, which "
+            "reports read faster than CSV.",
+        )
+        self.add_argument(
+            "--files", nargs="+", required=True, help="Path to CSV files."
+        )
+        self.add_argument(
+            "--output",
+            type=Path,
             required=True,
-            help="Creating <report-name> with given files.",
+            help="Path to columnar file, with .csvcol extension.",
         )
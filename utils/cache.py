@@ -0,0 +1,186 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any
+
+from .logger import get_logger
+from .pipeline import FileScan
+
+logger = get_logger(__name__)
+
+# Bump when format of cached states changes
+CACHE_VERSION = 1
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns cache directory.
+
+    CSV_REPORTS_CACHE_DIR environment variable takes precedence over
+    XDG_CACHE_HOME/csv_reports and ~/.cache/csv_reports.
+    """
+
+    directory = os.environ.get("CSV_REPORTS_CACHE_DIR")
+    if directory:
+        return Path(directory)
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "csv_reports"
+
+
+def write_entry(entry: Path, value: Any) -> None:
+    """
+    Pickles and compresses value into entry file atomically.
+
+    Raises:
+        OSError: If entry can't be written.
+    """
+
+    data = zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL), 1)
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=entry.parent, suffix=".tmp", delete=False
+    ) as f:
+        f.write(data)
+    os.replace(f.name, entry)
+
+
+def read_entry(entry: Path) -> Any:
+    """
+    Reads value written by write_entry.
+
+    Raises:
+        FileNotFoundError: If there is no entry.
+        Exception: If entry is broken.
+    """
+
+    return pickle.loads(zlib.decompress(entry.read_bytes()))
+
+
+class ReportCache:
+    """
+    On-disk cache of per-file report states.
+
+    Entries are keyed by file path, size, modification time and report name,
+    so changed files are never served from cache. Least recently used entries
+    are removed when total cache size exceeds max_size. Cache directory is
+    listed once, then its size is tracked as entries are written, so storing
+    an entry doesn't stat every other one until the limit is exceeded.
+    """
+
+    suffix = ".state"
+
+    def __init__(self, directory: Path | None = None, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+        # Total size of entries, None until the directory is listed
+        self.size: int | None = None
+
+    def _entry(self, file: Path, report_name: str) -> Path | None:
+        """Returns cache entry path for file or None if file can't be stat'ed."""
+
+        try:
+            stat = file.stat()
+        except OSError:
+            return None
+
+        key = "\0".join(
+            [
+                str(CACHE_VERSION),
+                str(file.resolve()),
+                str(stat.st_size),
+                str(stat.st_mtime_ns),
+                report_name,
+            ]
+        )
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}{self.suffix}"
+
+    def get(self, file: Path, report_name: str) -> FileScan | None:
+        """
+        Returns cached scan of unchanged file.
+
+        Args:
+            file: Path to CSV file.
+            report_name: Report name.
+
+        Returns:
+            FileScan or None if there is no valid entry.
+        """
+
+        entry = self._entry(file, report_name)
+        if entry is None:
+            return None
+
+        try:
+            scan = read_entry(entry)
+            os.utime(entry)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring broken cache entry {entry}: {e}")
+            entry.unlink(missing_ok=True)
+            return None
+
+        logger.info(f"Loaded {file} state from cache")
+        scan.file = file
+        scan.cached = True
+        scan.wall_time = scan.cpu_time = 0.0
+        return scan
+
+    def put(self, scan: FileScan, report_name: str) -> None:
+        """
+        Stores scan of a file and evicts old entries if needed.
+
+        Args:
+            scan: Successful FileScan.
+            report_name: Report name.
+        """
+
+        entry = self._entry(scan.file, report_name)
+        if entry is None:
+            return
+
+        try:
+            replaced = entry.stat().st_size
+        except OSError:
+            replaced = 0
+
+        try:
+            write_entry(entry, scan)
+            written = entry.stat().st_size
+        except OSError as e:
+            logger.warning(f"Can't write cache entry {entry}: {e}")
+            return
+
+        if self.size is None:
+            self.evict()
+            return
+
+        self.size += written - replaced
+        if self.size > self.max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used entries until cache fits into max_size."""
+
+        entries = []
+        for entry in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Evicted cache entry {entry}")
+        self.size = total
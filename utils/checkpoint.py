@@ -0,0 +1,216 @@
+import hashlib
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from .cache import default_cache_dir, read_entry, write_entry
+from .logger import get_logger
+from .pipeline import FileScan, scan_range, timed
+from .reports import IncrementalReport
+from .shortcuts import CsvReader, CsvValidationError
+
+logger = get_logger(__name__)
+
+# Bump when format of checkpoints changes
+CHECKPOINT_VERSION = 1
+# Number of bytes before checkpoint offset that must not change
+TAIL_HASH_SIZE = 4096
+
+
+@dataclass
+class Checkpoint:
+    """How far a file was parsed and report state of the parsed part."""
+
+    header_hash: str
+    offset: int
+    tail_hash: str
+    lines_count: int
+    records_count: int
+    rows_count: int
+    state: Any
+
+
+def _hash(f, start: int, end: int) -> str:
+    f.seek(start)
+    return hashlib.sha256(f.read(end - start)).hexdigest()
+
+
+def _last_record_end(f, start: int, size: int) -> int:
+    """Returns offset right after the last newline of file data, or start."""
+
+    end = size
+    while end > start:
+        block_start = max(start, end - 64 * 1024)
+        f.seek(block_start)
+        newline = f.read(end - block_start).rfind(b"\n")
+        if newline != -1:
+            return block_start + newline + 1
+        end = block_start
+    return start
+
+
+class CheckpointStore:
+    """
+    Report states of append-only files together with parsed byte offsets.
+
+    When a file grows, only records appended after the offset are parsed
+    and merged into the saved state. Files whose header or last bytes before
+    the offset changed, or which got shorter, are parsed from the start.
+    A trailing line without newline may be still being written, so it's
+    parsed on every run but isn't included in the checkpoint.
+    """
+
+    suffix = ".checkpoint"
+
+    def __init__(self, directory: Path | None = None, persistent: bool = True):
+        """
+        Args:
+            directory: Directory to store checkpoints in.
+            persistent: Store checkpoints on disk, not only in memory.
+        """
+
+        self.directory = directory or default_cache_dir() / "checkpoints"
+        self.persistent = persistent
+        self.checkpoints: dict[tuple[Path, str], Checkpoint] = {}
+
+    def _entry(self, file: Path, report_name: str) -> Path:
+        key = "\0".join([str(CHECKPOINT_VERSION), str(file.resolve()), report_name])
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}{self.suffix}"
+
+    def get(self, file: Path, report_name: str) -> Checkpoint | None:
+        """Returns last checkpoint of a file, None if there is none."""
+
+        checkpoint = self.checkpoints.get((file, report_name))
+        if checkpoint is not None or not self.persistent:
+            return checkpoint
+
+        entry = self._entry(file, report_name)
+        try:
+            return read_entry(entry)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring broken checkpoint {entry}: {e}")
+            entry.unlink(missing_ok=True)
+            return None
+
+    def put(self, file: Path, report_name: str, checkpoint: Checkpoint) -> None:
+        """Stores checkpoint of a file."""
+
+        self.checkpoints[(file, report_name)] = checkpoint
+        if not self.persistent:
+            return
+
+        entry = self._entry(file, report_name)
+        try:
+            write_entry(entry, checkpoint)
+        except OSError as e:
+            logger.warning(f"Can't write checkpoint {entry}: {e}")
+
+    def scan(
+        self, file: Path, report: IncrementalReport, report_name: str
+    ) -> FileScan | None:
+        """
+        Scans part of a file appended since its last checkpoint.
+
+        Args:
+            file: Path to CSV file.
+            report: Report to aggregate rows with.
+            report_name: Report name used in checkpoint keys.
+
+        Returns:
+            FileScan with report state of the whole file and errors of the
+            appended part, or None if file can't be scanned incrementally
+            (compressed, columnar or missing files).
+        """
+
+        if file.suffix != ".csv" or not file.is_file():
+            return None
+        return self._scan(file, report, report_name)
+
+    @timed
+    def _scan(
+        self, file: Path, report: IncrementalReport, report_name: str
+    ) -> FileScan:
+        reader = CsvReader(file)
+        try:
+            header, data_start = reader.read_header()
+            with open(file, "rb") as f:
+                header_hash = _hash(f, 0, data_start)
+                size = f.seek(0, 2)
+                end = _last_record_end(f, data_start, size)
+                checkpoint = self.get(file, report_name)
+                if checkpoint is not None and not (
+                    checkpoint.header_hash == header_hash
+                    and checkpoint.offset <= size
+                    and checkpoint.tail_hash
+                    == _hash(
+                        f,
+                        max(data_start, checkpoint.offset - TAIL_HASH_SIZE),
+                        checkpoint.offset,
+                    )
+                ):
+                    logger.info(f"File {file} was rewritten, scanning it again")
+                    checkpoint = None
+                tail_hash = _hash(f, max(data_start, end - TAIL_HASH_SIZE), end)
+        except CsvValidationError as e:
+            return FileScan(file, errors=reader.errors, error=str(e))
+        except OSError as e:
+            return FileScan(file, error=f"Error reading file: {str(e)}!")
+
+        if checkpoint is None:
+            checkpoint = Checkpoint(
+                header_hash,
+                data_start,
+                "",
+                reader.lines_count,
+                0,
+                0,
+                report.init_state(),
+            )
+
+        errors = []
+        if end > checkpoint.offset:
+            logger.info(f"Scanning {file} from byte {checkpoint.offset}")
+            tail = scan_range(file, checkpoint.offset, end, header, report, True)
+            errors = [
+                replace(error, line=error.line + checkpoint.lines_count)
+                for error in tail.errors
+            ]
+            if tail.error:
+                return FileScan(file, errors=errors, error=tail.error)
+
+            checkpoint = Checkpoint(
+                header_hash,
+                end,
+                tail_hash,
+                checkpoint.lines_count + tail.lines_count,
+                checkpoint.records_count + tail.records_count,
+                checkpoint.rows_count + tail.rows_count,
+                report.merge(checkpoint.state, tail.state),
+            )
+            self.put(file, report_name, checkpoint)
+
+        state = checkpoint.state
+        rows_count = checkpoint.rows_count
+        records_count = checkpoint.records_count
+        if size > end:
+            partial = scan_range(file, end, size, header, report, True)
+            errors.extend(
+                replace(error, line=error.line + checkpoint.lines_count)
+                for error in partial.errors
+            )
+            if partial.error:
+                return FileScan(file, errors=errors, error=partial.error)
+
+            state = report.merge(
+                report.merge(report.init_state(), state), partial.state
+            )
+            rows_count += partial.rows_count
+            records_count += partial.records_count
+
+        if records_count == 0:
+            return FileScan(file, errors=errors, error=f"CSV file {file} is empty!")
+
+        return FileScan(file, state, rows_count, errors)
@@ -0,0 +1,342 @@
+import json
+import mmap
+import sys
+from array import array
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from .columns import COLUMN_TYPECODES, Categorical, ColumnBatch
+from .filters import Predicate
+from .logger import get_logger
+from .shortcuts import CsvReader, CsvValidationError, parse_numbers
+
+logger = get_logger(__name__)
+
+MAGIC = b"CSVCOL\x00\x01"
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+# Range of values of "int" columns
+INT_MIN, INT_MAX = -(2**63), 2**63 - 1
+
+
+@dataclass
+class ColumnInfo:
+    """Schema, statistics and location of a stored column."""
+
+    name: str
+    kind: str
+    offset: int = 0
+    min: Any = None
+    max: Any = None
+    categories: list[str] | None = None
+    # Original text of float values written differently, e.g. "5" of 5.0
+    texts: dict[str, str] | None = None
+
+
+def _infer_column(
+    categories: list[str], codes: array
+) -> tuple[str, array, dict[str, str] | None]:
+    """
+    Picks the narrowest kind all values of a column can be stored as.
+
+    Values are parsed once per distinct value, not once per row. Columns of
+    ints are stored as ints only if every value is written back unchanged
+    (so "00123" stays a category) and fits in 64 bits. Other numeric columns
+    are stored as floats, keeping original text of values written back
+    differently (e.g. "5" or "999.00"), unless two texts have the same value.
+
+    Returns:
+        Column kind, array of its values (codes for categories) and texts
+        of float values.
+    """
+
+    try:
+        numbers = [int(value) for value in categories]
+    except ValueError:
+        pass
+    else:
+        if all(
+            str(number) == value and INT_MIN <= number <= INT_MAX
+            for number, value in zip(numbers, categories)
+        ):
+            values = array(COLUMN_TYPECODES["int"], map(numbers.__getitem__, codes))
+            return "int", values, None
+        return "category", codes, None
+
+    try:
+        numbers = [float(value) for value in categories]
+    except ValueError:
+        return "category", codes, None
+
+    texts = {}
+    for number, value in zip(numbers, categories):
+        key = str(number)
+        if texts.setdefault(key, value) != value:
+            return "category", codes, None
+    texts = {key: value for key, value in texts.items() if key != value}
+
+    values = array(COLUMN_TYPECODES["float"], map(numbers.__getitem__, codes))
+    return "float", values, texts or None
+
+
+def convert_files(files: list[Path], output: Path) -> int:
+    """
+    Converts CSV files with the same header into a single columnar file.
+
+    Every column is dictionary-encoded while reading, then stored as ints,
+    floats or category codes, whichever fits all its values. Malformed rows
+    are skipped and logged as warnings.
+
+    File layout: MAGIC, header size (8 bytes, little endian), JSON header
+    with row count and ColumnInfo of every column, then column arrays,
+    each aligned to 8 bytes.
+
+    Args:
+        files: Paths to CSV files.
+        output: Path to columnar file.
+
+    Returns:
+        Number of stored rows.
+
+    Raises:
+        CsvValidationError: If some file can't be read or headers differ.
+    """
+
+    header = None
+    codes: dict[str, array] = {}
+    encoders: dict[str, dict[str, int]] = {}
+
+    for file in files:
+        reader = CsvReader(file)
+        file_header, _ = reader.read_header()
+        if header is None:
+            header = file_header
+            codes = {name: array(COLUMN_TYPECODES["category"]) for name in header}
+            encoders = {name: {} for name in header}
+        elif file_header != header:
+            raise CsvValidationError(f"Header of {file} differs from {files[0]}!")
+
+        # Codes of every file are translated into shared ones
+        mappings: dict[str, list[int]] = {name: [] for name in header}
+        for batch in reader.stream_columns(dict.fromkeys(header, "category")):
+            for name, column in batch.columns.items():
+                encoder = encoders[name]
+                mapping = mappings[name]
+                known = len(mapping)
+                for value in column.categories[known:]:
+                    mapping.append(encoder.setdefault(value, len(encoder)))
+                codes[name].extend(map(mapping.__getitem__, column.codes))
+        for error in reader.errors:
+            logger.warning(error)
+
+    rows = len(codes[header[0]]) if header else 0
+    infos = []
+    data = []
+    offset = 0
+    for name in header or []:
+        categories = list(encoders[name])
+        kind, values, texts = _infer_column(categories, codes[name])
+        info = ColumnInfo(name, kind, offset, texts=texts)
+        if kind == "category":
+            info.categories = categories
+            values_range = info.categories
+        else:
+            values_range = values
+        if rows:
+            info.min, info.max = min(values_range), max(values_range)
+
+        data.append(values)
+        infos.append(info)
+        offset += -(-len(values) * values.itemsize // ALIGNMENT) * ALIGNMENT
+
+    meta = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "rows": rows,
+            "columns": [asdict(info) for info in infos],
+        }
+    ).encode("utf-8")
+    meta += b" " * (-(len(MAGIC) + 8 + len(meta)) % ALIGNMENT)
+
+    with open(output, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(meta).to_bytes(8, "little"))
+        f.write(meta)
+        for values in data:
+            values.tofile(f)
+            f.write(b"\0" * (-len(values) * values.itemsize % ALIGNMENT))
+
+    logger.info(f"Converted {rows} rows of {len(files)} files into {output}")
+    return rows
+
+
+class ColumnarFile:
+    """Memory-mapped file written by convert_files."""
+
+    def __init__(self, file: Path):
+        """
+        Reads file header.
+
+        Raises:
+            CsvValidationError: If file isn't a valid columnar file.
+        """
+
+        self.file = file
+        try:
+            with open(file, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError("wrong magic number")
+                size = int.from_bytes(f.read(8), "little")
+                meta = json.loads(f.read(size))
+        except (OSError, ValueError) as e:
+            raise CsvValidationError(
+                f"File {file} is not a valid columnar file! Error: {str(e)}"
+            ) from e
+
+        if meta.get("version") != FORMAT_VERSION:
+            raise CsvValidationError(
+                f"File {file} has unsupported version {meta.get('version')}!"
+            )
+
+        self.rows: int = meta["rows"]
+        self.byteorder: str = meta["byteorder"]
+        self.data_start = len(MAGIC) + 8 + size
+        self.columns = {
+            column["name"]: ColumnInfo(**column) for column in meta["columns"]
+        }
+
+    @property
+    def header(self) -> list[str]:
+        return list(self.columns)
+
+    def may_match(self, predicates: Sequence[Predicate]) -> bool:
+        """
+        Tells whether some row may pass all predicates, judging only by
+        column statistics stored in the header.
+        """
+
+        for predicate in predicates:
+            info = self.columns.get(predicate.column)
+            if info is None or info.min is None:
+                continue
+            if info.kind == "category":
+                if not any(map(predicate.compile(), info.categories)):
+                    return False
+            elif not predicate.may_match_range(info.min, info.max):
+                return False
+        return True
+
+    def _column(self, buffer: memoryview, info: ColumnInfo) -> memoryview | array:
+        """Returns all stored values of a column, without copying if possible."""
+
+        typecode = COLUMN_TYPECODES[info.kind]
+        start = self.data_start + info.offset
+        end = start + self.rows * array(typecode).itemsize
+        view = buffer[start:end]
+        if self.byteorder == sys.byteorder:
+            return view.cast(typecode)
+
+        values = array(typecode, view.tobytes())
+        values.byteswap()
+        return values
+
+    def _convert(
+        self, info: ColumnInfo, values: memoryview | array, kind: str, first_row: int
+    ) -> memoryview | array | Categorical:
+        """Converts stored values to column kind requested by a report."""
+
+        if kind == info.kind:
+            if kind == "category":
+                return Categorical(values, info.categories)
+            return values
+
+        if info.kind == "category":
+            # Numbers can't be stored as numbers only if some of them are bad
+            strings = [info.categories[code] for code in values]
+            lines = array("Q", range(first_row, first_row + len(strings)))
+            return parse_numbers(strings, COLUMN_TYPECODES[kind], lines)
+
+        if kind == "category":
+            strings = list(map(str, values))
+            if info.texts:
+                strings = [info.texts.get(value, value) for value in strings]
+            encoder = {value: code for code, value in enumerate(dict.fromkeys(strings))}
+            codes = array(COLUMN_TYPECODES[kind], map(encoder.__getitem__, strings))
+            return Categorical(codes, list(encoder))
+
+        return array(COLUMN_TYPECODES[kind], values)
+
+    def _mapped(self) -> Iterator[memoryview]:
+        """Yields memoryview of the whole mapped file."""
+
+        with open(self.file, "rb") as f:
+            if self.data_start >= f.seek(0, 2):
+                # Files without rows can't be mapped, nothing to read anyway
+                yield memoryview(b"")
+                return
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            yield memoryview(buffer)
+        finally:
+            try:
+                buffer.close()
+            except BufferError:
+                # Some batch is still in use, mapping is closed when it's freed
+                pass
+
+    def stream_columns(
+        self, columns: dict[str, str], batch_size: int = 65536
+    ) -> Iterator[ColumnBatch]:
+        """
+        Yields requested columns batch by batch.
+
+        Columns stored in the requested kind are memoryviews of the mapped
+        file, others are converted.
+
+        Args:
+            columns: Column names mapped to their kind (see COLUMN_TYPECODES).
+            batch_size: Maximum number of rows in a batch.
+
+        Yields:
+            ColumnBatch objects.
+
+        Raises:
+            CsvValidationError: If file lacks some column.
+            NumericParseError: If stored category can't be read as numbers.
+        """
+
+        for name, kind in columns.items():
+            if kind not in COLUMN_TYPECODES:
+                raise ValueError(f"Unknown column kind '{kind}' for column {name}")
+            if name not in self.columns:
+                raise CsvValidationError(
+                    f"CSV file {self.file} has no column '{name}'!"
+                )
+
+        for buffer in self._mapped():
+            stored = {
+                name: self._column(buffer, self.columns[name]) for name in columns
+            }
+            for start in range(0, self.rows, batch_size):
+                end = min(start + batch_size, self.rows)
+                yield ColumnBatch(
+                    end - start,
+                    {
+                        name: self._convert(
+                            self.columns[name], stored[name][start:end], kind, start + 1
+                        )
+                        for name, kind in columns.items()
+                    },
+                )
+            del stored
+
+    def stream_rows(self) -> Iterator[dict[str, str]]:
+        """Yields rows as dictionaries of strings, like CsvReader.stream_csv."""
+
+        names = list(self.columns)
+        for batch in self.stream_columns(dict.fromkeys(names, "category")):
+            for values in zip(*batch.columns.values()):
+                yield dict(zip(names, values))
@@ -0,0 +1,41 @@
+from array import array
+from dataclasses import dataclass, field
+
+# Column kinds reports can ask for and typecodes of arrays they are stored in
+COLUMN_TYPECODES = {
+    "category": "I",
+    "float": "d",
+    "int": "q",
+}
+
+# Suffix of files written by "convert" command (see utils.columnar)
+COLUMNAR_SUFFIX = ".csvcol"
+
+
+@dataclass
+class Categorical:
+    """
+    Dictionary-encoded column.
+
+    Every value is stored as an index in categories list. Categories are
+    shared by all batches of a single stream and only grow, so codes of
+    earlier batches stay valid.
+    """
+
+    codes: array
+    categories: list[str]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self):
+        categories = self.categories
+        return (categories[code] for code in self.codes)
+
+
+@dataclass
+class ColumnBatch:
+    """Batch of rows stored column by column."""
+
+    size: int = 0
+    columns: dict[str, array | Categorical] = field(default_factory=dict)
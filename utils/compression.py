@@ -0,0 +1,138 @@
+import io
+import queue
+import threading
+from importlib.util import find_spec
+from pathlib import Path
+from typing import BinaryIO
+
+# Compressed file suffixes mapped to modules decompressing them
+COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".zst": "zstandard"}
+
+
+def get_compression(file: Path) -> str | None:
+    """Returns decompressing module name for compressed files, None otherwise."""
+
+    return COMPRESSIONS.get(file.suffix)
+
+
+def check_compression(compression: str) -> None:
+    """
+    Checks that decompressing module is available.
+
+    Raises:
+        ValueError: If module isn't installed.
+    """
+
+    if find_spec(compression) is None:
+        raise ValueError(f"Reading {compression} files requires {compression} module.")
+
+
+class ReadAheadReader(io.RawIOBase):
+    """
+    Reads stream in a background thread, keeping a few chunks ahead.
+
+    Decompressors release the GIL while decompressing, so the next chunks are
+    decompressed while the current one is parsed.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        source: BinaryIO | None = None,
+        chunk_size: int = 1024 * 1024,
+        depth: int = 4,
+    ):
+        """
+        Args:
+            stream: Stream to read.
+            source: File under the stream, closed together with it.
+            chunk_size: Size of chunks read ahead.
+            depth: Maximum number of chunks read ahead.
+        """
+
+        self.stream = stream
+        self.source = source
+        self.chunk_size = chunk_size
+        self.chunks: queue.Queue = queue.Queue(maxsize=depth)
+        self.chunk = memoryview(b"")
+        self.eof = False
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._read_ahead, daemon=True)
+        self.thread.start()
+
+    def _put(self, item: bytes | OSError) -> None:
+        while not self.stopped.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _read_ahead(self) -> None:
+        try:
+            while not self.stopped.is_set():
+                chunk = self.stream.read(self.chunk_size)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except OSError as e:
+            self._put(e)
+        except Exception as e:
+            # Corrupted or truncated data is a read error as well
+            error = OSError(f"{type(e).__name__}: {e}")
+            error.__cause__ = e
+            self._put(error)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self.chunk and not self.eof:
+            item = self.chunks.get()
+            if isinstance(item, OSError):
+                self.eof = True
+                raise item
+            self.eof = not item
+            self.chunk = memoryview(item)
+
+        size = min(len(buffer), len(self.chunk))
+        buffer[:size] = self.chunk[:size]
+        self.chunk = self.chunk[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self.stopped.set()
+            self.thread.join()
+            self.stream.close()
+            if self.source is not None:
+                self.source.close()
+        super().close()
+
+
+def open_decompressed(f: BinaryIO, compression: str) -> BinaryIO:
+    """
+    Wraps binary file with streaming decompression.
+
+    Args:
+        f: Compressed file opened in binary mode, closed with returned stream.
+        compression: Module name (see COMPRESSIONS).
+
+    Returns:
+        Buffered binary stream of decompressed data.
+    """
+
+    if compression == "gzip":
+        import gzip
+
+        stream = gzip.GzipFile(fileobj=f)
+    elif compression == "bz2":
+        import bz2
+
+        stream = bz2.BZ2File(f)
+    else:
+        import zstandard
+
+        stream = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+
+    return io.BufferedReader(ReadAheadReader(stream, f))
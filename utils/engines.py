@@ -0,0 +1,119 @@
+from array import array
+from importlib.util import find_spec
+from typing import NamedTuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+ENGINES = ("python", "numpy")
+
+
+class GroupStats(NamedTuple):
+    """Per-group aggregates of a single batch, indexed by group code."""
+
+    counts: list[int]
+    sums: list[float]
+    mins: list[float | None] | None = None
+    maxs: list[float | None] | None = None
+
+
+def check_engine(engine: str) -> None:
+    """
+    Checks that engine is known and can be used.
+
+    Args:
+        engine: Engine name.
+
+    Raises:
+        ValueError: If engine is unknown or its dependencies are missing.
+    """
+
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Engine '{engine}' isn't found. Available engines: {', '.join(ENGINES)}"
+        )
+
+    if engine == "numpy" and find_spec("numpy") is None:
+        raise ValueError("Engine 'numpy' requires numpy to be installed.")
+
+
+def _group_stats_python(
+    codes: array, values: array, groups: int, extremes: bool
+) -> GroupStats:
+    counts = [0] * groups
+    sums = [0.0] * groups
+
+    for code, value in zip(codes, values):
+        sums[code] += value
+        counts[code] += 1
+
+    if not extremes:
+        return GroupStats(counts, sums)
+
+    mins = [None] * groups
+    maxs = [None] * groups
+    for code, value in zip(codes, values):
+        current = mins[code]
+        if current is None or value < current:
+            mins[code] = value
+        current = maxs[code]
+        if current is None or value > current:
+            maxs[code] = value
+
+    return GroupStats(counts, sums, mins, maxs)
+
+
+def _group_stats_numpy(
+    codes: array, values: array, groups: int, extremes: bool
+) -> GroupStats:
+    import numpy as np
+
+    codes = np.frombuffer(codes, dtype=np.uint32)
+    values = np.frombuffer(values, dtype=np.float64)
+
+    counts = np.bincount(codes, minlength=groups)
+    sums = np.bincount(codes, weights=values, minlength=groups)
+    if not extremes:
+        return GroupStats(counts.tolist(), sums.tolist())
+
+    mins = np.full(groups, np.inf)
+    maxs = np.full(groups, -np.inf)
+    np.minimum.at(mins, codes, values)
+    np.maximum.at(maxs, codes, values)
+    empty = (counts == 0).tolist()
+
+    return GroupStats(
+        counts.tolist(),
+        sums.tolist(),
+        [None if e else v for e, v in zip(empty, mins.tolist())],
+        [None if e else v for e, v in zip(empty, maxs.tolist())],
+    )
+
+
+def group_stats(
+    codes: array,
+    values: array,
+    groups: int,
+    engine: str = "python",
+    extremes: bool = False,
+) -> GroupStats:
+    """
+    Computes count, sum and optionally min and max of values by group code.
+
+    Both engines add values in the same order, so their results are identical.
+
+    Args:
+        codes: Group codes (array of typecode "I").
+        values: Values (array of typecode "d").
+        groups: Number of groups, every code must be less than it.
+        engine: "python" or "numpy".
+        extremes: Also compute min and max of every group.
+
+    Returns:
+        GroupStats with lists of length groups.
+    """
+
+    if engine == "numpy":
+        return _group_stats_numpy(codes, values, groups, extremes)
+    return _group_stats_python(codes, values, groups, extremes)
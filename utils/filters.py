@@ -0,0 +1,250 @@
+import operator
+import re
+from array import array
+from dataclasses import dataclass
+from itertools import compress
+from typing import Any, Callable, Sequence
+
+from .columns import Categorical, ColumnBatch
+
+# Operators comparing values as numbers
+NUMERIC_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Methods of the predicate number comparing it with values, reflected
+_NUMBER_TESTS = {
+    "<": "__gt__",
+    "<=": "__ge__",
+    ">": "__lt__",
+    ">=": "__le__",
+    "==": "__eq__",
+    "!=": "__ne__",
+}
+
+_COMPARISON_RE = re.compile(r"^\s*(.+?)\s*(<=|>=|!=|==|=|<|>)\s*(.*?)\s*$")
+_IN_RE = re.compile(r"^\s*(.+?)\s+in\s*\((.*)\)\s*$", re.IGNORECASE)
+
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) > 1 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
+
+
+def _number(value: str) -> float | None:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """Condition on a single column, e.g. price>500 or brand in (apple,samsung)."""
+
+    column: str
+    operator: str
+    values: tuple[str, ...]
+
+    @classmethod
+    def parse(cls, text: str) -> "Predicate":
+        """
+        Parses predicate like "price>500", "brand=apple" or
+        "brand in (apple,samsung)".
+
+        Supported operators are =, ==, !=, <, <=, >, >= and in. Values may be
+        quoted. <, <=, > and >= compare numbers, = and != compare numbers if
+        value is a number and strings otherwise.
+
+        Raises:
+            ValueError: If predicate is invalid.
+        """
+
+        match = _IN_RE.match(text)
+        if match is not None:
+            column, values = match.groups()
+            values = tuple(_unquote(value) for value in values.split(","))
+            return cls(column, "in", values)
+
+        match = _COMPARISON_RE.match(text)
+        if match is None or not match.group(3):
+            raise ValueError(f"Invalid filter '{text}'.")
+
+        column, op, value = match.groups()
+        value = _unquote(value)
+        if op in NUMERIC_OPERATORS and _number(value) is None:
+            raise ValueError(f"Value of filter '{text}' must be a number.")
+        return cls(column, "==" if op == "=" else op, (value,))
+
+    def __str__(self) -> str:
+        if self.operator == "in":
+            return f"{self.column} in ({','.join(self.values)})"
+        return f"{self.column}{self.operator}{self.values[0]}"
+
+    def number_test(self) -> Callable[[float], bool] | None:
+        """
+        Returns function checking a value converted to float, or None if
+        values are compared as strings.
+        """
+
+        number = _number(self.values[0])
+        if self.operator == "in" or number is None:
+            return None
+        # Bound method of float, so checks don't run any Python code
+        return getattr(number, _NUMBER_TESTS[self.operator])
+
+    def compile(self) -> Callable[[Any], bool]:
+        """
+        Returns function checking a single value.
+
+        Values may be strings, bytes (compared without decoding) or numbers.
+        Values that aren't numbers never pass numeric comparisons.
+        """
+
+        test = self.number_test()
+        if test is not None:
+            invalid = self.operator == "!="
+
+            def check(value: Any) -> bool:
+                try:
+                    return test(float(value))
+                except ValueError:
+                    return invalid
+
+            return check
+
+        # Bytes are matched without decoding, numbers match numeric columns
+        allowed = frozenset(self.values)
+        allowed |= frozenset(value.encode("utf-8") for value in self.values)
+        allowed |= frozenset(
+            number for number in map(_number, self.values) if number is not None
+        )
+        if self.operator == "!=":
+            return lambda value: value not in allowed
+        return allowed.__contains__
+
+    def may_match_range(self, low: float, high: float) -> bool:
+        """
+        Tells whether some number from low to high may pass the predicate.
+
+        Used to skip files by statistics of their numeric columns.
+        """
+
+        number = _number(self.values[0])
+        if self.operator == "in" or number is None:
+            return True
+        if self.operator in NUMERIC_OPERATORS:
+            bound = high if self.operator in (">", ">=") else low
+            return NUMERIC_OPERATORS[self.operator](bound, number)
+        if self.operator == "==":
+            return low <= number <= high
+        return not low == high == number
+
+
+class RowFilter:
+    """Predicates compiled against a header, all of them have to pass."""
+
+    def __init__(self, predicates: Sequence[Predicate], header: list[str]):
+        """
+        Args:
+            predicates: Predicates of the filter.
+            header: CSV header.
+
+        Raises:
+            KeyError: If header has no column of some predicate.
+        """
+
+        for predicate in predicates:
+            if predicate.column not in header:
+                raise KeyError(predicate.column)
+
+        self.checks = [
+            (
+                header.index(predicate.column),
+                predicate.compile(),
+                predicate.number_test(),
+            )
+            for predicate in predicates
+        ]
+
+        if len(self.checks) == 1:
+            index, check, _ = self.checks[0]
+            self.match = lambda row: check(row[index])
+        else:
+            self.match = self._match
+
+    def _match(self, row: Sequence[Any]) -> bool:
+        for index, check, _ in self.checks:
+            if not check(row[index]):
+                return False
+        return True
+
+    def __call__(self, row: Sequence[Any]) -> bool:
+        """Checks values of a single record."""
+
+        return self.match(row)
+
+    def mask(self, column: Callable[[int], Sequence[Any]]) -> list[bool]:
+        """
+        Checks many records column by column.
+
+        Category columns are checked once per category and numeric
+        predicates convert the whole column at once, unless some of its
+        values aren't numbers.
+
+        Args:
+            column: Function returning values of a column by its header index.
+
+        Returns:
+            List telling which records pass.
+        """
+
+        mask = None
+        for index, check, test in self.checks:
+            values = column(index)
+            if isinstance(values, Categorical):
+                matches = list(map(check, values.categories))
+                passed = list(map(matches.__getitem__, values.codes))
+            elif test is not None:
+                try:
+                    passed = list(map(test, map(float, values)))
+                except ValueError:
+                    passed = list(map(check, values))
+            else:
+                passed = list(map(check, values))
+            mask = passed if mask is None else list(map(operator.and_, mask, passed))
+        return mask
+
+
+def _compress_array(values: array | memoryview, mask: list[bool]) -> array:
+    typecode = values.typecode if isinstance(values, array) else values.format
+    return array(typecode, compress(values, mask))
+
+
+def filter_batch(batch: ColumnBatch, mask: list[bool], names: list[str]) -> ColumnBatch:
+    """
+    Returns batch of records passing the filter.
+
+    Args:
+        batch: Column batch.
+        mask: Records of the batch that pass.
+        names: Columns to keep.
+
+    Returns:
+        New batch with copies of kept columns.
+    """
+
+    columns = {}
+    for name in names:
+        values = batch.columns[name]
+        if isinstance(values, Categorical):
+            codes = _compress_array(values.codes, mask)
+            columns[name] = Categorical(codes, values.categories)
+        else:
+            columns[name] = _compress_array(values, mask)
+    return ColumnBatch(sum(mask), columns)
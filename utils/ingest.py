@@ -0,0 +1,144 @@
+import asyncio
+from concurrent.futures import Executor
+from pathlib import Path
+
+from .logger import get_logger
+from .pipeline import CHUNK_MIN_SIZE, FileScan, scan_file
+from .reports import IncrementalReport
+
+logger = get_logger(__name__)
+
+# Files larger than this aren't read in advance, workers stream them instead
+READ_AHEAD_MAX_SIZE = CHUNK_MIN_SIZE
+
+
+def _read_file(file: Path) -> bytes | None:
+    """Reads small file content, None if it should be streamed by worker."""
+
+    try:
+        if file.stat().st_size > READ_AHEAD_MAX_SIZE:
+            return None
+        return file.read_bytes()
+    except OSError:
+        # scan_file reports missing and unreadable files on its own
+        return None
+
+
+async def _read_files(
+    files: list[Path], queue: asyncio.Queue, concurrency: int
+) -> None:
+    """
+    Reads files in threads and puts their content to the queue.
+
+    A reader keeps its concurrency slot until the queue accepts its file,
+    so no more than concurrency + queue size files are held in memory.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def read(index: int, file: Path) -> None:
+        async with semaphore:
+            data = await asyncio.to_thread(_read_file, file)
+            await queue.put((index, file, data))
+
+    await asyncio.gather(*(read(index, file) for index, file in enumerate(files)))
+
+
+async def ingest_files_async(
+    files: list[Path],
+    report: IncrementalReport,
+    executor: Executor,
+    jobs: int = 1,
+    concurrency: int = 8,
+    read_ahead: int = 4,
+) -> list[FileScan]:
+    """
+    Overlaps reading of many files with parsing them in a worker pool.
+
+    Up to concurrency files are read at once, up to read_ahead of them wait
+    for a free worker and up to jobs of them are parsed. Readers are blocked
+    while parsing falls behind, which keeps memory bounded.
+
+    Args:
+        files: Paths to CSV files.
+        report: Report to aggregate rows with.
+        executor: Pool parsing file contents.
+        jobs: Maximum number of files parsed at once.
+        concurrency: Maximum number of files read at once.
+        read_ahead: Maximum number of read files waiting for parsing.
+
+    Returns:
+        FileScan for every file, in the order of files.
+    """
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=read_ahead)
+    reading = asyncio.create_task(_read_files(files, queue, concurrency))
+    scans: list[FileScan | None] = [None] * len(files)
+    parsing: set[asyncio.Future] = set()
+
+    async def parse(index: int, file: Path, data: bytes | None) -> None:
+        scans[index] = await loop.run_in_executor(
+            executor, scan_file, file, report, data
+        )
+
+    try:
+        for _ in files:
+            # Take next file from the queue only when a worker is free
+            if len(parsing) >= jobs:
+                done, parsing = await asyncio.wait(
+                    parsing, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()
+            index, file, data = await queue.get()
+            parsing.add(asyncio.ensure_future(parse(index, file, data)))
+
+        if parsing:
+            await asyncio.gather(*parsing)
+        await reading
+    finally:
+        reading.cancel()
+        for task in parsing:
+            task.cancel()
+
+    return scans
+
+
+def ingest_files(
+    files: list[Path],
+    report: IncrementalReport,
+    jobs: int = 1,
+    concurrency: int = 8,
+    read_ahead: int = 4,
+) -> list[FileScan]:
+    """
+    Scans files with asyncio ingestion pipeline (see ingest_files_async).
+
+    Meant for slow or network storage, where opening and reading files takes
+    longer than parsing them.
+
+    Returns:
+        FileScan for every file, in the order of files.
+    """
+
+    if not files:
+        return []
+
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=jobs)
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=1)
+
+    logger.info(
+        f"Ingesting {len(files)} files reading {concurrency} at once "
+        f"with {jobs} parsing workers"
+    )
+    with executor:
+        return asyncio.run(
+            ingest_files_async(files, report, executor, jobs, concurrency, read_ahead)
+        )
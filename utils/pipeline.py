@@ -0,0 +1,422 @@
+import time
+from dataclasses import dataclass, field, replace
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from .logger import get_logger
+from .profiling import Profiler, StageRecord, cpu_time, peak_rss
+from .reports import IncrementalReport
+from .shortcuts import CsvReader, CsvValidationError, NumericParseError, RowError
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    from .cache import ReportCache
+    from .checkpoint import CheckpointStore
+
+logger = get_logger(__name__)
+
+# Files smaller than this are parsed by a single worker
+CHUNK_MIN_SIZE = 64 * 1024 * 1024
+
+
+@dataclass
+class FileScan:
+    """Result of aggregating single file into report state."""
+
+    file: Path
+    state: Any = None
+    rows_count: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    error: str | None = None
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_rss: int = 0
+    cached: bool = False
+
+    def stage_record(self) -> StageRecord:
+        """Returns profiler record of the scan."""
+
+        return StageRecord(
+            "scan",
+            str(self.file),
+            self.wall_time,
+            self.cpu_time,
+            self.rows_count,
+            self.peak_rss,
+            self.cached,
+        )
+
+
+def timed(func: Callable[..., FileScan]) -> Callable[..., FileScan]:
+    """Decorator storing wall time, CPU time and peak RSS in returned scan."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> FileScan:
+        wall_start = time.perf_counter()
+        cpu_start = cpu_time()
+        scan = func(*args, **kwargs)
+        scan.wall_time = time.perf_counter() - wall_start
+        scan.cpu_time = cpu_time() - cpu_start
+        scan.peak_rss = peak_rss()
+        return scan
+
+    return wrapper
+
+
+@timed
+def scan_file(
+    file: Path, report: IncrementalReport, data: bytes | None = None
+) -> FileScan:
+    """
+    Stream file rows into a fresh report state.
+
+    Reports declaring columns get column batches, others get row dictionaries.
+
+    Args:
+        file: Path to CSV file.
+        report: Report to aggregate rows with.
+        data: File content read in advance, None to read the file.
+
+    Returns:
+        FileScan with partial report state. If file can't be read,
+        error is set and state is None.
+    """
+
+    reader = CsvReader(file, data, report.where)
+    state = report.init_state()
+
+    try:
+        if report.columns:
+            for batch in reader.stream_columns(report.columns):
+                report.update_batch(state, batch)
+        else:
+            for row in reader.stream_csv():
+                report.update(state, row)
+    except CsvValidationError as e:
+        return FileScan(file, errors=reader.errors, error=str(e))
+
+    return FileScan(file, state, reader.rows_count, reader.errors)
+
+
+@dataclass
+class RangeScan(FileScan):
+    """Result of aggregating byte range of a file."""
+
+    records_count: int = 0
+    lines_count: int = 0
+    # Quoted field state at range start and end (see CsvReader.head_inside)
+    head_inside: tuple[bool, bool] = (False, True)
+    end_inside: tuple[bool, bool] = (False, True)
+    # Conversion error deferred until range start is known to be right
+    exception: ValueError | None = None
+
+
+@timed
+def scan_range(
+    file: Path,
+    start: int,
+    end: int,
+    header: list[str],
+    report: IncrementalReport,
+    exact_start: bool = False,
+) -> RangeScan:
+    """
+    Stream rows of a byte range into a fresh report state.
+
+    Args:
+        file: Path to CSV file.
+        start: Range start offset.
+        end: Range end offset.
+        header: CSV header.
+        report: Report to aggregate rows with.
+        exact_start: Range start is known to be a record boundary.
+
+    Returns:
+        RangeScan with partial report state and quoted field states at its start and end.
+
+    Raises:
+        ValueError: If some value can't be converted and range starts
+            at a record boundary. Otherwise the error is stored in the scan
+            and raised by join_ranges, as it may only come from a wrong start.
+    """
+
+    reader = CsvReader(file, where=report.where)
+    state = report.init_state()
+
+    try:
+        if report.columns:
+            batches = reader.stream_columns(
+                report.columns,
+                byte_range=(start, end),
+                header=header,
+                exact_start=exact_start,
+            )
+            for batch in batches:
+                report.update_batch(state, batch)
+        else:
+            for row in reader.stream_range(start, end, header, exact_start=exact_start):
+                report.update(state, row)
+    except CsvValidationError as e:
+        return RangeScan(file, errors=reader.errors, error=str(e))
+    except ValueError as e:
+        if exact_start:
+            raise
+        return RangeScan(
+            file,
+            errors=reader.errors,
+            lines_count=reader.lines_count,
+            head_inside=reader.head_inside,
+            exception=e,
+        )
+
+    return RangeScan(
+        file,
+        state,
+        reader.rows_count,
+        reader.errors,
+        records_count=reader.records_count,
+        lines_count=reader.lines_count,
+        head_inside=reader.head_inside,
+        end_inside=reader.end_inside,
+    )
+
+
+def join_ranges(
+    file: Path, header_lines: int, scans: list[RangeScan], report: IncrementalReport
+) -> FileScan | None:
+    """
+    Merge range scans of a single file.
+
+    Every range (except the first one) was parsed assuming its start was
+    moved to a newline outside of quotes. Quoted field states at ends
+    of previous ranges tell whether that was true.
+
+    Args:
+        file: Path to CSV file.
+        header_lines: Number of lines taken by the header.
+        scans: Range scans in file order.
+        report: Report used for scanning.
+
+    Returns:
+        FileScan for the whole file, or None if some range start was inside
+        a quoted field and file has to be scanned sequentially.
+
+    Raises:
+        ValueError: If some value of a correctly split range can't be
+            converted.
+    """
+
+    inside = False
+    for scan in scans:
+        if scan.head_inside[inside]:
+            return None
+        if scan.exception is not None:
+            # Range end wasn't reached, but the start of this range is
+            # right, so sequential scan would fail here as well
+            break
+        inside = scan.end_inside[inside]
+
+    state = report.init_state()
+    rows_count = 0
+    records_count = 0
+    errors = []
+    line = header_lines
+
+    for scan in scans:
+        errors.extend(replace(error, line=error.line + line) for error in scan.errors)
+        if scan.error:
+            return FileScan(file, errors=errors, error=scan.error)
+        if isinstance(scan.exception, NumericParseError):
+            raise NumericParseError(
+                [
+                    (error_line + line, value)
+                    for error_line, value in scan.exception.bad_values
+                ]
+            )
+        if scan.exception is not None:
+            raise scan.exception
+
+        state = report.merge(state, scan.state)
+        rows_count += scan.rows_count
+        records_count += scan.records_count
+        line += scan.lines_count
+
+    if records_count == 0:
+        return FileScan(file, errors=errors, error=f"CSV file {file} is empty!")
+
+    return FileScan(
+        file,
+        state,
+        rows_count,
+        errors,
+        wall_time=max(scan.wall_time for scan in scans),
+        cpu_time=sum(scan.cpu_time for scan in scans),
+        peak_rss=max(scan.peak_rss for scan in scans),
+    )
+
+
+def _submit_file(
+    executor: "ProcessPoolExecutor",
+    file: Path,
+    report: IncrementalReport,
+    jobs: int,
+) -> tuple[int, list["Future"]]:
+    """
+    Submit file to executor as a whole or as byte ranges if it's large.
+
+    Returns:
+        Number of header lines (0 for a whole file) and list of futures.
+    """
+
+    # Compressed and columnar files aren't split
+    if (
+        file.suffix == ".csv"
+        and file.is_file()
+        and file.stat().st_size >= CHUNK_MIN_SIZE
+    ):
+        reader = CsvReader(file)
+        try:
+            header, data_start = reader.read_header()
+        except CsvValidationError:
+            pass
+        else:
+            ranges = reader.split_ranges(data_start, jobs)
+            logger.info(f"Splitting {file} into {len(ranges)} byte ranges")
+            return reader.lines_count, [
+                executor.submit(
+                    scan_range, file, start, end, header, report, start == data_start
+                )
+                for start, end in ranges
+            ]
+
+    return 0, [executor.submit(scan_file, file, report)]
+
+
+def scan_files(
+    files: list[Path], report: IncrementalReport, jobs: int = 1
+) -> Iterator[FileScan]:
+    """
+    Scan files one by one or in a pool of processes.
+
+    Only partial report states are sent back from worker processes,
+    rows never leave the process that parsed them. Files larger than
+    CHUNK_MIN_SIZE are split into byte ranges parsed by separate workers.
+
+    Args:
+        files: Paths to CSV files.
+        report: Report to aggregate rows with.
+        jobs: Number of worker processes.
+
+    Yields:
+        FileScan for every file, in the order of files.
+    """
+
+    if jobs <= 1:
+        for file in files:
+            yield scan_file(file, report)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    logger.info(f"Scanning {len(files)} files with {jobs} processes")
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        submitted = [
+            (file, *_submit_file(executor, file, report, jobs)) for file in files
+        ]
+
+        for file, header_lines, futures in submitted:
+            if header_lines == 0:
+                yield futures[0].result()
+                continue
+
+            scan = join_ranges(
+                file, header_lines, [future.result() for future in futures], report
+            )
+            if scan is None:
+                logger.warning(
+                    f"Range boundary of {file} is inside quoted field, "
+                    "scanning it sequentially"
+                )
+                scan = scan_file(file, report)
+            yield scan
+
+
+def aggregate_files(
+    files: list[Path],
+    report: IncrementalReport,
+    jobs: int = 1,
+    cache: "ReportCache | None" = None,
+    report_name: str = "",
+    profiler: Profiler | None = None,
+    io_concurrency: int = 0,
+    read_ahead: int = 4,
+    checkpoints: "CheckpointStore | None" = None,
+) -> tuple[Any, int]:
+    """
+    Aggregate all files into a single report state.
+
+    Malformed rows and unreadable files are logged as warnings and skipped.
+    States of unchanged files are taken from cache and new ones are stored.
+
+    Args:
+        files: Paths to CSV files.
+        report: Report to aggregate rows with.
+        jobs: Number of worker processes.
+        cache: Cache of per-file states, None to always parse files.
+        report_name: Report name used in cache keys.
+        profiler: Profiler to add per-file scan timings to.
+        io_concurrency: Read up to this number of files concurrently with
+            asyncio (see ingest_files), 0 to read them in workers.
+        read_ahead: Number of files read in advance when io_concurrency is set.
+        checkpoints: Checkpoints of append-only files, only data appended
+            since the last run is parsed for them. Cache isn't used for them.
+
+    Returns:
+        Merged report state and number of aggregated rows.
+    """
+
+    scans: dict[Path, FileScan] = {}
+    if checkpoints is not None:
+        for file in files:
+            scan = checkpoints.scan(file, report, report_name)
+            if scan is not None:
+                scans[file] = scan
+
+    if cache is not None:
+        for file in files:
+            if file in scans:
+                continue
+            scan = cache.get(file, report_name)
+            if scan is not None:
+                scans[file] = scan
+
+    missing = [file for file in files if file not in scans]
+    if io_concurrency:
+        from .ingest import ingest_files
+
+        new_scans = ingest_files(missing, report, jobs, io_concurrency, read_ahead)
+    else:
+        new_scans = scan_files(missing, report, jobs)
+
+    for scan in new_scans:
+        scans[scan.file] = scan
+        if cache is not None and scan.error is None:
+            cache.put(scan, report_name)
+
+    state = report.init_state()
+    rows_count = 0
+
+    for scan in (scans[file] for file in files):
+        if profiler is not None:
+            profiler.add(scan.stage_record())
+        for error in scan.errors:
+            logger.warning(error)
+        if scan.error:
+            logger.warning(scan.error)
+            continue
+        state = report.merge(state, scan.state)
+        rows_count += scan.rows_count
+
+    return state, rows_count
@@ -0,0 +1,158 @@
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+from .logger import get_logger
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+logger = get_logger(__name__)
+
+
+def peak_rss() -> int:
+    """Returns peak resident set size of the process and its children in bytes."""
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) * scale
+
+
+def cpu_time() -> float:
+    """Returns CPU time of the process and its finished children in seconds."""
+
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+@dataclass
+class StageRecord:
+    """Timings of a single stage of report run."""
+
+    stage: str
+    file: str | None = None
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    rows: int = 0
+    peak_rss: int = 0
+    cached: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.wall_time if self.wall_time else 0.0
+
+
+class Profiler:
+    """Collects per-stage and per-file timings of report run."""
+
+    def __init__(self):
+        self.records: list[StageRecord] = []
+
+    @contextmanager
+    def stage(self, name: str, file: str | None = None) -> Iterator[StageRecord]:
+        """
+        Measures block of code as a stage.
+
+        Args:
+            name: Stage name.
+            file: File the stage is working on.
+
+        Yields:
+            StageRecord, rows can be set on it inside the block.
+        """
+
+        record = StageRecord(name, file)
+        wall_start = time.perf_counter()
+        cpu_start = cpu_time()
+        try:
+            yield record
+        finally:
+            record.wall_time = time.perf_counter() - wall_start
+            record.cpu_time = cpu_time() - cpu_start
+            record.peak_rss = peak_rss()
+            self.records.append(record)
+
+    def add(self, record: StageRecord) -> None:
+        """Adds stage measured elsewhere, e.g. in a worker process."""
+
+        self.records.append(record)
+
+    def to_dict(self) -> dict:
+        """Returns machine-readable trace."""
+
+        return {
+            "peak_rss": peak_rss(),
+            "stages": [
+                {**asdict(record), "rows_per_second": record.rows_per_second}
+                for record in self.records
+            ],
+        }
+
+    def write_trace(self, path: Path) -> None:
+        """Writes trace to JSON file."""
+
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        logger.info(f"Profile trace written to {path}")
+
+    def create_table(self) -> "Table":
+        """Creates rich table with summary of all stages."""
+
+        from rich import box
+        from rich.table import Table
+
+        table = Table(title="Profile", box=box.ROUNDED)
+        for header in (
+            "stage",
+            "file",
+            "wall, s",
+            "cpu, s",
+            "rows",
+            "rows/s",
+            "peak rss, MiB",
+        ):
+            table.add_column(header, style="cyan", no_wrap=True)
+
+        for record in self.records:
+            table.add_row(
+                record.stage,
+                (record.file or "") + (" (cached)" if record.cached else ""),
+                f"{record.wall_time:.3f}",
+                f"{record.cpu_time:.3f}",
+                str(record.rows or ""),
+                f"{record.rows_per_second:,.0f}" if record.rows else "",
+                f"{record.peak_rss / 1024 / 1024:.1f}" if record.peak_rss else "",
+            )
+        return table
+
+
+@contextmanager
+def profile_calls(path: Path | None) -> Iterator[None]:
+    """
+    Runs block of code under cProfile and dumps pstats file.
+
+    Args:
+        path: Output file, profiling is disabled if None.
+    """
+
+    if path is None:
+        yield
+        return
+
+    import cProfile
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+        logger.info(f"Profile stats written to {path}")
@@ -1,9 +1,16 @@
+import heapq
+import importlib
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from typing import Any
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
+from .columns import ColumnBatch
+from .engines import group_stats
 from .logger import get_logger
-from .shortcuts import convert_to_number, is_numeric
+from .shortcuts import convert_to_number
+
+if TYPE_CHECKING:
+    from .filters import Predicate
 
 logger = get_logger(__name__)
 
@@ -11,6 +18,10 @@ logger = get_logger(__name__)
 class BaseReport(ABC):
     """Base report class."""
 
+    # Column rows returned by generate are sorted by (desc), if any, so that
+    # worst rows can be listed with ties in the same order as best ones
+    sort_column: str | None = None
+
     @abstractmethod
     def generate(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """
@@ -26,43 +37,394 @@ class BaseReport(ABC):
         raise NotImplementedError
 
 
-class AverageRatingReport(BaseReport):
-    """Reports average ratings by brand."""
+class IncrementalReport(BaseReport):
+    """
+    Base class for reports aggregated row by row.
 
-    def generate(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    Report state is created with init_state, updated with every row, merged
+    with states built from other files and turned into report with finalize.
+    States should be small and picklable, so they can be built anywhere and
+    merged later.
+
+    Reports that declare columns they need also implement update_batch and
+    get typed column batches instead of row dictionaries.
+    """
+
+    # Column names mapped to their kind (see COLUMN_TYPECODES)
+    columns: dict[str, str] = {}
+    # Engine used by update_batch (see ENGINES)
+    engine: str = "python"
+    # Predicates rows have to pass, checked while parsing (see Predicate)
+    where: tuple["Predicate", ...] = ()
+
+    @abstractmethod
+    def init_state(self) -> Any:
+        """
+        Create empty report state.
+
+        Returns:
+            New state object.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def update(self, state: Any, row: dict[str, Any]) -> None:
+        """
+        Add single row to the state.
+
+        Args:
+            state: Report state.
+            row: Dictionary with row data.
+        """
+
+        raise NotImplementedError
+
+    def update_batch(self, state: Any, batch: ColumnBatch) -> None:
         """
-        Generate report with brands avg rating from products data.
+        Add batch of rows loaded column by column to the state.
 
         Args:
-            data: List of dictionaries with products data.
+            state: Report state.
+            batch: Batch with columns declared in the columns attribute.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def merge(self, state: Any, other: Any) -> Any:
+        """
+        Merge two report states.
+
+        Args:
+            state: Report state, may be modified.
+            other: Report state to merge into the first one.
 
         Returns:
-            List of dictionaries with brands and their avf ratings,
-            sorted by rating(desc).
+            Merged state.
         """
 
-        logger.info(f"Generating average rating report for {len(data)} products")
+        raise NotImplementedError
 
-        brand_ratings = defaultdict(list)
+    @abstractmethod
+    def finalize(
+        self, state: Any, limit: int | None = None, ascending: bool = False
+    ) -> list[dict[str, Any]]:
+        """
+        Build report from the state.
 
-        for product in data:
-            brand = product["brand"]
-            rating = product["rating"]
+        Args:
+            state: Report state.
+            limit: Return only first limit rows of the report.
+            ascending: Return rows in reverse order, i.e. worst groups first.
 
-            try:
-                is_numeric(rating)
-            except ValueError as e:
-                raise ValueError(e)
+        Returns:
+            List of dictionaries for further operations.
+        """
 
-            rating = convert_to_number(product["rating"])
-            brand_ratings[brand].append(rating)
+        raise NotImplementedError
 
-        report_data = []
-        for brand, ratings in brand_ratings.items():
-            avg_rating = sum(ratings) / len(ratings)
-            report_data.append({"brand": brand, "rating": round(avg_rating, 2)})
+    def generate(self, data: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Generate report from data in a single pass.
 
-        report_data.sort(key=lambda x: x["rating"], reverse=True)
+        Args:
+            data: Iterable of dictionaries with some data.
+
+        Returns:
+            List of dictionaries for further operations.
+        """
+
+        state = self.init_state()
+        for row in data:
+            self.update(state, row)
+        return self.finalize(state)
+
+
+class MaterializedReport(IncrementalReport):
+    """
+    Adapts plain BaseReport to incremental protocol by collecting rows.
+
+    Plain reports only return rows sorted their own way, best first. Worst
+    rows first are sorted again by sort_column of the report if it declares
+    one, so that tied rows keep their order, as with select_rows. Otherwise
+    rows are just reversed.
+    """
+
+    def __init__(self, report: BaseReport):
+        self.report = report
+
+    def init_state(self) -> list[dict[str, Any]]:
+        return []
+
+    def update(self, state: list[dict[str, Any]], row: dict[str, Any]) -> None:
+        state.append(row)
+
+    def merge(
+        self, state: list[dict[str, Any]], other: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        state.extend(other)
+        return state
+
+    def finalize(
+        self,
+        state: list[dict[str, Any]],
+        limit: int | None = None,
+        ascending: bool = False,
+    ) -> list[dict[str, Any]]:
+        report_data = self.report.generate(state)
+        if not ascending:
+            return report_data[:limit]
+
+        column = self.report.sort_column
+        if column is None:
+            report_data.reverse()
+            return report_data[:limit]
+        return select_rows(report_data, itemgetter(column), limit, ascending=True)
+
+
+def select_rows(
+    rows: Iterable[dict[str, Any]],
+    key: Callable[[dict[str, Any]], Any],
+    limit: int | None = None,
+    ascending: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Sort rows by key, descending unless ascending is set.
+
+    With limit only limit rows are kept in a heap, which is O(n log limit)
+    instead of sorting all rows. Rows with equal keys keep their order
+    in both cases.
+
+    Args:
+        rows: Report rows.
+        key: Function returning sort key of a row.
+        limit: Number of rows to return, None for all rows.
+        ascending: Sort in ascending order.
+
+    Returns:
+        Sorted rows.
+    """
+
+    if limit is not None:
+        select = heapq.nsmallest if ascending else heapq.nlargest
+        return select(limit, rows, key=key)
+    return sorted(rows, key=key, reverse=not ascending)
+
+
+def as_incremental(report: BaseReport) -> IncrementalReport:
+    """
+    Return incremental version of report.
+
+    Args:
+        report: Report instance.
+
+    Returns:
+        Report itself if it's incremental, otherwise MaterializedReport wrapper.
+    """
+
+    if isinstance(report, IncrementalReport):
+        return report
+    return MaterializedReport(report)
+
+
+class MultiReport(IncrementalReport):
+    """
+    Aggregates several reports in a single scan.
+
+    State is a list of states of all reports, so every row (or column batch)
+    is parsed once and dispatched to all of them. Column batches are used
+    only if every report declares its columns and their kinds agree,
+    otherwise all reports get row dictionaries.
+    """
+
+    def __init__(self, reports: dict[str, IncrementalReport]):
+        """
+        Args:
+            reports: Report names mapped to incremental reports.
+        """
+
+        self.reports = reports
+
+        columns: dict[str, str] = {}
+        for report in reports.values():
+            if not report.columns or any(
+                columns.setdefault(name, kind) != kind
+                for name, kind in report.columns.items()
+            ):
+                columns = {}
+                break
+        self.columns = columns
+
+    @property
+    def engine(self) -> str:
+        return next(iter(self.reports.values())).engine
+
+    @engine.setter
+    def engine(self, engine: str) -> None:
+        for report in self.reports.values():
+            report.engine = engine
+
+    def init_state(self) -> list[Any]:
+        return [report.init_state() for report in self.reports.values()]
+
+    def update(self, state: list[Any], row: dict[str, Any]) -> None:
+        for report, report_state in zip(self.reports.values(), state):
+            report.update(report_state, row)
+
+    def update_batch(self, state: list[Any], batch: ColumnBatch) -> None:
+        for report, report_state in zip(self.reports.values(), state):
+            report.update_batch(report_state, batch)
+
+    def merge(self, state: list[Any], other: list[Any]) -> list[Any]:
+        for index, report in enumerate(self.reports.values()):
+            state[index] = report.merge(state[index], other[index])
+        return state
+
+    def finalize_reports(
+        self, state: list[Any], limit: int | None = None, ascending: bool = False
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Build every report from the state.
+
+        Args:
+            state: Report state.
+            limit: Return only first limit rows of every report.
+            ascending: Return rows in reverse order, i.e. worst groups first.
+
+        Returns:
+            Report names mapped to their rows.
+        """
+
+        return {
+            name: report.finalize(report_state, limit, ascending)
+            for (name, report), report_state in zip(self.reports.items(), state)
+        }
+
+    def finalize(
+        self, state: list[Any], limit: int | None = None, ascending: bool = False
+    ) -> list[dict[str, Any]]:
+        """
+        Build rows of all reports, each with report name in "report" key.
+        """
+
+        return [
+            {"report": name, **row}
+            for name, rows in self.finalize_reports(state, limit, ascending).items()
+            for row in rows
+        ]
+
+
+class AverageRatingReport(IncrementalReport):
+    """Reports average ratings by brand."""
+
+    columns = {"brand": "category", "rating": "float"}
+
+    def init_state(self) -> dict[str, list[int | float]]:
+        """
+        Create empty state.
+
+        Returns:
+            Dictionary with brands and their [ratings sum, ratings count].
+        """
+
+        return {}
+
+    def update(self, state: dict[str, list[int | float]], row: dict[str, Any]) -> None:
+        """
+        Add product rating to brand running sum and count.
+
+        Args:
+            state: Report state.
+            row: Dictionary with product data.
+        """
+
+        brand = row["brand"]
+        rating = convert_to_number(row["rating"])
+
+        totals = state.get(brand)
+        if totals is None:
+            state[brand] = [rating, 1]
+        else:
+            totals[0] += rating
+            totals[1] += 1
+
+    def update_batch(
+        self, state: dict[str, list[int | float]], batch: ColumnBatch
+    ) -> None:
+        """
+        Add batch ratings to brands running sums and counts.
+
+        Args:
+            state: Report state.
+            batch: Batch with brand and rating columns.
+        """
+
+        brands = batch.columns["brand"]
+        categories = brands.categories
+        stats = group_stats(
+            brands.codes, batch.columns["rating"], len(categories), self.engine
+        )
+
+        for code, count in enumerate(stats.counts):
+            if count:
+                self.merge(state, {categories[code]: [stats.sums[code], count]})
+
+    def merge(
+        self,
+        state: dict[str, list[int | float]],
+        other: dict[str, list[int | float]],
+    ) -> dict[str, list[int | float]]:
+        """
+        Merge brand totals of two states.
+
+        Args:
+            state: Report state, modified in place.
+            other: Report state to merge.
+
+        Returns:
+            Merged state.
+        """
+
+        for brand, (total, count) in other.items():
+            totals = state.get(brand)
+            if totals is None:
+                state[brand] = [total, count]
+            else:
+                totals[0] += total
+                totals[1] += count
+        return state
+
+    def finalize(
+        self,
+        state: dict[str, list[int | float]],
+        limit: int | None = None,
+        ascending: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Generate report with brands avg rating from state.
+
+        Args:
+            state: Report state.
+            limit: Return only limit best (or worst if ascending) brands.
+            ascending: Sort by rating(asc).
+
+        Returns:
+            List of dictionaries with brands and their avg ratings,
+            sorted by rating(desc).
+        """
+
+        logger.info(f"Generating average rating report for {len(state)} brands")
+
+        report_data = select_rows(
+            (
+                {"brand": brand, "rating": round(total / count, 2)}
+                for brand, (total, count) in state.items()
+            ),
+            itemgetter("rating"),
+            limit,
+            ascending,
+        )
 
         logger.info(f"Generated report with {len(report_data)} brands")
         return report_data
@@ -71,23 +433,48 @@ class AverageRatingReport(BaseReport):
 class ReportRegistry:
     """Registry of available reports."""
 
+    # Report classes or "module:ClassName" paths imported on first use
     _reports = {
-        "average-rating": AverageRatingReport,
+        "average-rating": "utils.reports:AverageRatingReport",
+        "brand-summary": "utils.aggregate:BrandSummaryReport",
+        "rating-percentiles": "utils.approx:RatingPercentilesReport",
+        "rating-tails": "utils.approx:RatingTailsReport",
+    }
+    # Bounded-memory approximate versions of reports, used in approx mode
+    _approx_reports = {
+        "average-rating": "utils.approx:ApproxAverageRatingReport",
+        "rating-percentiles": "utils.approx:RatingPercentilesReport",
+        "rating-tails": "utils.approx:RatingTailsReport",
     }
 
     @classmethod
-    def get_report(cls, report_name: str) -> BaseReport:
+    def _resolve(
+        cls, report_name: str, reports: dict[str, type[BaseReport] | str]
+    ) -> type[BaseReport]:
+        """Returns report class, importing its module if needed."""
+
+        report_class = reports[report_name]
+        if isinstance(report_class, str):
+            module_name, class_name = report_class.split(":")
+            report_class = getattr(importlib.import_module(module_name), class_name)
+            reports[report_name] = report_class
+        return report_class
+
+    @classmethod
+    def get_report(cls, report_name: str, approx: bool = False) -> BaseReport:
         """
         Return report class instance by name.
 
         Args:
             report_name: report name.
+            approx: Return approximate version of the report.
 
         Returns:
             Report class instance.
 
         Raises:
-            ValueError: If report name is not found.
+            ValueError: If report name is not found or report has
+                no approximate version.
         """
 
         logger.info(f"Requesting report: {report_name}")
@@ -99,8 +486,17 @@ class ReportRegistry:
             )
             raise ValueError(error_msg)
 
+        if approx:
+            if report_name not in cls._approx_reports:
+                raise ValueError(
+                    f"Report '{report_name}' has no approximate version. "
+                    f"Approximate reports: {', '.join(cls._approx_reports)}"
+                )
+            report = cls._resolve(report_name, cls._approx_reports)()
+        else:
+            report = cls._resolve(report_name, cls._reports)()
         logger.info(f"Successfully created report instance for: {report_name}")
-        return cls._reports[report_name]()
+        return report
 
     @classmethod
     def get_available_reports(cls) -> list[str]:
@@ -114,17 +510,41 @@ class ReportRegistry:
         return list(cls._reports)
 
     @classmethod
-    def register_report(cls, report_name: str, report_class: BaseReport) -> BaseReport:
+    def register_report(
+        cls,
+        report_name: str,
+        report_class: type[BaseReport] | str,
+        approx_class: type[BaseReport] | str | None = None,
+    ) -> type[BaseReport] | str:
         """
         Register report class.
 
         Args:
             report_name: report name.
-            report_class: report class.
+            report_class: report class, "module:ClassName" path to import
+                it from when report is requested or aggregate spec string
+                like "group_by=brand, agg=mean(rating)" (see aggregate_report).
+            approx_class: class (or path) of approximate version of report.
 
         Returns:
             Registered report class.
+
+        Raises:
+            ValueError: If spec or path is invalid.
         """
 
+        if isinstance(report_class, str):
+            if "group_by=" in report_class:
+                from .aggregate import aggregate_report
+
+                report_class = aggregate_report(report_class)
+            elif report_class.count(":") != 1:
+                raise ValueError(
+                    f"Invalid report path '{report_class}' for '{report_name}', "
+                    "expected 'module:ClassName' or aggregate spec."
+                )
+
         cls._reports[report_name] = report_class
+        if approx_class is not None:
+            cls._approx_reports[report_name] = approx_class
         return report_class
@@ -0,0 +1,303 @@
+import asyncio
+import pickle
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from .logger import get_logger
+from .pipeline import FileScan, scan_file
+from .reports import IncrementalReport, ReportRegistry, as_incremental
+
+logger = get_logger(__name__)
+
+DEFAULT_MEMORY_LIMIT = 512 * 1024 * 1024
+
+
+@dataclass
+class Dataset:
+    """Report state of a single file kept in server memory."""
+
+    scan: FileScan
+    size: int
+    mtime_ns: int
+    nbytes: int
+
+
+class ReportServer:
+    """
+    Local HTTP server generating reports from warm per-file states.
+
+    Every served file is parsed once per report and its state is kept in
+    memory until the file changes on disk. Least recently used states are
+    evicted when their estimated total size exceeds memory_limit.
+
+    Endpoints:
+        GET /health
+        GET /reports
+        GET /report?name=<report-name>[&files=<path>...][&top=N|&bottom=N]
+    """
+
+    def __init__(
+        self,
+        files: list[str],
+        jobs: int = 1,
+        engine: str = "python",
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    ):
+        self.files = [Path(file) for file in dict.fromkeys(files)]
+        self.jobs = jobs
+        self.engine = engine
+        self.memory_limit = memory_limit
+        self.reports: dict[str, IncrementalReport] = {}
+        self.datasets: OrderedDict[tuple[Path, str], Dataset] = OrderedDict()
+        self.locks: dict[tuple[Path, str], asyncio.Lock] = {}
+        self.executor = None
+
+    def get_report(self, report_name: str) -> IncrementalReport:
+        """
+        Returns warm report instance.
+
+        Raises:
+            ValueError: If report name is not found.
+        """
+
+        report = self.reports.get(report_name)
+        if report is None:
+            report = as_incremental(ReportRegistry.get_report(report_name))
+            report.engine = self.engine
+            self.reports[report_name] = report
+        return report
+
+    @property
+    def memory_used(self) -> int:
+        return sum(dataset.nbytes for dataset in self.datasets.values())
+
+    def evict(self) -> None:
+        """Drops least recently used states until they fit into memory_limit."""
+
+        while len(self.datasets) > 1 and self.memory_used > self.memory_limit:
+            (file, report_name), _ = self.datasets.popitem(last=False)
+            logger.info(f"Evicted {file} state of {report_name} report")
+
+    async def load(self, file: Path, report_name: str) -> FileScan:
+        """
+        Returns state of a file, parsing it if it's new or changed.
+
+        Args:
+            file: Path to CSV file.
+            report_name: Report name.
+
+        Returns:
+            FileScan of the file.
+        """
+
+        key = (file, report_name)
+        lock = self.locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            try:
+                stat = file.stat()
+            except OSError:
+                stat = None
+
+            dataset = self.datasets.get(key)
+            if (
+                dataset is not None
+                and stat is not None
+                and (dataset.size, dataset.mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+            ):
+                self.datasets.move_to_end(key)
+                return dataset.scan
+
+            loop = asyncio.get_running_loop()
+            scan = await loop.run_in_executor(
+                self.executor, scan_file, file, self.get_report(report_name)
+            )
+            if scan.error or stat is None:
+                self.datasets.pop(key, None)
+                return scan
+
+            logger.info(f"Loaded {file} state of {report_name} report")
+            nbytes = len(pickle.dumps(scan.state, pickle.HIGHEST_PROTOCOL))
+            self.datasets[key] = Dataset(scan, stat.st_size, stat.st_mtime_ns, nbytes)
+            self.datasets.move_to_end(key)
+            self.evict()
+            return scan
+
+    async def generate(
+        self,
+        report_name: str,
+        files: list[Path] | None = None,
+        limit: int | None = None,
+        ascending: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Generates report over served files.
+
+        Args:
+            report_name: Report name.
+            files: Subset of served files, all of them by default.
+            limit: Return only limit rows.
+            ascending: Return worst rows first.
+
+        Returns:
+            Dictionary with report rows, number of aggregated rows and errors.
+        """
+
+        report = self.get_report(report_name)
+        scans = await asyncio.gather(
+            *(self.load(file, report_name) for file in files or self.files)
+        )
+
+        state = report.init_state()
+        rows_count = 0
+        errors = []
+        for scan in scans:
+            errors.extend(str(error) for error in scan.errors)
+            if scan.error:
+                errors.append(scan.error)
+                continue
+            state = report.merge(state, scan.state)
+            rows_count += scan.rows_count
+
+        return {
+            "report": report_name,
+            "rows_count": rows_count,
+            "rows": report.finalize(state, limit, ascending) if rows_count else [],
+            "errors": errors,
+        }
+
+    async def handle_request(self, method: str, target: str) -> tuple[int, dict]:
+        """
+        Handles single HTTP request.
+
+        Args:
+            method: HTTP method.
+            target: Request target with query string.
+
+        Returns:
+            HTTP status code and JSON-serializable body.
+        """
+
+        if method != "GET":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Only GET is supported."}
+
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+
+        if url.path == "/health":
+            return HTTPStatus.OK, {
+                "status": "ok",
+                "datasets": len(self.datasets),
+                "memory_used": self.memory_used,
+            }
+
+        if url.path == "/reports":
+            return HTTPStatus.OK, {"reports": ReportRegistry.get_available_reports()}
+
+        if url.path != "/report":
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown path {url.path}"}
+
+        try:
+            report_name = query["name"][0]
+            files = [Path(file) for file in query.get("files", [])]
+            unknown = [str(file) for file in files if file not in self.files]
+            if unknown:
+                raise ValueError(f"Files aren't served: {', '.join(unknown)}")
+
+            limit = query.get("top") or query.get("bottom")
+            limit = int(limit[0]) if limit else None
+            return HTTPStatus.OK, await self.generate(
+                report_name, files, limit, ascending="bottom" in query
+            )
+        except KeyError:
+            return HTTPStatus.BAD_REQUEST, {"error": "Report name is required."}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Reads HTTP request from connection and writes JSON response."""
+
+        import json
+
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()).strip():
+                pass
+
+            if len(request_line) != 3:
+                status, body = HTTPStatus.BAD_REQUEST, {"error": "Bad request line."}
+            else:
+                status, body = await self.handle_request(*request_line[:2])
+        except Exception as e:
+            logger.error(e)
+            status, body = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            (
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + payload
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 8000, socket_path: Path | None = None
+    ) -> asyncio.AbstractServer:
+        """
+        Starts listening on TCP port or unix socket.
+
+        Returns:
+            Started asyncio server.
+        """
+
+        if self.jobs > 1 and self.executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+
+        if socket_path is not None:
+            server = await asyncio.start_unix_server(
+                self.handle_connection, path=socket_path
+            )
+            logger.info(f"Serving reports on unix socket {socket_path}")
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            address = server.sockets[0].getsockname()
+            logger.info(f"Serving reports on http://{address[0]}:{address[1]}")
+        return server
+
+    def close(self) -> None:
+        """Shuts down worker processes."""
+
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+async def serve(
+    server: ReportServer,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    socket_path: Path | None = None,
+) -> None:
+    """Serves reports until cancelled."""
+
+    async_server = await server.start(host, port, socket_path)
+    try:
+        async with async_server:
+            await async_server.serve_forever()
+    finally:
+        server.close()
@@ -1,70 +1,1090 @@
 import csv
+import io
+import logging
+import mmap
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate, compress, repeat
+from operator import not_
 from pathlib import Path
-from typing import Any
-
-from rich import box
-from rich.table import Table
+from typing import IO, TYPE_CHECKING, Any, Iterator, Sequence
 
+from .columns import COLUMN_TYPECODES, COLUMNAR_SUFFIX, Categorical, ColumnBatch
+from .compression import check_compression, get_compression, open_decompressed
+from .filters import Predicate, RowFilter, filter_batch
 from .logger import get_logger
 
+if TYPE_CHECKING:
+    from rich.table import Table
+
+    from .columnar import ColumnarFile
+
 logger = get_logger(__name__)
 
+# Suffix of keys with error bounds of estimated report values
+ERROR_SUFFIX = "_error"
+
+
+@dataclass(frozen=True)
+class RowError:
+    """Malformed CSV row found while streaming a file."""
+
+    file: Path
+    line: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.file}:{self.line}: {self.message}"
+
+
+class CsvValidationError(Exception):
+    """Raised when CSV file can't be read as a whole."""
+
+
+def _ends_in_quotes(
+    data: bytes | mmap.mmap, start: int = 0, end: int | None = None, inside=False
+) -> bool:
+    """
+    Tells whether data[start:end] ends inside a quoted field.
+
+    Follows csv module rules: quote only opens a quoted field at the start
+    of a field, elsewhere it's a part of the value (e.g. 55" TV), and two
+    quotes inside a quoted field are an escaped quote.
+
+    Args:
+        data: File data.
+        start: Offset to start at, byte before it is checked for field start.
+        end: Offset to stop at, None for the end of data.
+        inside: Whether start is inside a quoted field.
+    """
+
+    end = len(data) if end is None else end
+    position = data.find(b'"', start, end)
+    while position != -1:
+        if inside:
+            if position + 1 < end and data[position + 1] == 0x22:
+                position += 1
+            else:
+                inside = False
+        elif position == 0 or data[position - 1] in b",\r\n":
+            inside = True
+        position = data.find(b'"', position + 1, end)
+    return inside
+
+
+def _past_quotes(data: bytes, position: int) -> int:
+    """
+    Moves position past quotes right before it.
+
+    State of quoted fields isn't known between a quote and the next byte,
+    which may be an escaped quote, so ranges are checked after such runs.
+    """
+
+    while position < len(data) and data[position - 1] == 0x22:
+        position += 1
+    return position
+
 
 class CsvReader:
-    def __init__(self, file: Path):
+    max_errors = 100
+    # Column scans of larger files are done on memory-mapped file data
+    mmap_min_size = 16 * 1024 * 1024
+    mmap_block_size = 1024 * 1024
+
+    def __init__(
+        self, file: Path, data: bytes | None = None, where: Sequence[Predicate] = ()
+    ):
+        """
+        Args:
+            file: Path to CSV file.
+            data: File content read in advance, None to read the file.
+            where: Predicates rows have to pass, checked while parsing
+                before any dictionary or number is created.
+        """
+
         self.file = file
+        self.data = data
+        self.where = tuple(where)
+        self.row_filter: RowFilter | None = None
+        self.compression = get_compression(file)
+        self.errors: list[RowError] = []
+        self.errors_count = 0
+        self.filtered_count = 0
+        self.rows_count = 0
+        self.records_count = 0
+        self.lines_count = 0
+        # Quoted field state at range start and end (see _iter_range_lines)
+        self.head_inside = (False, True)
+        self.end_inside = (False, True)
+        self.header: list[str] | None = None
+        self.line = 0
 
-    @property
-    def check_csv_file(self) -> (bool, str):
-        logger.debug(f"Checking CSV file: {self.file}")
+    def _reset(self) -> None:
+        """Resets counters before reading file again."""
+
+        self.errors = []
+        self.errors_count = 0
+        self.filtered_count = 0
+        self.rows_count = 0
+        self.records_count = 0
+        self.lines_count = 0
+        self.head_inside = (False, True)
+        self.end_inside = (False, True)
+
+    def _check_path(self) -> None:
+        """
+        Checks that file exists and has CSV extension, optionally followed by
+        compression one (see COMPRESSIONS), or is a columnar file.
+
+        Raises:
+            CsvValidationError: If file can't be used as CSV source.
+        """
+
+        if self.data is None and not self.file.is_file():
+            raise CsvValidationError(f"File {self.file} does not exist!")
+
+        name = Path(self.file.stem) if self.compression else self.file
+        if name.suffix not in (".csv", COLUMNAR_SUFFIX):
+            raise CsvValidationError(f"File {self.file} is not a CSV file!")
+
+        if self.compression:
+            try:
+                check_compression(self.compression)
+            except ValueError as e:
+                raise CsvValidationError(f"File {self.file} can't be read! {e}") from e
+
+    def _open_binary(self) -> IO[bytes]:
+        """Opens file, or its content read in advance, decompressing it."""
+
+        f = open(self.file, "rb") if self.data is None else io.BytesIO(self.data)
+        if self.compression:
+            return open_decompressed(f, self.compression)
+        return f
+
+    def _open_text(self) -> IO[str]:
+        """Opens file, or its content read in advance, as text."""
+
+        if self.data is None and not self.compression:
+            return open(self.file, "r", encoding="utf-8", newline="")
+        return io.TextIOWrapper(self._open_binary(), encoding="utf-8", newline="")
+
+    def _row_filter(self, header: list[str]) -> RowFilter | None:
+        """
+        Compiles where predicates against header.
+
+        Raises:
+            CsvValidationError: If header has no column of some predicate.
+        """
+
+        if not self.where:
+            return None
+        try:
+            return RowFilter(self.where, header)
+        except KeyError as e:
+            raise CsvValidationError(f"CSV file {self.file} has no column {e}!") from e
+
+    def _add_error(self, line: int, message: str) -> None:
+        """Records malformed row, keeping at most max_errors of them."""
+
+        self.errors_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(RowError(self.file, line, message))
+
+    def _add_row_error(
+        self, row: list[str], header_count: int, line: int, strict: bool
+    ) -> None:
+        """
+        Records row with wrong number of columns.
+
+        Raises:
+            csv.Error: If strict is set.
+        """
+
+        message = f"Expected {header_count} columns, got {len(row)} in row: {row}"
+        if strict:
+            raise csv.Error(message)
+        self._add_error(line, message)
+
+    def _iter_rows(
+        self, reader, header_count: int, strict: bool
+    ) -> Iterator[list[str]]:
+        """
+        Validates column counts of csv.reader records.
+
+        Args:
+            reader: csv.reader positioned right after the header.
+            header_count: Number of columns in the header.
+            strict: Raise on the first malformed row instead of skipping it.
+
+        Yields:
+            Values of valid records.
+        """
+
+        match = self.row_filter.match if self.row_filter is not None else None
+        for row in reader:
+            if not row:
+                continue
+
+            self.records_count += 1
+            if len(row) != header_count:
+                self._add_row_error(row, header_count, reader.line_num, strict)
+                continue
+
+            if match is not None and not match(row):
+                self.filtered_count += 1
+                continue
+
+            self.rows_count += 1
+            self.line = reader.line_num
+            yield row
+
+    def _read_rows(
+        self,
+        strict: bool,
+        byte_range: tuple[int, int] | None = None,
+        header: list[str] | None = None,
+        exact_start: bool = False,
+    ) -> Iterator[list[str]]:
+        """
+        Reads valid records of the whole file or of a byte range.
+
+        Header is stored in self.header before the first record is yielded.
+
+        Args:
+            strict: Stop on the first malformed row.
+            byte_range: Start and end offsets, None for the whole file.
+            header: CSV header, required for byte ranges.
+            exact_start: Range start is known to be a record boundary.
+
+        Yields:
+            Values of valid records.
+
+        Raises:
+            CsvValidationError: If file is missing, empty or not a valid CSV.
+        """
+
+        self._reset()
+
+        try:
+            if byte_range is None:
+                self._check_path()
+                with self._open_text() as csvfile:
+                    reader = csv.reader(csvfile, delimiter=",")
+                    self.header = next(reader, None)
+                    if self.header is None:
+                        raise CsvValidationError(f"CSV file {self.file} is empty!")
+                    self.row_filter = self._row_filter(self.header)
+
+                    yield from self._iter_rows(reader, len(self.header), strict)
+
+                if self.records_count == 0:
+                    raise CsvValidationError(f"CSV file {self.file} is empty!")
+            else:
+                self.header = header
+                self.row_filter = self._row_filter(header)
+                with open(self.file, "rb") as f:
+                    lines = self._iter_range_lines(f, *byte_range, exact_start)
+                    reader = csv.reader(lines, delimiter=",")
+                    yield from self._iter_rows(reader, len(header), strict)
 
-        if not self.file.is_file():
-            error_msg = f"File {self.file} does not exist!"
-            return False, error_msg
+        except csv.Error as e:
+            error_msg = f"File {self.file} is not a valid CSV format! Error: {str(e)}"
+            raise CsvValidationError(error_msg) from e
+        except (OSError, UnicodeDecodeError) as e:
+            error_msg = f"Error reading file: {str(e)}!"
+            logger.error(error_msg)
+            raise CsvValidationError(error_msg) from e
+
+    def stream_csv(self, strict: bool = False) -> Iterator[dict[str, str]]:
+        """
+        Validates and loads CSV file in a single pass.
+
+        Rows are yielded one by one, so memory usage doesn't depend on file size.
+        Malformed rows are skipped and recorded in errors (or raised if strict).
+
+        Args:
+            strict: Stop on the first malformed row.
+
+        Yields:
+            Dictionaries with row data.
+
+        Raises:
+            CsvValidationError: If file is missing, empty or not a valid CSV.
+        """
+
+        logger.debug(f"Streaming CSV file: {self.file}")
+
+        if self.file.suffix == COLUMNAR_SUFFIX:
+            columnar = self._read_columnar()
+            if self.where:
+                rows = self._columnar_rows(columnar)
+            else:
+                rows = columnar.stream_rows()
+        else:
+            rows = (dict(zip(self.header, row)) for row in self._read_rows(strict))
+        yield from rows
+
+        logger.info(
+            f"Streamed {self.rows_count} records from {self.file}, "
+            f"skipped {self.errors_count} malformed rows"
+            + (f", filtered out {self.filtered_count} rows" if self.where else "")
+        )
+
+    def stream_columns(
+        self,
+        columns: dict[str, str],
+        batch_size: int = 65536,
+        strict: bool = False,
+        byte_range: tuple[int, int] | None = None,
+        header: list[str] | None = None,
+        exact_start: bool = False,
+    ) -> Iterator[ColumnBatch]:
+        """
+        Loads only requested columns into typed arrays, batch by batch.
+
+        No dictionaries are created for rows, numeric columns are stored in
+        arrays and category columns are dictionary-encoded. Files larger than
+        mmap_min_size are memory-mapped (see _stream_mapped_columns).
+
+        Args:
+            columns: Column names mapped to their kind (see COLUMN_TYPECODES).
+            batch_size: Maximum number of rows in a batch.
+            strict: Stop on the first malformed row.
+            byte_range: Start and end offsets, None for the whole file.
+            header: CSV header, required for byte ranges.
+            exact_start: Range start is known to be a record boundary.
+
+        Yields:
+            ColumnBatch objects.
+
+        Raises:
+            CsvValidationError: If file is not a valid CSV or lacks some column.
+            ValueError: If numeric column value can't be converted.
+        """
+
+        logger.debug(f"Streaming columns {', '.join(columns)} of {self.file}")
+
+        if self.file.suffix == COLUMNAR_SUFFIX:
+            columnar = self._read_columnar()
+            yield from self._columnar_batches(columnar, columns, batch_size)
+            return
+
+        if (
+            byte_range is None
+            and self.data is None
+            and self.compression is None
+            and self.file.is_file()
+            and self.file.stat().st_size >= self.mmap_min_size
+        ):
+            yield from self._stream_mapped_columns(columns, batch_size, strict)
+            return
+
+        builder = None
+        for row in self._read_rows(strict, byte_range, header, exact_start):
+            if builder is None:
+                builder = self._column_builder(columns)
+
+            builder.append(row, self.line)
+            if builder.size >= batch_size:
+                yield builder.build()
+
+        if builder is not None and builder.size:
+            yield builder.build()
+
+    def _read_columnar(self) -> "ColumnarFile":
+        """
+        Opens columnar file written by convert command.
+
+        Raises:
+            CsvValidationError: If file is missing or isn't a valid columnar file.
+        """
+
+        from .columnar import ColumnarFile
+
+        self._reset()
+        self._check_path()
+        columnar = ColumnarFile(self.file)
+        if not columnar.rows:
+            raise CsvValidationError(f"CSV file {self.file} is empty!")
+
+        self.header = columnar.header
+        self.rows_count = self.records_count = columnar.rows
+        return columnar
 
-        if not self.file.suffix == ".csv":
-            error_msg = f"File {self.file} is not a CSV file!"
-            return False, error_msg
+    def _columnar_batches(
+        self, columnar: "ColumnarFile", columns: dict[str, str], batch_size: int
+    ) -> Iterator[ColumnBatch]:
+        """
+        Loads requested columns of columnar file, keeping rows passing where
+        predicates.
+
+        Files whose column statistics (min/max, categories) show that no row
+        can pass aren't read at all.
+        """
+
+        row_filter = self._row_filter(columnar.header)
+        if row_filter is None:
+            yield from columnar.stream_columns(columns, batch_size)
+            return
+
+        self.rows_count = 0
+        if not columnar.may_match(self.where):
+            logger.info(f"Skipping {self.file}, none of its rows pass filters")
+            self.filtered_count = columnar.rows
+            return
+
+        # Filter columns are read as stored, without conversion
+        requested = dict(columns)
+        for predicate in self.where:
+            requested.setdefault(
+                predicate.column, columnar.columns[predicate.column].kind
+            )
+
+        header = columnar.header
+        for batch in columnar.stream_columns(requested, batch_size):
+            mask = row_filter.mask(lambda index: batch.columns[header[index]])
+            size = batch.size
+            batch = filter_batch(batch, mask, list(columns))
+            self.rows_count += batch.size
+            self.filtered_count += size - batch.size
+            if batch.size:
+                yield batch
+
+    def _columnar_rows(self, columnar: "ColumnarFile") -> Iterator[dict[str, str]]:
+        """Yields rows of columnar file passing where predicates."""
+
+        header = columnar.header
+        batches = self._columnar_batches(
+            columnar, dict.fromkeys(header, "category"), 65536
+        )
+        for batch in batches:
+            for values in zip(*batch.columns.values()):
+                yield dict(zip(header, values))
+
+    def _column_builder(self, columns: dict[str, str]) -> "ColumnBatchBuilder":
+        """
+        Creates batch builder for requested columns of the header.
+
+        Raises:
+            CsvValidationError: If header has no requested column.
+        """
 
         try:
-            with open(self.file, "r", encoding="utf-8") as csvfile:
-                reader = csv.reader(csvfile, delimiter=",")
-                header = next(reader)
-                header_count = len(header)
-                rows = list(reader)
+            return ColumnBatchBuilder(columns, self.header)
+        except KeyError as e:
+            raise CsvValidationError(f"CSV file {self.file} has no column {e}!") from e
 
-                if len(rows) == 0:
-                    error_msg = f"CSV file {self.file} is empty!"
-                    return False, error_msg
+    def _stream_mapped_columns(
+        self, columns: dict[str, str], batch_size: int, strict: bool
+    ) -> Iterator[ColumnBatch]:
+        """
+        Loads requested columns of memory-mapped file.
 
-                for row in rows:
-                    if len(row) != header_count:
-                        raise csv.Error(f"More columns than headers in row: {row}")
+        Records are split into fields as bytes and only values of requested
+        columns are kept, numbers are parsed from bytes and each category is
+        decoded once. Runs of plain lines (no quotes, right number of commas)
+        are split a block at a time, other records go through csv module.
 
-                logger.info(f"CSV file {self.file} is valid with {len(rows)} rows")
-                return True, "Valid CSV file."
+        Takes and returns the same as stream_columns for the whole file.
+        """
+
+        self.header, data_start = self.read_header()
+        self.row_filter = self._row_filter(self.header)
+        builder = None
+        width = len(self.header)
+        line = self.lines_count
+        try:
+            with (
+                open(self.file, "rb") as f,
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+            ):
+                for block in self._iter_mapped_blocks(buffer, data_start):
+                    split = self._split_block(block, width, line, strict)
+                    if self.row_filter is not None:
+                        split = self._filter_block(*split)
+                    line += block.count(b"\n")
+                    if builder is None:
+                        if not self.rows_count:
+                            continue
+                        builder = self._column_builder(columns)
+
+                    builder.extend(*split)
+                    while builder.size >= batch_size:
+                        yield builder.build(batch_size)
 
         except csv.Error as e:
             error_msg = f"File {self.file} is not a valid CSV format! Error: {str(e)}"
-            return False, error_msg
-        except Exception as e:
+            raise CsvValidationError(error_msg) from e
+        except (OSError, UnicodeDecodeError) as e:
             error_msg = f"Error reading file: {str(e)}!"
             logger.error(error_msg)
-            return False, error_msg
+            raise CsvValidationError(error_msg) from e
+
+        if self.records_count == 0:
+            raise CsvValidationError(f"CSV file {self.file} is empty!")
+        if builder is not None and builder.size:
+            yield builder.build()
+
+    def _iter_mapped_blocks(self, buffer: mmap.mmap, start: int) -> Iterator[bytes]:
+        """Yields blocks of mapped data, each ending at a record boundary."""
+
+        size = len(buffer)
+        while start < size:
+            end = min(start + self.mmap_block_size, size)
+            newline = buffer.find(b"\n", end - 1)
+            end = size if newline == -1 else newline + 1
+            inside = _ends_in_quotes(buffer, start, end)
+
+            # Move block end past newlines inside quoted fields
+            while inside and end < size:
+                newline = buffer.find(b"\n", end)
+                next_end = size if newline == -1 else newline + 1
+                inside = _ends_in_quotes(buffer, end, next_end, inside)
+                end = next_end
+
+            yield buffer[start:end]
+            start = end
+
+    def _split_block(
+        self, block: bytes, width: int, line: int, strict: bool
+    ) -> tuple[list[bytes], list[int], int, list[tuple[int, int, tuple[bytes, ...]]]]:
+        """
+        Splits block into plain lines and other records.
+
+        Plain lines have no quotes and the right number of commas, the rest
+        (quoted fields, malformed and blank lines) is parsed with csv module.
+
+        Args:
+            block: Data ending at a record boundary.
+            width: Number of columns in the header.
+            line: Number of lines before the block.
+            strict: Stop on the first malformed row.
+
+        Returns:
+            Plain lines, their line numbers, width and valid other records
+            as (number of plain lines before it, line number, values) tuples.
+        """
+
+        separator = b"\r\n" if b"\r" in block else b"\n"
+        lines = block.split(separator)
+        if not lines[-1]:
+            lines.pop()
+        count = len(lines)
+
+        plain = list(map((width - 1).__eq__, map(bytes.count, lines, repeat(b","))))
+        special = list(compress(range(count), map(bytes.count, lines, repeat(b'"'))))
+        special.extend(compress(range(count), map(not_, plain)))
+        if width == 1:
+            # Blank lines are skipped, as csv module does
+            special.extend(compress(range(count), map(b"".__eq__, lines)))
+
+        others = []
+        mixed = separator == b"\r\n" and block.count(b"\r") != block.count(b"\n")
+        if mixed or len(special) * 8 > count:
+            # Not worth splitting, whole block is left to csv module
+            reader = csv.reader(io.StringIO(block.decode("utf-8"), newline=""))
+            for row in reader:
+                if self._check_record(row, width, line + reader.line_num, strict):
+                    values = tuple(value.encode("utf-8") for value in row)
+                    others.append((0, line + reader.line_num, values))
+            return [], [], width, others
+
+        # Records spanning several lines end where quoted fields are closed
+        spans = []
+        end = 0
+        for start in sorted(special):
+            if start < end:
+                continue
+            end = start + 1
+            inside = _ends_in_quotes(lines[start])
+            while inside and end < count:
+                inside = _ends_in_quotes(lines[end], inside=inside)
+                end += 1
+            spans.append((start, end))
+            plain[start:end] = repeat(False, end - start)
+
+        # Span lines are read one by one, like the text path reads the file
+        span_lines = [index for start, end in spans for index in range(start, end)]
+        terminator = separator.decode("utf-8")
+        reader = csv.reader(
+            (lines[index].decode("utf-8") + terminator for index in span_lines),
+            delimiter=",",
+        )
+        consumed = 0
+        for row in reader:
+            # Plain lines before the record are lines before it not in spans
+            at = span_lines[consumed] - consumed
+            consumed = reader.line_num
+            record_line = line + span_lines[consumed - 1] + 1
+            if self._check_record(row, width, record_line, strict):
+                values = tuple(value.encode("utf-8") for value in row)
+                others.append((at, record_line, values))
+
+        if spans:
+            lines = list(compress(lines, plain))
+        self.records_count += len(lines)
+        self.rows_count += len(lines)
+        numbers = list(compress(range(line + 1, line + count + 1), plain))
+        return lines, numbers, width, others
+
+    def _filter_block(
+        self,
+        lines: list[bytes],
+        numbers: list[int],
+        width: int,
+        others: list[tuple[int, int, tuple[bytes, ...]]],
+    ) -> tuple[list[bytes], list[int], int, list[tuple[int, int, tuple[bytes, ...]]]]:
+        """
+        Drops records of split block that don't pass where predicates.
+
+        Plain lines are checked column by column on bytes, so values are
+        neither decoded nor converted unless a predicate compares numbers.
+
+        Takes and returns the same as _split_block returns.
+        """
+
+        row_filter = self.row_filter
+        kept = [record for record in others if row_filter.match(record[2])]
+        dropped = len(others) - len(kept)
+
+        if lines:
+            values = b",".join(lines).split(b",")
+            mask = row_filter.mask(lambda index: values[index::width])
+            # Other records are placed by number of plain lines before them
+            kept_before = list(accumulate(mask, initial=0))
+            kept = [(kept_before[at], line, row) for at, line, row in kept]
+            dropped += len(lines)
+            lines = list(compress(lines, mask))
+            numbers = list(compress(numbers, mask))
+            dropped -= len(lines)
+
+        self.rows_count -= dropped
+        self.filtered_count += dropped
+        return lines, numbers, width, kept
+
+    def _check_record(
+        self, row: list[str], width: int, line: int, strict: bool
+    ) -> bool:
+        """Counts record, returns False if it's blank or malformed."""
+
+        if not row:
+            return False
+
+        self.records_count += 1
+        if len(row) != width:
+            self._add_row_error(row, width, line, strict)
+            return False
+
+        self.rows_count += 1
+        self.line = line
+        return True
+
+    def read_header(self) -> tuple[list[str], int]:
+        """
+        Reads CSV header without touching the rest of the file.
+
+        Number of physical lines taken by the header is stored in lines_count.
+
+        Returns:
+            Header columns and byte offset of the first data record.
+
+        Raises:
+            CsvValidationError: If file is missing, empty or header is broken.
+        """
+
+        self._check_path()
+        self._reset()
+
+        data = b""
+        inside = False
+        try:
+            with self._open_binary() as f:
+                for line in f:
+                    data += line
+                    inside = _ends_in_quotes(line, inside=inside)
+                    self.lines_count += 1
+                    if not inside:
+                        break
+
+            header = next(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))
+        except StopIteration:
+            raise CsvValidationError(f"CSV file {self.file} is empty!")
+        except csv.Error as e:
+            error_msg = f"File {self.file} is not a valid CSV format! Error: {str(e)}"
+            raise CsvValidationError(error_msg) from e
+        except (OSError, UnicodeDecodeError) as e:
+            raise CsvValidationError(f"Error reading file: {str(e)}!") from e
+
+        return header, len(data)
+
+    def split_ranges(self, start: int, chunks: int) -> list[tuple[int, int]]:
+        """
+        Splits file data into byte ranges of roughly equal size.
+
+        Ranges aren't aligned on records here, stream_range moves every range
+        start to the next record boundary itself.
+
+        Args:
+            start: Offset of the first data record (see read_header).
+            chunks: Number of ranges.
+
+        Returns:
+            List of (start, end) byte offsets.
+        """
+
+        size = self.file.stat().st_size
+        step = max((size - start) // chunks, 1)
+        bounds = [min(start + step * i, size) for i in range(chunks)] + [size]
+        return [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+    def _iter_range_lines(self, f, start: int, end: int, exact_start: bool):
+        """
+        Yields decoded lines of records that start inside byte range.
+
+        Unless exact_start is set, range start is moved past the next newline,
+        assuming that newline isn't inside a quoted field. Whether it is
+        depends on data before the range, so head_inside stores whether it is
+        inside quotes if range start is outside and if it's inside quoted
+        field, and end_inside stores the same for range end. The caller checks
+        the assumption once states of all previous ranges are known.
+        Reading stops at the first record boundary after range end.
+
+        Args:
+            f: File opened in binary mode.
+            start: Range start offset.
+            end: Range end offset.
+            exact_start: Range start is known to be a record boundary.
+
+        Yields:
+            Decoded lines.
+        """
+
+        position = start
+        end_inside = None
+        if not exact_start and start > 0:
+            f.seek(start - 1)
+            # Byte before range start tells whether a quote starts a field
+            skipped = f.readline()
+            head = _past_quotes(skipped, 1)
+            self.head_inside = (
+                _ends_in_quotes(skipped, head),
+                _ends_in_quotes(skipped, head, inside=True),
+            )
+            position = start - 1 + len(skipped)
+            if position > end:
+                stop = _past_quotes(skipped, 1 + end - start)
+                end_inside = (
+                    _ends_in_quotes(skipped, head, stop),
+                    _ends_in_quotes(skipped, head, stop, inside=True),
+                )
+        else:
+            f.seek(start)
+
+        inside = False
+        while position < end or inside:
+            line = f.readline()
+            if not line:
+                break
+
+            if position < end < position + len(line):
+                stop = _past_quotes(line, end - position)
+                state = _ends_in_quotes(line, 0, stop, inside)
+                end_inside = (state, state)
+            inside = _ends_in_quotes(line, inside=inside)
+            position += len(line)
+            if position == end:
+                end_inside = (inside, inside)
+            self.lines_count += 1
+            yield line.decode("utf-8")
+
+        # Range ends after the end of file
+        self.end_inside = (inside, inside) if end_inside is None else end_inside
+
+    def stream_range(
+        self,
+        start: int,
+        end: int,
+        header: list[str],
+        strict: bool = False,
+        exact_start: bool = False,
+    ) -> Iterator[dict[str, str]]:
+        """
+        Loads records starting inside byte range of the file.
+
+        Ranges from split_ranges cover every record of the file exactly once,
+        as long as no range start falls inside a quoted field with newlines.
+        Line numbers of errors are relative to the first line of the range.
+
+        Args:
+            start: Range start offset.
+            end: Range end offset.
+            header: CSV header (see read_header).
+            strict: Stop on the first malformed row.
+            exact_start: Range start is known to be a record boundary.
+
+        Yields:
+            Dictionaries with row data.
+
+        Raises:
+            CsvValidationError: If range is not a valid CSV.
+        """
+
+        logger.debug(f"Streaming CSV file {self.file} bytes {start}-{end}")
+
+        for row in self._read_rows(strict, (start, end), header, exact_start):
+            yield dict(zip(header, row))
+
+    @property
+    def check_csv_file(self) -> (bool, str):
+        logger.debug(f"Checking CSV file: {self.file}")
+
+        try:
+            for _ in self.stream_csv(strict=True):
+                pass
+        except CsvValidationError as e:
+            return False, str(e)
+
+        logger.info(f"CSV file {self.file} is valid with {self.rows_count} rows")
+        return True, "Valid CSV file."
 
     @property
     def load_csv(self) -> list[dict[str, str]]:
-        """Loads CSV file and returns list of dictionaries."""
+        """
+        Loads CSV file and returns list of dictionaries.
+
+        With where predicates only valid rows passing them are loaded.
+        """
         logger.info(f"Loading CSV file: {self.file}")
 
-        with open(self.file, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            data = list(reader)
+        if self.file.suffix == COLUMNAR_SUFFIX or self.where:
+            data = list(self.stream_csv())
+        else:
+            with self._open_text() as f:
+                data = list(csv.DictReader(f))
 
         logger.info(f"Successfully loaded {len(data)} records from {self.file}")
         return data
 
 
+class NumericParseError(ValueError):
+    """Raised when some values of a column can't be converted to numbers."""
+
+    max_reported = 10
+
+    def __init__(self, bad_values: list[tuple[int, str]]):
+        """
+        Args:
+            bad_values: Line numbers and values that can't be converted.
+        """
+
+        self.bad_values = bad_values
+        messages = [
+            f"Cannot convert value {value} to numeric. (line {line})"
+            for line, value in bad_values[: self.max_reported]
+        ]
+        if len(bad_values) > self.max_reported:
+            messages.append(f"and {len(bad_values) - self.max_reported} more")
+        super().__init__("; ".join(messages))
+
+    def __reduce__(self):
+        # args hold the message, so rebuild from bad values in other processes
+        return NumericParseError, (self.bad_values,)
+
+
+def parse_numbers(
+    values: list[str], typecode: str = "d", lines: array | None = None
+) -> array:
+    """
+    Converts list of strings into array of numbers.
+
+    Values are parsed once, in a single call for the whole list. Only if some
+    of them are invalid, the list is scanned again to report all bad values.
+
+    Args:
+        values: Strings to convert.
+        typecode: Array typecode, "d" for floats or "q" for ints.
+        lines: Line numbers of values, positions in list are used by default.
+
+    Returns:
+        Array of numbers.
+
+    Raises:
+        NumericParseError: If some values can't be converted.
+    """
+
+    convert = float if typecode == "d" else int
+    try:
+        return array(typecode, map(convert, values))
+    except ValueError:
+        pass
+
+    bad_values = []
+    for index, value in enumerate(values):
+        try:
+            convert(value)
+        except ValueError:
+            if isinstance(value, bytes):
+                value = value.decode("utf-8", "replace")
+            bad_values.append((lines[index] if lines else index + 1, value))
+
+    raise NumericParseError(bad_values)
+
+
+class ColumnBatchBuilder:
+    """Collects requested columns of CSV rows into typed arrays."""
+
+    def __init__(self, columns: dict[str, str], header: list[str]):
+        """
+        Args:
+            columns: Column names mapped to their kind (see COLUMN_TYPECODES).
+            header: CSV header.
+
+        Raises:
+            KeyError: If header has no requested column.
+            ValueError: If column kind is unknown.
+        """
+
+        for name, kind in columns.items():
+            if kind not in COLUMN_TYPECODES:
+                raise ValueError(f"Unknown column kind '{kind}' for column {name}")
+            if name not in header:
+                raise KeyError(name)
+
+        self.columns = columns
+        self.indexes = {name: header.index(name) for name in columns}
+        self.encoders: dict[str, dict[str, int]] = {
+            name: {} for name, kind in columns.items() if kind == "category"
+        }
+        self.categories: dict[str, list[str]] = {name: [] for name in self.encoders}
+        self._new_arrays()
+
+    def _new_arrays(self) -> None:
+        self.size = 0
+        self.lines = array("Q")
+        self.arrays = {
+            name: array(COLUMN_TYPECODES[kind]) if kind == "category" else []
+            for name, kind in self.columns.items()
+        }
+
+    def append(self, row: list[str], line: int = 0) -> None:
+        """
+        Adds requested values of a row to the batch.
+
+        Numeric values are kept as strings until the batch is built.
+        Values may also be bytes, then categories are decoded once.
+
+        Args:
+            row: Values of CSV record.
+            line: Line number of the record, used in error messages.
+        """
+
+        for name, index in self.indexes.items():
+            value = row[index]
+            encoder = self.encoders.get(name)
+            if encoder is not None:
+                code = encoder.get(value)
+                if code is None:
+                    code = encoder[value] = len(encoder)
+                    if isinstance(value, bytes):
+                        value = value.decode("utf-8")
+                    self.categories[name].append(value)
+                self.arrays[name].append(code)
+            else:
+                self.arrays[name].append(value)
+
+        self.lines.append(line)
+        self.size += 1
+
+    def extend(
+        self,
+        lines: list[bytes],
+        line_numbers: list[int],
+        width: int,
+        records: list[tuple[int, int, tuple[bytes, ...]]] = (),
+    ) -> None:
+        """
+        Adds requested values of a block of CSV lines to the batch.
+
+        Lines are split at once and categories are encoded column by column.
+
+        Args:
+            lines: Lines without quotes, each having width values.
+            line_numbers: Line numbers of lines.
+            width: Number of values in every line.
+            records: Other records of the block as (number of lines before it,
+                line number, values) tuples, in order.
+        """
+
+        values = b",".join(lines).split(b",") if lines else []
+        for name, index in self.indexes.items():
+            column = values[index::width]
+            if records:
+                column = _splice(column, [(at, row[index]) for at, _, row in records])
+
+            encoder = self.encoders.get(name)
+            if encoder is not None:
+                for value in dict.fromkeys(column):
+                    if value not in encoder:
+                        encoder[value] = len(encoder)
+                        self.categories[name].append(value.decode("utf-8"))
+                self.arrays[name].extend(map(encoder.__getitem__, column))
+            else:
+                self.arrays[name].extend(column)
+
+        if records:
+            line_numbers = _splice(line_numbers, [(at, n) for at, n, _ in records])
+        self.lines.extend(line_numbers)
+        self.size += len(line_numbers)
+
+    def build(self, limit: int | None = None) -> ColumnBatch:
+        """
+        Returns collected batch and starts a new one.
+
+        Args:
+            limit: Return only first limit rows, the rest starts a new batch.
+
+        Returns:
+            ColumnBatch with rows appended since the last build.
+
+        Raises:
+            NumericParseError: If numeric column values can't be converted.
+        """
+
+        arrays, lines, size = self.arrays, self.lines, self.size
+        if limit is not None and limit < size:
+            self.arrays = {name: values[limit:] for name, values in arrays.items()}
+            self.lines = lines[limit:]
+            self.size = size - limit
+            arrays = {name: values[:limit] for name, values in arrays.items()}
+            lines = lines[:limit]
+            size = limit
+        else:
+            self._new_arrays()
+
+        columns = {}
+        for name, values in arrays.items():
+            if name in self.categories:
+                columns[name] = Categorical(values, self.categories[name])
+            else:
+                typecode = COLUMN_TYPECODES[self.columns[name]]
+                columns[name] = parse_numbers(values, typecode, lines)
+
+        return ColumnBatch(size, columns)
+
+
+def _splice(values: list, inserts: list[tuple[int, Any]]) -> list:
+    """Returns copy of values with (position, value) inserts, in order."""
+
+    result = []
+    previous = 0
+    for position, value in inserts:
+        result += values[previous:position]
+        result.append(value)
+        previous = position
+    result += values[previous:]
+    return result
+
+
 def is_numeric(value: Any) -> bool:
     """Checks if value is numeric."""
 
@@ -76,23 +1096,28 @@ def is_numeric(value: Any) -> bool:
 
 
 def convert_to_number(value: str) -> int | float:
-    """Converts string into numeric (int or float)."""
-    logger.debug(f"Converting value to number: {value}")
+    """
+    Converts string into numeric (int or float).
+
+    Value is parsed once and debug messages are only formatted if DEBUG
+    level is enabled, as this is called for every row of a report.
+    """
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Converting value to number: %s", value)
 
     try:
-        if "." in value:
-            result = float(value)
-            logger.debug(f"Converted to float: {result}")
-            return result
-        else:
-            result = int(value)
-            logger.debug(f"Converted to int: {result}")
-            return result
+        result = float(value) if "." in value else int(value)
     except ValueError as e:
         error_msg = f"Cannot convert value {value} to numeric."
         logger.error(error_msg)
         raise ValueError(error_msg) from e
 
+    if debug:
+        logger.debug("Converted to %s: %s", type(result).__name__, result)
+    return result
+
 
 class TableCreator:
     def __init__(self, table_data: list[dict[str, str]], title: str = "Data"):
@@ -100,7 +1125,42 @@ class TableCreator:
         self.title = title
         logger.info(f"Created table with {len(table_data)} rows and title: {title}")
 
-    def create_table(self) -> Table | str:
+    def _build_table(self, rows: list[dict[str, Any]], title: str) -> "Table":
+        # rich is only imported when table is actually rendered
+        from rich import box
+        from rich.table import Table
+
+        table = Table(title=title, box=box.ROUNDED)
+
+        # "<column>_error" values are shown as "value ± error" of their column
+        keys = rows[0].keys()
+        headers = [
+            key
+            for key in keys
+            if not (key.endswith(ERROR_SUFFIX) and key[: -len(ERROR_SUFFIX)] in keys)
+        ]
+        errors = {header: header + ERROR_SUFFIX for header in headers}
+        for header in headers:
+            table.add_column(header, style="cyan", no_wrap=True)
+
+        for row in rows:
+            table.add_row(
+                *[
+                    (
+                        f"{row[col]} ± {row[errors[col]]}"
+                        if errors[col] in row
+                        else str(row[col])
+                    )
+                    for col in headers
+                ]
+            )
+
+        logger.info(
+            f"Successfully created table with {len(headers)} columns and {len(rows)} rows"
+        )
+        return table
+
+    def create_table(self) -> "Table | str":
         """Creating table from data using rich."""
         logger.debug(f"Creating table with {len(self.table_data)} rows")
 
@@ -108,19 +1168,33 @@ class TableCreator:
             logger.warning("No data to show in table")
             return "No data to show."
 
-        table = Table(title=self.title, box=box.ROUNDED)
+        return self._build_table(self.table_data, self.title)
 
-        headers = list(self.table_data[0].keys())
-        for header in headers:
-            table.add_column(header, style="cyan", no_wrap=True)
+    def create_tables(self, page_size: int) -> Iterator["Table | str"]:
+        """
+        Creating tables of at most page_size rows each.
 
-        for row in self.table_data:
-            table.add_row(*[str(row[col]) for col in headers])
+        Only one page is built at a time, so large reports can be printed
+        without holding the whole rendered table in memory.
 
-        logger.info(
-            f"Successfully created table with {len(headers)} columns and {len(self.table_data)} rows"
-        )
-        return table
+        Args:
+            page_size: Maximum number of rows in a table.
+
+        Yields:
+            Tables with page number in title.
+        """
+
+        if not self.table_data:
+            logger.warning("No data to show in table")
+            yield "No data to show."
+            return
+
+        pages = (len(self.table_data) + page_size - 1) // page_size
+        for page in range(pages):
+            start, end = page * page_size, (page + 1) * page_size
+            rows = self.table_data[start:end]
+            title = self.title if pages == 1 else f"{self.title} ({page + 1}/{pages})"
+            yield self._build_table(rows, title)
 
     def __str__(self) -> str:
         """String representation of the table."""
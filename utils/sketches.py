@@ -0,0 +1,256 @@
+import hashlib
+import heapq
+import math
+import random
+from typing import Iterable
+
+# z-score of two-sided 95% confidence intervals
+Z_95 = 1.96
+
+
+class ReservoirSample:
+    """
+    Uniform sample of at most size values of a stream (bottom-k sampling).
+
+    Every value gets a random key and values with the size smallest keys are
+    kept. Keys of both samples are kept on merge, so merged sample is a
+    uniform sample of both streams, whatever the order of merges.
+    """
+
+    def __init__(self, size: int = 1024):
+        """
+        Args:
+            size: Maximum number of sampled values.
+        """
+
+        self.size = size
+        self.count = 0
+        # Max-heap of (-key, value)
+        self.items: list[tuple[float, float]] = []
+
+    def _push(self, key: float, value: float) -> None:
+        items = self.items
+        if len(items) < self.size:
+            heapq.heappush(items, (-key, value))
+        elif key < -items[0][0]:
+            heapq.heapreplace(items, (-key, value))
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self._push(random.random(), value)
+
+    def add_many(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.count += 1
+            self._push(random.random(), value)
+
+    def merge(self, other: "ReservoirSample") -> "ReservoirSample":
+        """Merges other sample into this one and returns it."""
+
+        self.count += other.count
+        for key, value in other.items:
+            self._push(-key, value)
+        return self
+
+    def mean(self, z: float = Z_95) -> tuple[float, float]:
+        """
+        Estimates mean of the stream.
+
+        Args:
+            z: z-score of confidence level.
+
+        Returns:
+            Sample mean and half-width of its confidence interval,
+            which is 0 if every value was sampled.
+        """
+
+        values = [value for _, value in self.items]
+        size = len(values)
+        mean = math.fsum(values) / size
+        if size == self.count or size < 2:
+            return mean, 0.0
+
+        variance = math.fsum((value - mean) ** 2 for value in values) / (size - 1)
+        # Finite population correction
+        correction = 1 - size / self.count
+        return mean, z * math.sqrt(variance / size * correction)
+
+
+class HyperLogLog:
+    """
+    Estimates number of distinct values in 2**precision bytes.
+
+    Relative standard error is 1.04 / sqrt(2**precision). Sketches with the
+    same precision merge without any loss.
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        Args:
+            precision: Number of hash bits used to choose a register (4-16).
+
+        Raises:
+            ValueError: If precision is out of range.
+        """
+
+        if not 4 <= precision <= 16:
+            raise ValueError(f"HyperLogLog precision must be 4-16, got {precision}.")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        bits = 64 - self.precision
+        index = hashed >> bits
+        rank = bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Merges other sketch into this one and returns it.
+
+        Raises:
+            ValueError: If sketches have different precision.
+        """
+
+        if other.precision != self.precision:
+            raise ValueError("Can't merge HyperLogLog sketches of different precision.")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of estimates."""
+
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self) -> float:
+        """Returns estimated number of distinct values."""
+
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / math.fsum(2.0**-rank for rank in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return m * math.log(m / zeros)
+        return estimate
+
+
+class TDigest:
+    """
+    Merging t-digest estimating quantiles of a stream.
+
+    Values are summarized by at most about compression centroids, which are
+    small near the tails, so extreme quantiles are the most accurate ones.
+    Larger compression means better accuracy and more memory.
+    """
+
+    def __init__(self, compression: float = 100):
+        """
+        Args:
+            compression: Accuracy parameter, bounds number of centroids.
+
+        Raises:
+            ValueError: If compression is less than 10.
+        """
+
+        if compression < 10:
+            raise ValueError(f"t-digest compression must be >= 10, got {compression}.")
+        self.compression = compression
+        # Sorted by mean
+        self.centroids: list[tuple[float, float]] = []
+        self.buffer: list[float] = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.buffer.append(value)
+        if len(self.buffer) >= 5 * self.compression:
+            self._compress()
+
+    def add_many(self, values: Iterable[float]) -> None:
+        self.buffer.extend(values)
+        if len(self.buffer) >= 5 * self.compression:
+            self._compress()
+
+    def _scale(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(q, 1.0) - 1)
+
+    def _compress(self, centroids: Iterable[tuple[float, float]] = ()) -> None:
+        buffer = self.buffer
+        if buffer:
+            self.count += len(buffer)
+            self.min = min(self.min, min(buffer))
+            self.max = max(self.max, max(buffer))
+        items = sorted([*self.centroids, *centroids, *((v, 1.0) for v in buffer)])
+        self.buffer = []
+        if not items:
+            return
+
+        total = math.fsum(weight for _, weight in items)
+        merged = []
+        weight_before = 0.0
+        scale_before = self._scale(0.0)
+        mean, weight = items[0]
+        for item_mean, item_weight in items[1:]:
+            q = (weight_before + weight + item_weight) / total
+            if self._scale(q) - scale_before <= 1:
+                weight += item_weight
+                mean += (item_mean - mean) * item_weight / weight
+            else:
+                merged.append((mean, weight))
+                weight_before += weight
+                scale_before = self._scale(weight_before / total)
+                mean, weight = item_mean, item_weight
+        merged.append((mean, weight))
+        self.centroids = merged
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Merges other digest into this one and returns it."""
+
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.buffer.extend(other.buffer)
+        self._compress(other.centroids)
+        return self
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimates q-th quantile.
+
+        Args:
+            q: Quantile from 0 to 1.
+
+        Returns:
+            Estimated value or None if digest is empty.
+        """
+
+        self._compress()
+        centroids = self.centroids
+        if not centroids:
+            return None
+        if len(centroids) == 1:
+            return centroids[0][0]
+
+        target = q * self.count
+        # Centroid means are placed at the middle of their weight
+        position = 0.0
+        previous_mean, previous_center = self.min, 0.0
+        for mean, weight in centroids:
+            center = position + weight / 2
+            if target < center:
+                fraction = (target - previous_center) / (center - previous_center)
+                return previous_mean + fraction * (mean - previous_mean)
+            position += weight
+            previous_mean, previous_center = mean, center
+
+        if position == previous_center:
+            return self.max
+        fraction = (target - previous_center) / (position - previous_center)
+        return previous_mean + min(fraction, 1.0) * (self.max - previous_mean)
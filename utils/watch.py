@@ -0,0 +1,184 @@
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .checkpoint import CheckpointStore
+from .columns import COLUMNAR_SUFFIX
+from .compression import COMPRESSIONS
+from .logger import get_logger
+from .pipeline import FileScan, scan_file
+from .reports import IncrementalReport, MultiReport
+
+if TYPE_CHECKING:
+    from rich.console import Console, RenderableType
+
+logger = get_logger(__name__)
+
+# Suffixes of files picked up from watched directories
+WATCHED_SUFFIXES = (".csv", COLUMNAR_SUFFIX) + tuple(
+    f".csv{suffix}" for suffix in COMPRESSIONS
+)
+
+
+def expand_files(paths: list[Path]) -> list[Path]:
+    """
+    Replaces directories with files they contain.
+
+    Args:
+        paths: Paths to files and directories.
+
+    Returns:
+        Paths to files, files of a directory sorted by name.
+    """
+
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(
+                sorted(
+                    file
+                    for file in path.iterdir()
+                    if file.name.endswith(WATCHED_SUFFIXES) and file.is_file()
+                )
+            )
+        else:
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+class ReportWatcher:
+    """
+    Keeps report of files and directories up to date by polling them.
+
+    Files are stat'ed on every poll. Grown CSV files are parsed from the
+    offset they were parsed to (see CheckpointStore), other changed files
+    are parsed again. Files removed from directories are dropped.
+    """
+
+    def __init__(
+        self,
+        paths: list[Path],
+        report: IncrementalReport,
+        report_name: str,
+        limit: int | None = None,
+        ascending: bool = False,
+    ):
+        self.paths = paths
+        self.report = report
+        self.report_name = report_name
+        self.limit = limit
+        self.ascending = ascending
+        self.checkpoints = CheckpointStore(persistent=False)
+        self.stats: dict[Path, tuple[int, int] | None] = {}
+        self.scans: dict[Path, FileScan] = {}
+
+    def _scan(self, file: Path) -> FileScan:
+        try:
+            scan = self.checkpoints.scan(file, self.report, self.report_name)
+            if scan is None:
+                scan = scan_file(file, self.report)
+        except ValueError as e:
+            # Invalid numbers shouldn't stop watching other files
+            scan = FileScan(file, error=f"{file}: {e}")
+
+        for error in scan.errors:
+            logger.warning(error)
+        if scan.error:
+            logger.warning(scan.error)
+        return scan
+
+    def poll(self) -> bool:
+        """
+        Updates states of changed files.
+
+        Returns:
+            True if some file was added, changed or removed.
+        """
+
+        files = expand_files(self.paths)
+        changed = False
+
+        for file in set(self.scans) - set(files):
+            del self.scans[file]
+            self.stats.pop(file, None)
+            changed = True
+
+        for file in files:
+            try:
+                stat = file.stat()
+                key = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                key = None
+
+            if file in self.scans and self.stats.get(file) == key:
+                continue
+
+            self.stats[file] = key
+            self.scans[file] = self._scan(file)
+            changed = True
+
+        return changed
+
+    @property
+    def rows_count(self) -> int:
+        return sum(scan.rows_count for scan in self.scans.values() if not scan.error)
+
+    def _state(self) -> Any:
+        state = self.report.init_state()
+        for scan in self.scans.values():
+            if not scan.error:
+                state = self.report.merge(state, scan.state)
+        return state
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Returns report rows of current file states."""
+
+        if not self.rows_count:
+            return []
+        return self.report.finalize(self._state(), self.limit, self.ascending)
+
+    def create_table(self) -> "RenderableType":
+        """Returns table of current report, one table per report of MultiReport."""
+
+        from .shortcuts import TableCreator
+
+        status = (
+            f"({len(self.scans)} files, {self.rows_count} rows, "
+            f"updated {time.strftime('%H:%M:%S')})"
+        )
+        if not isinstance(self.report, MultiReport):
+            return TableCreator(
+                self.rows(), f"{self.report_name} {status}"
+            ).create_table()
+
+        from rich.console import Group
+
+        reports_data = dict.fromkeys(self.report.reports, [])
+        if self.rows_count:
+            reports_data = self.report.finalize_reports(
+                self._state(), self.limit, self.ascending
+            )
+        return Group(
+            *(
+                TableCreator(rows, f"{name} {status}").create_table()
+                for name, rows in reports_data.items()
+            )
+        )
+
+    def run(self, refresh_rate: float = 1.0, console: "Console | None" = None) -> None:
+        """
+        Polls files and redraws report table until interrupted.
+
+        Args:
+            refresh_rate: Polls (and at most redraws) per second.
+            console: Console to draw on.
+        """
+
+        from rich.live import Live
+
+        self.poll()
+        with Live(self.create_table(), console=console, auto_refresh=False) as live:
+            while True:
+                time.sleep(1 / refresh_rate)
+                if self.poll():
+                    live.update(self.create_table(), refresh=True)
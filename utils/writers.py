@@ -0,0 +1,75 @@
+import csv
+import json
+from typing import Any, Iterable, TextIO
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+OUTPUT_FORMATS = ("auto", "table", "plain", "csv", "jsonl")
+# Larger reports aren't rendered with rich in auto mode unless output is a terminal
+RICH_MAX_ROWS = 1000
+
+
+def resolve_output_format(output_format: str, rows_count: int, stream: TextIO) -> str:
+    """
+    Chooses concrete output format for auto mode.
+
+    Args:
+        output_format: Requested format (see OUTPUT_FORMATS).
+        rows_count: Number of report rows.
+        stream: Output stream.
+
+    Returns:
+        "table" for small or interactive outputs, "plain" otherwise,
+        or requested format if it isn't auto.
+    """
+
+    if output_format != "auto":
+        return output_format
+
+    if rows_count <= RICH_MAX_ROWS or stream.isatty():
+        return "table"
+    return "plain"
+
+
+def write_rows(
+    rows: Iterable[dict[str, Any]], output_format: str, stream: TextIO
+) -> int:
+    """
+    Writes rows one by one without building any renderable.
+
+    Args:
+        rows: Report rows.
+        output_format: "plain" (tab-separated), "csv" or "jsonl".
+        stream: Output stream.
+
+    Returns:
+        Number of written rows.
+
+    Raises:
+        ValueError: If output format is unknown.
+    """
+
+    if output_format not in ("plain", "csv", "jsonl"):
+        raise ValueError(f"Output format '{output_format}' can't be streamed.")
+
+    count = 0
+    writer = None
+
+    for row in rows:
+        if output_format == "jsonl":
+            stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        elif output_format == "csv":
+            if writer is None:
+                writer = csv.DictWriter(stream, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+        else:
+            if count == 0:
+                stream.write("\t".join(row) + "\n")
+            stream.write("\t".join(str(value) for value in row.values()) + "\n")
+        count += 1
+
+    logger.info(f"Written {count} rows as {output_format}")
+    return count